@@ -0,0 +1,71 @@
+"""
+Offline benchmark for the summarization pipeline.
+
+Runs content through the same preprocessing and summarization engine used by the
+API, using the deterministic stub backend so no model calls are made.
+
+Usage:
+    python benchmark_summary.py --size 20000 --runs 5 --latency 0.2
+    python benchmark_summary.py --size 40000 --compare-extractive
+"""
+
+import argparse
+import time
+
+from website.content_processor import process_content
+from website.summarizer import SummaryEngine, StubBackend
+
+SAMPLE_SENTENCES = [
+    "The central bank held interest rates steady for the third consecutive meeting.",
+    "Analysts expect inflation to ease gradually over the coming quarters.",
+    "Technology shares rallied after strong earnings from several large companies.",
+    "Researchers published a study on the long-term effects of remote work.",
+    "The national team secured its place in the championship final on Sunday.",
+    "Officials announced new funding for regional hospitals and clinics.",
+]
+
+def build_sample_content(size):
+    """Build roughly `size` characters of sample text"""
+    sentences = []
+    total = 0
+    i = 0
+    while total < size:
+        sentence = SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]
+        sentences.append(sentence)
+        total += len(sentence) + 1
+        i += 1
+    return ' '.join(sentences)
+
+def run_benchmark(size, runs, latency, length, tone, extractive=False):
+    engine = SummaryEngine(StubBackend(latency=latency))
+    content = build_sample_content(size)
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        processed = process_content({'content': content, 'extractive': extractive})
+        engine.summarize(processed['content'], length, tone)
+        timings.append(time.perf_counter() - start)
+
+    stats = engine.get_stats()
+    print(f"Content size: {size} chars, runs: {runs}, simulated latency: {latency}s, extractive: {extractive}")
+    print(f"Mean time: {sum(timings) / len(timings):.4f}s, min: {min(timings):.4f}s, max: {max(timings):.4f}s")
+    print(f"Model calls: {stats['calls']}, prompt chars: {stats['prompt_chars']}, output chars: {stats['output_chars']}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the summarization pipeline offline")
+    parser.add_argument('--size', type=int, default=8000, help="Content size in characters")
+    parser.add_argument('--runs', type=int, default=5, help="Number of runs")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated model latency in seconds")
+    parser.add_argument('--length', type=int, default=50, help="Summary length percentage")
+    parser.add_argument('--tone', default='professional', help="Summary tone")
+    parser.add_argument('--extractive', action='store_true', help="Run the extractive stage before summarizing")
+    parser.add_argument('--compare-extractive', action='store_true', help="Run with and without the extractive stage")
+    args = parser.parse_args()
+
+    if args.compare_extractive:
+        run_benchmark(args.size, args.runs, args.latency, args.length, args.tone, extractive=False)
+        print()
+        run_benchmark(args.size, args.runs, args.latency, args.length, args.tone, extractive=True)
+    else:
+        run_benchmark(args.size, args.runs, args.latency, args.length, args.tone, extractive=args.extractive)
@@ -71,6 +71,10 @@ def create_app(test_config=None):
     app.register_blueprint(views, url_prefix="/")
     app.register_blueprint(auth, url_prefix="/")
 
+    # Summaries generated outside of requests are archived in this app's database
+    from .summary_archive import summary_archive
+    summary_archive.init_app(app)
+
     from .models import User, Note, ScheduledPost, Article, FavoriteArticle
 
     with app.app_context():
@@ -14,9 +14,13 @@ import json
 import hashlib
 import gzip
 import base64
+import re
+import zlib
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
+from .content_processor import estimate_tokens, CHARS_PER_TOKEN
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -137,6 +141,18 @@ class AsyncProcessor:
             logger.error("Task queue is full")
             raise RuntimeError("Task queue is full")
     
+    def update_task_progress(self, task_id, progress):
+        """
+        Record progress of a running task, shown to clients polling its status
+        
+        Args:
+            task_id (str): Task ID to update
+            progress (dict): Progress information, replaces any earlier progress
+        """
+        status = self.results.get(task_id)
+        if status is not None and status['status'] == 'pending':
+            status['progress'] = progress
+    
     def get_task_status(self, task_id):
         """
         Get the status of a task
@@ -226,46 +242,93 @@ def decompress_content(compressed_content):
         logger.error(f"Decompression error: {str(e)}")
         return None
 
-def chunk_content(content, max_chunk_size=5000, overlap=200):
+# Sentence ends: terminal punctuation followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'[.!?]\s+')
+
+# Characters before a sentence boundary that decide whether a chunk ends there
+BOUNDARY_CONTEXT = 32
+
+def iter_chunks(content, max_tokens=1250, overlap_tokens=50):
     """
-    Split content into chunks for processing
+    Lazily split content into chunks that fit a token budget
+    
+    Each chunk ends at a sentence boundary in the last quarter of its budget.
+    Among those, the boundary is picked by a hash of the text just before it
+    rather than by position, so after an edit the following chunks fall back
+    onto the same boundaries and keep their cached summaries. The next chunk
+    starts a little before that point so neighbouring chunks share some
+    context. Sentence boundaries are found in a single forward pass over the
+    content, and only the chunks themselves are copied out of it.
     
     Args:
         content (str): Content to chunk
-        max_chunk_size (int): Maximum chunk size in characters
-        overlap (int): Overlap between chunks in characters
+        max_tokens (int): Maximum estimated Gemini tokens per chunk
+        overlap_tokens (int): Estimated tokens shared between neighbouring chunks
         
-    Returns:
-        list: List of content chunks
+    Yields:
+        str: Content chunks in document order
     """
-    if len(content) <= max_chunk_size:
-        return [content]
+    if estimate_tokens(content) <= max_tokens:
+        if content:
+            yield content
+        return
     
-    chunks = []
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    # Keep the overlap well under half a chunk so every chunk moves forward
+    overlap_chars = min(overlap_tokens * CHARS_PER_TOKEN, max_chars // 4)
+    content_length = len(content)
+    
+    boundaries = (match.end() for match in SENTENCE_BOUNDARY.finditer(content))
+    next_boundary = next(boundaries, None)
     start = 0
     
-    while start < len(content):
-        # Calculate end position
-        end = min(start + max_chunk_size, len(content))
+    while True:
+        limit = start + max_chars
+        if limit >= content_length:
+            yield content[start:]
+            return
         
-        # Try to find a sentence boundary for cleaner chunks
-        if end < len(content):
-            # Look for sentence boundaries (., !, ?)
-            for boundary in ['. ', '! ', '? ']:
-                boundary_pos = content.rfind(boundary, start, end)
-                if boundary_pos > start + max_chunk_size * 0.5:  # Ensure chunk is at least half the max size
-                    end = boundary_pos + 2  # Include the boundary characters
-                    break
+        # Pick the content-defined sentence boundary in the last quarter of the budget
+        window_start = limit - max_chars // 4
+        end = None
+        best_hash = None
+        while next_boundary is not None and next_boundary <= limit:
+            if next_boundary >= window_start:
+                boundary_hash = zlib.crc32(content[next_boundary - BOUNDARY_CONTEXT:next_boundary].encode('utf-8'))
+                if best_hash is None or boundary_hash < best_hash:
+                    end, best_hash = next_boundary, boundary_hash
+            next_boundary = next(boundaries, None)
+        if end is None:
+            end = limit
         
-        # Add the chunk
-        chunks.append(content[start:end])
+        yield content[start:end]
         
-        # Move to next chunk with overlap
-        start = end - overlap
+        # Start the next chunk inside the overlap, on a word boundary when possible
+        overlap_start = end - overlap_chars
+        word_start = content.find(' ', overlap_start, end)
+        start = word_start + 1 if word_start != -1 else overlap_start
+
+def chunk_content(content, max_tokens=1250, overlap_tokens=50):
+    """
+    Split content into chunks for processing
     
+    Args:
+        content (str): Content to chunk
+        max_tokens (int): Maximum estimated Gemini tokens per chunk
+        overlap_tokens (int): Estimated tokens shared between neighbouring chunks
+        
+    Returns:
+        list: List of content chunks
+    """
+    chunks = list(iter_chunks(content, max_tokens, overlap_tokens))
     logger.info(f"Split content into {len(chunks)} chunks")
     return chunks
 
 # Create a global instance
 async_processor = AsyncProcessor()
-async_processor.start() 
\ No newline at end of file
+async_processor.start()
+
+# Batch jobs run one at a time on their own processor, so a long batch never
+# holds up the single summaries queued on async_processor
+batch_processor = AsyncProcessor(max_workers=2, queue_size=20)
+batch_processor.start() 
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Bloom Filter Module for AI Summary Feature
+
+This module holds a Bloom filter of the keys stored in the summary cache, so a
+lookup of a key that was never written can be answered without a round trip.
+The bits are laid out like a Redis bitmap (most significant bit of each byte
+first), so workers can share one filter by setting bits with SETBIT on the
+server and loading the whole filter back with a single GET.
+"""
+
+import math
+import hashlib
+
+def optimal_size(capacity, error_rate):
+    """
+    Get the bit count and hash count of a filter
+
+    Args:
+        capacity (int): Number of keys the filter is sized for
+        error_rate (float): False positive rate at that number of keys
+
+    Returns:
+        tuple: (bit count, hash count)
+    """
+    bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hash_count = max(1, round(bit_count / capacity * math.log(2)))
+    return bit_count, hash_count
+
+class BloomFilter:
+    """
+    Bloom filter over string keys, stored as a Redis-compatible bitmap
+    """
+
+    def __init__(self, capacity=200000, error_rate=0.01):
+        """
+        Initialize an empty filter
+
+        Args:
+            capacity (int): Number of keys the filter is sized for
+            error_rate (float): False positive rate at that number of keys
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size, self.hash_count = optimal_size(capacity, error_rate)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, key):
+        """
+        Get the bit offsets of a key
+
+        Args:
+            key (str): Key
+
+        Returns:
+            list: Bit offsets, one per hash function
+        """
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        # Double hashing: the i-th position is h1 + i * h2
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        """
+        Add a key
+
+        Args:
+            key (str): Key
+
+        Returns:
+            list: Bit offsets that were set, for mirroring them elsewhere
+        """
+        offsets = self.positions(key)
+        for offset in offsets:
+            self.bits[offset >> 3] |= 0x80 >> (offset & 7)
+        return offsets
+
+    def __contains__(self, key):
+        """False means the key was certainly never added"""
+        bits = self.bits
+        return all(bits[offset >> 3] & (0x80 >> (offset & 7)) for offset in self.positions(key))
+
+    def load(self, *bitmaps):
+        """
+        Replace the filter contents with the union of bitmaps
+
+        Args:
+            *bitmaps (bytes): Bitmaps of filters of the same size; None or
+                shorter bitmaps (Redis only stores bytes up to the highest set bit) are fine
+        """
+        bits = bytearray(len(self.bits))
+        for bitmap in bitmaps:
+            if bitmap:
+                merged = int.from_bytes(bits, 'big') | int.from_bytes(bitmap[:len(bits)].ljust(len(bits), b'\0'), 'big')
+                bits = bytearray(merged.to_bytes(len(bits), 'big'))
+        self.bits = bits
+
+    def fill_ratio(self):
+        """
+        Get the share of bits that are set
+
+        Returns:
+            float: Between 0 and 1; the false positive rate is about this to the power of hash_count
+        """
+        return bin(int.from_bytes(self.bits, 'big')).count('1') / self.size
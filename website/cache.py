@@ -1,89 +1,894 @@
-import redis
-import json
 import hashlib
+import math
+import random
 from dotenv import load_dotenv
 import os
-from urllib.parse import urlparse
-import ssl
+import time
+import uuid
+import threading
 from pathlib import Path
+try:
+    from .fingerprint import simhash_words, similarity, max_distance_for, lsh_bands
+    from .content_processor import as_envelope
+    from .local_cache import LocalCache
+    from .cache_codec import CacheCodec
+    from .cache_backends import create_store
+    from .bloom_filter import BloomFilter
+except ImportError:  # Imported as a top-level module, as the Redis test script does
+    from fingerprint import simhash_words, similarity, max_distance_for, lsh_bands
+    from content_processor import as_envelope
+    from local_cache import LocalCache
+    from cache_codec import CacheCodec
+    from cache_backends import create_store
+    from bloom_filter import BloomFilter
 
 # Load environment variables from parent directory's .env.local
 env_path = Path(__file__).resolve().parent.parent / '.env.local'
 load_dotenv(env_path)
 
-class RedisCache:
-    def __init__(self):
-        redis_url = os.getenv('REDIS_URL')
-        if not redis_url:
-            raise ValueError(f"REDIS_URL environment variable is not set. Looking in: {env_path}")
-            
-        try:
-            # Configure connection using URL
-            self.redis_client = redis.from_url(
-                redis_url,
-                decode_responses=True
-            )
-            
-            # Test the connection
-            self.redis_client.ping()
-            print("Successfully connected to Redis Cloud!")
-        except Exception as e:
-            print(f"Failed to connect to Redis: {str(e)}")
-            # Initialize a dummy client that will fail gracefully
-            self.redis_client = None
+# Pub/sub channel on which workers announce summary keys they have rewritten
+INVALIDATION_CHANNEL = 'summary-cache:invalidate'
+
+# Classes of entries that can be invalidated together by bumping their generation
+CACHE_NAMESPACES = ('summary', 'chunk')
+
+class SummaryCache:
+    """
+    Cache of summaries and chunk summaries
+
+    Entries are kept in a store from cache_backends (Redis, memory or a local
+    SQLite file), with recently used summary entries also kept in memory.
+    """
+
+    def __init__(self, store=None):
+        """
+        Initialize the summary cache
+
+        Args:
+            store (optional): Store from cache_backends, defaults to the one named by CACHE_BACKEND
+        """
+        self.store = store if store is not None else create_store()
             
         self.cache_expiry = int(os.getenv('REDIS_CACHE_EXPIRY', 3600))  # Default 1 hour
+        
+        # Summaries are fresh for cache_expiry seconds (the soft TTL) and then
+        # served stale for stale_ttl more while one background refresh runs; the
+        # store drops them at the hard TTL. Refreshes may also start early, with
+        # a probability that grows towards the soft TTL and with the time the
+        # summary took to generate (XFetch), so popular keys are not all
+        # regenerated at the same moment
+        self.stale_ttl = int(os.getenv('REDIS_CACHE_STALE_TTL', 900))
+        self.hard_expiry = self.cache_expiry + self.stale_ttl
+        self.xfetch_beta = float(os.getenv('REDIS_XFETCH_BETA', 1.0))
+        self.refresh_lock_ttl = float(os.getenv('REDIS_REFRESH_LOCK_TTL', 120))
+        # Called as refresher(content, length, tone, cached_result) to start a
+        # regeneration, returning False if it was dropped; set by the views,
+        # refreshes are skipped while it is None
+        self.refresher = None
+        # Database archive of generated summaries (summary_archive.py), looked up
+        # after a store miss; set by the views, only the store is used while it is None
+        self.archive = None
+        self.chunk_cache_expiry = int(os.getenv('REDIS_CHUNK_CACHE_EXPIRY', 86400))  # Default 1 day
+        self.near_duplicate_enabled = os.getenv('REDIS_NEAR_DUPLICATE', 'True') == 'True'
+        self.near_duplicate_threshold = float(os.getenv('REDIS_NEAR_DUPLICATE_THRESHOLD', 0.9))
+        # Band members compared per lookup; each band keeps only its most
+        # recent members, so a miss costs the same however many summaries are cached
+        self.near_duplicate_max_candidates = int(os.getenv('REDIS_NEAR_DUPLICATE_MAX_CANDIDATES', 128))
+        
+        # Keys include the prompt and model version (set by the views from the
+        # summary engine) and a generation counter per namespace. Bumping a
+        # generation moves every key of the namespace at once; the old entries
+        # are never read again and expire on their own. Each worker rereads the
+        # counters every generation_ttl seconds
+        self.model_version = 'default'
+        self.generation_ttl = float(os.getenv('REDIS_GENERATION_TTL', 5))
+        self._generations = {}
+        
+        # Serialization and compression of summary entries
+        self.codec = CacheCodec.from_env()
+        
+        # In-process cache of summary entries in front of the store; a memory
+        # store is already in process, so entries are not kept twice
+        if self.store.name == 'memory':
+            self.local_cache = LocalCache(max_bytes=0)
+        else:
+            self.local_cache = LocalCache.from_env()
+        self.instance_id = uuid.uuid4().hex
+        self.invalidation_enabled = (
+            os.getenv('REDIS_L1_INVALIDATION', 'False') == 'True'
+            and self.local_cache.enabled and hasattr(self.store, 'pubsub')
+        )
+        if self.invalidation_enabled:
+            self.start_invalidation_listener()
+        
+        # Bloom filter of the summary and fingerprint band keys in Redis, so
+        # lookups of content that was never cached skip the round trip. Every
+        # write also sets the key's bits in the bloom:<period> bitmap, and each
+        # worker reloads the bitmaps of the current and previous period every
+        # bloom_sync_interval seconds. A period lasts as long as an entry, so as
+        # periods roll over the filter is rebuilt without expired keys. Memory
+        # and disk lookups never cross the network, so it is only used with Redis
+        self.bloom_enabled = os.getenv('REDIS_BLOOM_FILTER', 'True') == 'True' and self.store.name == 'redis'
+        self.bloom = BloomFilter(
+            capacity=int(os.getenv('REDIS_BLOOM_CAPACITY', 200000)),
+            error_rate=float(os.getenv('REDIS_BLOOM_ERROR_RATE', 0.01))
+        )
+        self.bloom_sync_interval = float(os.getenv('REDIS_BLOOM_SYNC_INTERVAL', 5))
+        self.bloom_loaded = False
+        self._bloom_lock = threading.Lock()
+        self._bloom_pending = None
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'filter_checks': 0, 'filter_misses': 0, 'false_positives': 0, 'round_trips_saved': 0,
+            'near_duplicate_candidates': 0
+        }
+        if self.bloom_enabled:
+            threading.Thread(target=self.sync_bloom_filter, name='cache-bloom-sync', daemon=True).start()
+
+    @property
+    def backend(self):
+        """Name of the store entries are kept in"""
+        return self.store.name
 
     def is_connected(self):
-        """Check if Redis is connected and working"""
-        if not self.redis_client:
+        """Check if the store is available"""
+        return self.store.is_connected()
+
+    def handle_error(self, action, error):
+        """
+        Report a failed store operation
+        
+        Args:
+            action (str): Operation that failed, for the log
+            error (Exception): Raised exception
+        """
+        self.store.handle_error(action, error)
+
+    def get_generation(self, namespace):
+        """
+        Get the current generation of a namespace, reread at most every generation_ttl seconds
+        
+        Args:
+            namespace (str): One of CACHE_NAMESPACES
+            
+        Returns:
+            int: Generation, 0 until the namespace is first invalidated
+        """
+        generation, read_at = self._generations.get(namespace, (0, None))
+        if read_at is not None and time.time() - read_at < self.generation_ttl:
+            return generation
+        if self.is_connected():
+            key = f"generation:{namespace}"
+            try:
+                value = self.store.get(key)
+                if value is not None:
+                    generation = int(value)
+                elif self.store.is_available(key):
+                    if generation:
+                        # The counter was lost, e.g. in a Redis restart; put back the
+                        # last known generation so entries archived before the last
+                        # invalidation are not read again
+                        self.store.pipeline().set(key, generation, nx=True).execute()
+                else:
+                    # The counter's shard is down: keep the last known
+                    # generation and read it again on the next call
+                    return generation
+            except Exception as e:
+                self.handle_error('generation', e)
+        self._generations[namespace] = (generation, time.time())
+        return generation
+
+    def invalidate(self, namespace='summary'):
+        """
+        Invalidate every entry of a namespace with a single INCR
+        
+        Other workers stop reading the old entries within generation_ttl seconds.
+        
+        Args:
+            namespace (str): One of CACHE_NAMESPACES
+            
+        Returns:
+            bool: True if the namespace was invalidated
+        """
+        if namespace not in CACHE_NAMESPACES:
+            raise ValueError(f"Unknown cache namespace '{namespace}'")
+        if not self.is_connected():
             return False
+            
         try:
-            self.redis_client.ping()
-            return True
-        except:
+            generation = self.store.incr(f"generation:{namespace}")
+        except Exception as e:
+            self.handle_error('invalidate', e)
+            return False
+        if generation is None:
+            # The counter's shard is down
             return False
+        self._generations[namespace] = (generation, time.time())
+        self.local_cache.clear()
+        print(f"Cache namespace '{namespace}' invalidated, now at generation {generation}")
+        return True
+
+    def key_scope(self, namespace):
+        """Generation and version every key of a namespace is derived from"""
+        return f"{namespace}:{self.get_generation(namespace)}:{self.model_version}"
 
     def generate_cache_key(self, content, length, tone):
         """Generate a unique cache key based on content and parameters"""
-        # Create a string combining all parameters
-        params = f"{content}:{length}:{tone}"
-        # Generate MD5 hash of the parameters
-        return f"summary:{hashlib.md5(params.encode()).hexdigest()}"
+        # Create a string combining all parameters; the content is represented
+        # by its whitespace-insensitive hash, computed once per envelope
+        params = f"{self.key_scope('summary')}:{as_envelope(content).key_hash}:{length}:{tone}"
+        return f"summary:{hashlib.blake2b(params.encode(), digest_size=16).hexdigest()}"
 
-    def get_cached_summary(self, content, length, tone):
-        """Get cached summary if it exists"""
-        if not self.is_connected():
+    def get_entry(self, cache_key, use_filter=True):
+        """
+        Read a summary entry from the local cache, falling back to the store
+        
+        Args:
+            cache_key (str): Summary cache key
+            use_filter (bool): Skip the store when the bloom filter rules the key
+                out; False for keys another worker may have just written
+            
+        Returns:
+            bytes: Encoded entry, or None
+        """
+        cached_data = self.local_cache.get(cache_key)
+        if cached_data is not None or not self.is_connected():
+            return cached_data
+        filtered = use_filter and self.bloom_ready
+        if filtered and not self.might_exist(cache_key):
+            self.count('round_trips_saved')
             return None
+        cached_data = self.store.get(cache_key)
+        if cached_data:
+            self.local_cache.set(cache_key, cached_data)
+        elif filtered:
+            self.count('false_positives')
+        return cached_data
+
+    def get_entries(self, cache_keys):
+        """
+        Read several summary entries, fetching only local cache misses from the store
+        
+        Args:
+            cache_keys (list): Summary cache keys
             
+        Returns:
+            list: Encoded entry for each key, None where there is none
+        """
+        entries = self.local_cache.get_many(cache_keys)
+        missing = [index for index, cached_data in enumerate(entries) if cached_data is None]
+        if not missing or not self.is_connected():
+            return entries
+        if self.bloom_ready:
+            missing = [index for index in missing if self.might_exist(cache_keys[index])]
+            if not missing:
+                self.count('round_trips_saved')
+                return entries
+        
+        for index, cached_data in zip(missing, self.store.mget([cache_keys[index] for index in missing])):
+            if cached_data:
+                self.local_cache.set(cache_keys[index], cached_data)
+                entries[index] = cached_data
+            elif self.bloom_ready:
+                self.count('false_positives')
+        return entries
+
+    @property
+    def bloom_ready(self):
+        """Whether lookups consult the bloom filter"""
+        return self.bloom_enabled and self.bloom_loaded
+
+    def might_exist(self, key):
+        """
+        Check a key against the bloom filter
+        
+        Args:
+            key (str): Store key
+            
+        Returns:
+            bool: False if the key is certainly not in the store
+        """
+        found = key in self.bloom
+        self.count('filter_checks')
+        if not found:
+            self.count('filter_misses')
+        return found
+
+    def bloom_add(self, pipe, key):
+        """
+        Add a key written in a pipeline to the bloom filter, here and in the shared bitmap
+        
+        Args:
+            pipe: Store pipeline the key is written in
+            key (str): Store key
+        """
+        if not self.bloom_enabled:
+            return
+        with self._bloom_lock:
+            offsets = self.bloom.add(key)
+            if self._bloom_pending is not None:
+                self._bloom_pending.append(key)
+        bitmap_key = f"bloom:{self.bloom_period()}"
+        for offset in offsets:
+            pipe.setbit(bitmap_key, offset, 1)
+        # The bitmap is read until the end of the following period
+        pipe.expire(bitmap_key, 2 * self.hard_expiry)
+
+    def bloom_period(self):
+        """Number of the current bloom filter period, which lasts as long as an entry"""
+        return int(time.time() // self.hard_expiry)
+
+    def load_bloom_filter(self):
+        """
+        Replace the bloom filter with the shared bitmaps of the current and previous period
+        
+        Returns:
+            bool: True if the bitmaps were loaded
+        """
+        if not self.is_connected():
+            return False
+            
+        period = self.bloom_period()
+        bitmap_keys = (f"bloom:{period}", f"bloom:{period - 1}")
+        with self._bloom_lock:
+            self._bloom_pending = []
         try:
+            pipe = self.store.pipeline()
+            for bitmap_key in bitmap_keys:
+                pipe.get(bitmap_key)
+            current, previous = pipe.execute()
+            # A bitmap on a shard that is down reads as empty and would rule out
+            # every stored key
+            available = all(self.store.is_available(bitmap_key) for bitmap_key in bitmap_keys)
+        except Exception as e:
+            self.handle_error('bloom filter load', e)
+            available = False
+        if not available:
+            # Without the shared bitmaps the filter misses other workers' writes,
+            # so lookups go to the store until they can be loaded again
+            with self._bloom_lock:
+                self._bloom_pending = None
+            self.bloom_loaded = False
+            return False
+            
+        with self._bloom_lock:
+            self.bloom.load(current, previous)
+            # Keys written while the bitmaps were read may be missing from them
+            for key in self._bloom_pending:
+                self.bloom.add(key)
+            self._bloom_pending = None
+        self.bloom_loaded = True
+        return True
+
+    def sync_bloom_filter(self):
+        """Reload the shared bloom filter every bloom_sync_interval seconds"""
+        while True:
+            self.load_bloom_filter()
+            time.sleep(self.bloom_sync_interval)
+
+    def count(self, name, amount=1):
+        """Increment a lookup counter"""
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def get_stats(self):
+        """
+        Get lookup counters
+        
+        Returns:
+            dict: Bloom filter checks, definite misses, false positives, store
+                round trips saved and near-duplicate candidates compared, the false positive rate among keys that
+                were not stored, the filter fill ratio, the local cache counters
+                and, for a sharded store, the connection state of each shard
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        absent = stats['filter_misses'] + stats['false_positives']
+        stats['false_positive_rate'] = round(stats['false_positives'] / absent, 4) if absent else 0.0
+        stats['filter_fill_ratio'] = round(self.bloom.fill_ratio(), 4) if self.bloom_enabled else 0.0
+        stats['local_cache'] = self.local_cache.get_stats()
+        if hasattr(self.store, 'shard_health'):
+            stats['shards'] = self.store.shard_health()
+        return stats
+
+    def get_cached_summary(self, content, length, tone, use_filter=True, use_archive=True):
+        """Get cached summary if it exists (see get_entry for use_filter), looking in the archive on a miss"""
+        try:
+            content = as_envelope(content)
             cache_key = self.generate_cache_key(content, length, tone)
-            cached_data = self.redis_client.get(cache_key)
+            cached_data = self.get_entry(cache_key, use_filter)
             if cached_data:
-                cached_result = json.loads(cached_data)
-                cached_result['cached'] = True
-                return cached_result
+                return self.load_summary(cached_data, content, length, tone)
+            cached_result = self.find_near_duplicate(content, length, tone)
+            if cached_result is None and use_archive:
+                cached_result = self.load_archived(content, length, tone)
+            return cached_result
+        except Exception as e:
+            self.handle_error('get', e)
             return None
+
+    def get_cached_summaries(self, contents, length, tone):
+        """
+        Look up cached summaries of several contents in one round trip
+        
+        Args:
+            contents (list): Content strings or envelopes
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            
+        Returns:
+            list: Cached summary dict for each content, None where there is none
+        """
+        if not contents:
+            return []
+            
+        try:
+            contents = [as_envelope(content) for content in contents]
+            keys = [self.generate_cache_key(content, length, tone) for content in contents]
+            cached_results = []
+            for content, cached_data in zip(contents, self.get_entries(keys)):
+                if cached_data:
+                    cached_result = self.load_summary(cached_data, content, length, tone)
+                else:
+                    cached_result = (
+                        self.find_near_duplicate(content, length, tone)
+                        or self.load_archived(content, length, tone)
+                    )
+                cached_results.append(cached_result)
+            return cached_results
         except Exception as e:
-            print(f"Redis get error: {str(e)}")
+            self.handle_error('get', e)
+            return [None] * len(contents)
+
+    def get_cached_variants(self, content, variants):
+        """
+        Look up cached summaries of one content in several lengths and tones in one round trip
+        
+        Args:
+            content (str or ContentEnvelope): Content
+            variants (list): (length, tone) pairs
+            
+        Returns:
+            list: Cached summary dict for each variant, None where there is none
+        """
+        if not variants:
+            return []
+            
+        try:
+            content = as_envelope(content)
+            keys = [self.generate_cache_key(content, length, tone) for length, tone in variants]
+            return [
+                self.load_summary(cached_data, content, length, tone) if cached_data
+                else self.load_archived(content, length, tone)
+                for (length, tone), cached_data in zip(variants, self.get_entries(keys))
+            ]
+        except Exception as e:
+            self.handle_error('get', e)
+            return [None] * len(variants)
+
+    def load_summary(self, cached_data, content=None, length=None, tone=None):
+        """
+        Decode a cached summary entry, queueing a refresh if it is due
+        
+        Args:
+            cached_data (bytes): Encoded entry, or plain JSON written before the codec layer
+            content (str or ContentEnvelope, optional): Content the entry is cached
+                for; without it the entry is never refreshed
+            length (int, optional): Summary length percentage
+            tone (str, optional): Summary tone
+            
+        Returns:
+            dict: Summary data marked as cached, and as stale past its soft TTL
+        """
+        cached_result = self.codec.decode(cached_data)
+        # Entries written before originals were stored separately embed the content
+        cached_result.pop('original_content', None)
+        fresh_until = cached_result.pop('fresh_until', None)
+        compute_time = cached_result.pop('compute_time', 0)
+        cached_result['cached'] = True
+        
+        # Entries written before soft TTLs existed expire at the hard TTL only
+        if fresh_until is not None:
+            now = time.time()
+            if now >= fresh_until:
+                cached_result['stale'] = True
+            if content is not None and self.refresh_due(fresh_until, compute_time, now):
+                self.schedule_refresh(content, length, tone, cached_result)
+        return cached_result
+
+    def load_archived(self, content, length, tone):
+        """
+        Get a summary from the database archive and write it back into the store
+        
+        Args:
+            content (ContentEnvelope): Content
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            
+        Returns:
+            dict: Summary data marked as cached, or None if it is not archived
+        """
+        if self.archive is None:
             return None
+            
+        archived = self.archive.get(
+            content.key_hash, length, tone, self.model_version, self.get_generation('summary')
+        )
+        if archived is None:
+            return None
+        summary_data, compute_time = archived
+        self.cache_summary(content, length, tone, summary_data, compute_time, archive=False)
+        summary_data['cached'] = True
+        return summary_data
 
-    def cache_summary(self, content, length, tone, summary_data):
-        """Cache the summary data"""
-        if not self.is_connected():
+    def refresh_due(self, fresh_until, compute_time, now=None):
+        """
+        Decide whether a read should refresh an entry (XFetch early expiration)
+        
+        An entry is due once its soft TTL has passed, and before that with a
+        probability that rises as the soft TTL nears, scaled by how long the
+        summary took to generate and by REDIS_XFETCH_BETA.
+        
+        Args:
+            fresh_until (float): Time the soft TTL ends
+            compute_time (float): Seconds it took to generate the summary
+            now (float, optional): Current time
+            
+        Returns:
+            bool: True if a refresh is due
+        """
+        now = time.time() if now is None else now
+        # 1 - random() is in (0, 1], so the logarithm is never taken of zero
+        early = -compute_time * self.xfetch_beta * math.log(1.0 - random.random())
+        return now + early >= fresh_until
+
+    def schedule_refresh(self, content, length, tone, cached_result):
+        """
+        Queue one background regeneration of a cached summary
+        
+        A refresh lock in the store keeps concurrent readers, in this worker or
+        others, from queueing the same regeneration; it expires on its own so a
+        failed refresh is retried after REDIS_REFRESH_LOCK_TTL seconds.
+        
+        Args:
+            content (str or ContentEnvelope): Content the summary is cached for
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            cached_result (dict): Cached summary being served
+        """
+        if self.refresher is None or not self.is_connected():
+            return
+            
+        name = f"refresh:{self.generate_cache_key(content, length, tone)}"
+        token = uuid.uuid4().hex
+        try:
+            if not self.store.acquire_lock(name, token, self.refresh_lock_ttl):
+                return
+        except Exception as e:
+            self.handle_error('refresh lock', e)
+            return
+            
+        try:
+            if self.refresher(content, length, tone, dict(cached_result)) is False:
+                # Dropped for lack of capacity, so a later read may try again
+                self.release_lock(name, token)
+        except Exception as e:
+            print(f"Cache refresh error: {str(e)}")
+            self.release_lock(name, token)
+
+    def cache_summary(self, content, length, tone, summary_data, compute_time=0, archive=True):
+        """
+        Cache the summary data
+        
+        Args:
+            content (str or ContentEnvelope): Content the summary was generated from
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            summary_data (dict): Summary response data
+            compute_time (float): Seconds it took to generate the summary, which
+                sets how early it may be refreshed
+            archive (bool): Whether to also write the summary to the database archive
+            
+        Returns:
+            bool: True if the summary was cached in the store
+        """
+        return self.cache_summaries(content, [(length, tone, summary_data)], compute_time, archive)
+
+    def cache_summaries(self, content, summaries, compute_time=0, archive=True):
+        """
+        Cache summaries of one content in several lengths and tones in one round trip
+        
+        Summary entries reference their content by hash instead of holding
+        it; a client that needs the content already has it.
+        
+        Args:
+            content (str or ContentEnvelope): Content the summaries were generated from
+            summaries (list): (length, tone, summary data) tuples
+            compute_time (float): Seconds it took to generate the summaries
+            archive (bool): Whether to also write the summaries to the database archive
+            
+        Returns:
+            bool: True if the summaries were cached in the store
+        """
+        if not summaries:
             return False
             
         try:
-            cache_key = self.generate_cache_key(content, length, tone)
-            self.redis_client.setex(
-                cache_key,
-                self.cache_expiry,
-                json.dumps(summary_data)
-            )
+            content = as_envelope(content)
+            if archive and self.archive is not None:
+                self.archive.save(
+                    content.key_hash, summaries, self.model_version, self.get_generation('summary'), compute_time
+                )
+            fresh_until = time.time() + self.cache_expiry
+            entries = []
+            for length, tone, summary_data in summaries:
+                cache_key = self.generate_cache_key(content, length, tone)
+                entry = {key: value for key, value in summary_data.items() if key != 'original_content'}
+                entry['content_hash'] = content.content_hash
+                entry['key_hash'] = content.key_hash
+                entry['fresh_until'] = fresh_until
+                entry['compute_time'] = round(compute_time, 3)
+                entries.append((length, tone, cache_key, self.codec.encode(entry)))
+                
+                # The local copy is kept even while the store is unavailable
+                self.local_cache.set(cache_key, entries[-1][3])
+            if not self.is_connected():
+                return False
+            
+            pipe = self.store.pipeline()
+            for length, tone, cache_key, cached_data in entries:
+                pipe.setex(
+                    cache_key,
+                    self.hard_expiry,
+                    cached_data
+                )
+                self.bloom_add(pipe, cache_key)
+                if self.invalidation_enabled:
+                    pipe.publish(INVALIDATION_CHANNEL, f"{self.instance_id}:{cache_key}")
+                self.index_fingerprint(pipe, content, length, tone, cache_key)
+            pipe.execute()
+            return True
+        except Exception as e:
+            self.handle_error('set', e)
+            return False
+
+    def generate_fingerprint_keys(self, fingerprint, length, tone):
+        """
+        Generate the LSH band keys of a content fingerprint
+        
+        Each band key holds a sorted set of "<fingerprint>:<cache key>" members,
+        scored by the time they were cached, for the summaries whose fingerprint
+        has that band value. Length, tone and the
+        summary key scope are part of the key so only summaries with the same
+        settings, generation and version are ever matched.
+        
+        Args:
+            fingerprint (int): SimHash of the content
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            
+        Returns:
+            list: Band keys
+        """
+        scope = self.key_scope('summary')
+        # Not simhash: keys, which held plain sets and are left to expire
+        return [
+            f"lsh:{scope}:{length}:{tone}:{index}:{value:x}"
+            for index, value in lsh_bands(fingerprint, self.near_duplicate_band_count)
+        ]
+
+    @property
+    def near_duplicate_band_count(self):
+        """Fingerprint bands, one more than the bit distance the similarity threshold allows"""
+        return max_distance_for(self.near_duplicate_threshold) + 1
+
+    @property
+    def near_duplicate_band_size(self):
+        """Most recent members kept in each fingerprint band"""
+        return max(1, self.near_duplicate_max_candidates // self.near_duplicate_band_count)
+
+    def index_fingerprint(self, pipe, content, length, tone, cache_key):
+        """
+        Add a cached summary to the near-duplicate index
+        
+        Args:
+            pipe: Store pipeline the commands are queued on
+            content (str or ContentEnvelope): Content the summary was generated from
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            cache_key (str): Key the summary is cached under
+        """
+        if not self.near_duplicate_enabled:
+            return
+        fingerprint = simhash_words(as_envelope(content).tokens)
+        if fingerprint is None:
+            return
+        member = f"{fingerprint:016x}:{cache_key}"
+        for band_key in self.generate_fingerprint_keys(fingerprint, length, tone):
+            pipe.zadd(band_key, {member: time.time()})
+            pipe.zremrangebyrank(band_key, 0, -self.near_duplicate_band_size - 1)
+            pipe.expire(band_key, self.hard_expiry)
+            self.bloom_add(pipe, band_key)
+
+    def find_near_duplicate(self, content, length, tone):
+        """
+        Find a cached summary of content that is nearly the same as this content
+        
+        Candidates sharing at least one fingerprint band are compared in full and
+        the most similar one meeting the similarity threshold is returned. Only
+        the most recently cached members of each band are kept, so at most
+        near_duplicate_max_candidates are compared; an older near duplicate in a
+        busy band is not found.
+        
+        Args:
+            content (str or ContentEnvelope): Content
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            
+        Returns:
+            dict: Cached summary marked as a near duplicate, or None
+        """
+        if not self.near_duplicate_enabled or not self.is_connected():
+            return None
+        content = as_envelope(content)
+        fingerprint = simhash_words(content.tokens)
+        if fingerprint is None:
+            return None
+            
+        band_keys = self.generate_fingerprint_keys(fingerprint, length, tone)
+        if self.bloom_ready:
+            band_keys = [band_key for band_key in band_keys if self.might_exist(band_key)]
+            if not band_keys:
+                self.count('round_trips_saved')
+                return None
+            
+        try:
+            pipe = self.store.pipeline()
+            for band_key in band_keys:
+                pipe.zrevrange(band_key, 0, self.near_duplicate_band_size - 1)
+            candidates = {}
+            for members in pipe.execute():
+                if not members and self.bloom_ready:
+                    self.count('false_positives')
+                # A set on a shard that is down reads as None
+                members = members or ()
+                self.count('near_duplicate_candidates', len(members))
+                for member in members:
+                    candidate, cache_key = member.decode('utf-8').split(':', 1)
+                    score = similarity(fingerprint, int(candidate, 16))
+                    if score >= self.near_duplicate_threshold:
+                        candidates[cache_key] = max(score, candidates.get(cache_key, 0))
+                        
+            # Most similar first; entries whose summary has expired are skipped
+            for cache_key in sorted(candidates, key=candidates.get, reverse=True):
+                cached_data = self.get_entry(cache_key)
+                if cached_data:
+                    cached_result = self.load_summary(cached_data)
+                    cached_result['near_duplicate'] = True
+                    cached_result['similarity'] = round(candidates[cache_key], 3)
+                    return cached_result
+            return None
+        except Exception as e:
+            self.handle_error('near-duplicate lookup', e)
+            return None
+
+    def generate_chunk_key(self, chunk, tone):
+        """Generate a cache key for a single chunk summary"""
+        params = f"{self.key_scope('chunk')}:{' '.join(chunk.split())}:{tone}"
+        return f"chunk:{hashlib.blake2b(params.encode(), digest_size=16).hexdigest()}"
+
+    def get_cached_chunk_summaries(self, chunks, tone):
+        """
+        Look up summaries of several chunks in one round trip
+        
+        Args:
+            chunks (list): Chunk texts
+            tone (str): Summary tone
+            
+        Returns:
+            list: Cached summary for each chunk, None where there is none
+        """
+        if not chunks or not self.is_connected():
+            return [None] * len(chunks)
+            
+        try:
+            keys = [self.generate_chunk_key(chunk, tone) for chunk in chunks]
+            return [
+                summary.decode('utf-8') if summary is not None else None
+                for summary in self.store.mget(keys)
+            ]
+        except Exception as e:
+            self.handle_error('get', e)
+            return [None] * len(chunks)
+
+    def cache_chunk_summaries(self, chunk_summaries, tone):
+        """
+        Cache summaries of several chunks in one round trip
+        
+        Args:
+            chunk_summaries (dict): Mapping of chunk text to its summary
+            tone (str): Summary tone
+            
+        Returns:
+            bool: True if the summaries were cached
+        """
+        if not chunk_summaries or not self.is_connected():
+            return False
+            
+        try:
+            pipe = self.store.pipeline()
+            for chunk, summary in chunk_summaries.items():
+                pipe.setex(self.generate_chunk_key(chunk, tone), self.chunk_cache_expiry, summary)
+            pipe.execute()
             return True
         except Exception as e:
-            print(f"Redis set error: {str(e)}")
+            self.handle_error('set', e)
             return False
 
+    def acquire_lock(self, name, token, ttl):
+        """
+        Acquire a short-lived lock shared by every process using this store
+        
+        Args:
+            name (str): Lock name
+            token (str): Unique token identifying the holder
+            ttl (float): Lock lifetime in seconds
+            
+        Returns:
+            bool: True if the lock was acquired or the store is unavailable (no
+                other process can be coordinated with), False if another holder has it
+        """
+        if not self.is_connected():
+            return True
+            
+        try:
+            return self.store.acquire_lock(name, token, ttl)
+        except Exception as e:
+            self.handle_error('lock', e)
+            return True
+
+    def release_lock(self, name, token):
+        """
+        Release a lock if it is still held by the given token
+        
+        Args:
+            name (str): Lock name
+            token (str): Token used to acquire the lock
+        """
+        if not self.is_connected():
+            return
+            
+        try:
+            self.store.release_lock(name, token)
+        except Exception as e:
+            self.handle_error('unlock', e)
+
+    def start_invalidation_listener(self):
+        """Start a background thread that drops local entries other workers rewrite"""
+        listener = threading.Thread(target=self.listen_for_invalidations, name='cache-invalidation', daemon=True)
+        listener.start()
+
+    def listen_for_invalidations(self):
+        """Apply invalidation messages from other workers, resubscribing after errors"""
+        delay = 1
+        while True:
+            try:
+                pubsub = self.store.pubsub()
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                delay = 1
+                for message in pubsub.listen():
+                    sender, _, cache_key = message['data'].decode('utf-8').partition(':')
+                    if sender != self.instance_id:
+                        self.local_cache.delete(cache_key)
+            except Exception as e:
+                self.handle_error('invalidation listener', e)
+                # Messages may have been missed while disconnected
+                self.local_cache.clear()
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+
 # Create a global instance
-redis_cache = RedisCache()
+summary_cache = SummaryCache()
+
+# Name used before the cache had backends other than Redis
+redis_cache = summary_cache
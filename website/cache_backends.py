@@ -0,0 +1,793 @@
+"""
+Cache Storage Backends for AI Summary Feature
+
+This module holds the stores the summary cache keeps its entries in. Every
+store offers the same small subset of Redis commands (GET, MGET, INCR and a
+pipeline of SETEX, SET NX, EXPIRE, SADD, SMEMBERS and PUBLISH) plus short-lived locks,
+so the summary cache runs unchanged on any of them:
+
+- RedisStore: shared by every worker and node, the production setup
+- ShardedStore: keys spread over several stores (usually Redis nodes) with a
+  consistent hash ring, so capacity and throughput grow with the nodes
+- MemoryStore: a dictionary in the current process, for development and tests
+- DiskStore: a SQLite file shared by the workers of one node, a persistent
+  cache without a network round trip
+
+The store is chosen by CACHE_BACKEND; see create_store.
+"""
+
+import os
+import time
+import random
+import sqlite3
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+import redis
+
+try:
+    from .hash_ring import HashRing
+except ImportError:  # Imported as a top-level module, as the Redis test script does
+    from hash_ring import HashRing
+
+# Delete a lock only if it still belongs to the caller, so an expired lock that
+# another process has since acquired is never released by mistake
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+DEFAULT_DISK_PATH = Path(__file__).resolve().parent.parent / 'instance' / 'summary_cache.sqlite3'
+
+def to_bytes(value):
+    """Encode a stored value the way Redis does"""
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode('utf-8')
+
+def rank_slice(members, start, end):
+    """
+    Select members by rank the way Redis does
+
+    Args:
+        members (list): Members in rank order
+        start (int): First rank, negative ranks count from the last member
+        end (int): Last rank, inclusive
+
+    Returns:
+        list: Members from start to end
+    """
+    count = len(members)
+    start = max(0, start + count if start < 0 else start)
+    end = end + count if end < 0 else end
+    return members[start:end + 1] if end >= start else []
+
+class StorePipeline:
+    """
+    Queue of store commands executed together, mirroring a Redis pipeline
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        """
+        Run the queued commands in order
+
+        Returns:
+            list: Result of each command
+        """
+        with self.store.lock:
+            results = [getattr(self.store, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+class CacheStore:
+    """
+    Base class of the stores kept by the application itself
+
+    Subclasses implement get, mget, setex, set, delete, incr, expire, zadd,
+    zrevrange and zremrangebyrank; pipelines, publishing and locks are built on top of them.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.lock = threading.RLock()
+
+    def is_connected(self):
+        """Local stores are always available"""
+        return True
+
+    def is_available(self, key):
+        """Whether a key can be read, so a None read means it is not stored"""
+        return self.is_connected()
+
+    def handle_error(self, action, error):
+        """
+        Report a failed store operation
+
+        Args:
+            action (str): Operation that failed, for the log
+            error (Exception): Raised exception
+        """
+        print(f"Cache {action} error ({self.name}): {str(error)}")
+
+    def pipeline(self):
+        """Start a pipeline of commands"""
+        return StorePipeline(self)
+
+    def publish(self, channel, message):
+        """Nothing subscribes to a local store"""
+        return 0
+
+    def acquire_lock(self, name, token, ttl):
+        """
+        Acquire a short-lived lock shared by every user of this store
+
+        Args:
+            name (str): Lock name
+            token (str): Unique token identifying the holder
+            ttl (float): Lock lifetime in seconds
+
+        Returns:
+            bool: True if the lock was acquired, False if another holder has it
+        """
+        with self.lock:
+            return bool(self.set(f"lock:{name}", token, nx=True, ex=ttl))
+
+    def release_lock(self, name, token):
+        """
+        Release a lock if it is still held by the given token
+
+        Args:
+            name (str): Lock name
+            token (str): Token used to acquire the lock
+        """
+        with self.lock:
+            if self.get(f"lock:{name}") == to_bytes(token):
+                self.delete(f"lock:{name}")
+
+class MemoryStore(CacheStore):
+    """
+    Store in a dictionary of the current process
+
+    Entries are lost on restart and not shared between workers. The oldest
+    entries are evicted once max_entries is reached.
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_entries=100000):
+        """
+        Initialize the memory store
+
+        Args:
+            max_entries (int): Largest number of keys kept
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        # key -> [value (bytes, or dict of member bytes -> score), expiry time or None]
+        self._data = {}
+
+    def _lookup(self, key):
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.time():
+            del self._data[key]
+            return None
+        return item
+
+    def _store(self, key, value, ttl):
+        self._data.pop(key, None)
+        self._data[key] = [value, time.time() + ttl if ttl else None]
+        while len(self._data) > self.max_entries:
+            del self._data[next(iter(self._data))]
+
+    def get(self, key):
+        with self.lock:
+            item = self._lookup(key)
+            return item[0] if item is not None and isinstance(item[0], bytes) else None
+
+    def mget(self, keys):
+        with self.lock:
+            return [self.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        with self.lock:
+            self._store(key, to_bytes(value), ttl)
+            return True
+
+    def set(self, key, value, nx=False, ex=None):
+        with self.lock:
+            if nx and self._lookup(key) is not None:
+                return None
+            self._store(key, to_bytes(value), ex)
+            return True
+
+    def delete(self, key):
+        with self.lock:
+            return 1 if self._data.pop(key, None) is not None else 0
+
+    def incr(self, key):
+        with self.lock:
+            item = self._lookup(key)
+            value = int(item[0]) + 1 if item is not None else 1
+            self._store(key, to_bytes(value), item[1] - time.time() if item and item[1] else None)
+            return value
+
+    def expire(self, key, ttl):
+        with self.lock:
+            item = self._lookup(key)
+            if item is None:
+                return False
+            item[1] = time.time() + ttl
+            return True
+
+    def zadd(self, key, mapping):
+        with self.lock:
+            item = self._lookup(key)
+            if item is None or not isinstance(item[0], dict):
+                self._store(key, {}, None)
+                item = self._data[key]
+            added = 0
+            for member, score in mapping.items():
+                member = to_bytes(member)
+                added += member not in item[0]
+                item[0][member] = float(score)
+            return added
+
+    def _ranked(self, key):
+        item = self._lookup(key)
+        if item is None or not isinstance(item[0], dict):
+            return []
+        scores = item[0]
+        return sorted(scores, key=lambda member: (scores[member], member))
+
+    def zrevrange(self, key, start, end):
+        with self.lock:
+            return rank_slice(self._ranked(key)[::-1], start, end)
+
+    def zremrangebyrank(self, key, start, end):
+        with self.lock:
+            removed = rank_slice(self._ranked(key), start, end)
+            for member in removed:
+                del self._data[key][0][member]
+            return len(removed)
+
+class DiskStore(CacheStore):
+    """
+    Store in a SQLite file
+
+    The file is shared by every worker on the node and survives restarts.
+    Expired rows are skipped when read and deleted every purge_interval writes.
+    """
+
+    name = 'disk'
+
+    def __init__(self, path=DEFAULT_DISK_PATH, purge_interval=1000):
+        """
+        Initialize the disk store
+
+        Args:
+            path (str): SQLite database file, created if missing
+            purge_interval (int): Writes between deletions of expired rows
+        """
+        super().__init__()
+        self.path = str(path)
+        self.purge_interval = purge_interval
+        self._writes = 0
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self.connection() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS members ("
+                "key TEXT, member BLOB, score REAL, expires_at REAL, PRIMARY KEY (key, member))"
+            )
+            # Files written before members were ranked
+            if 'score' not in [row[1] for row in db.execute("PRAGMA table_info(members)")]:
+                db.execute("ALTER TABLE members ADD COLUMN score REAL")
+        self.purge()
+
+    def connection(self):
+        """Get the SQLite connection of the current thread"""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def pipeline(self):
+        """Start a pipeline whose commands run in one transaction"""
+        return DiskPipeline(self)
+
+    def purge(self):
+        """Delete expired rows"""
+        now = time.time()
+        db = self.connection()
+        db.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        db.execute("DELETE FROM members WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+    def _written(self):
+        self._writes += 1
+        if self._writes % self.purge_interval == 0:
+            self.purge()
+
+    def get(self, key):
+        row = self.connection().execute(
+            "SELECT value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def mget(self, keys):
+        if not keys:
+            return []
+        placeholders = ','.join('?' * len(keys))
+        rows = dict(self.connection().execute(
+            f"SELECT key, value FROM entries WHERE key IN ({placeholders}) "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (*keys, time.time())
+        ).fetchall())
+        return [bytes(rows[key]) if key in rows else None for key in keys]
+
+    def setex(self, key, ttl, value):
+        return self.set(key, value, ex=ttl)
+
+    def set(self, key, value, nx=False, ex=None):
+        now = time.time()
+        expires_at = now + ex if ex else None
+        db = self.connection()
+        if nx:
+            cursor = db.execute(
+                "INSERT INTO entries (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE entries.expires_at IS NOT NULL AND entries.expires_at <= ?",
+                (key, to_bytes(value), expires_at, now)
+            )
+            stored = cursor.rowcount > 0
+        else:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, to_bytes(value), expires_at)
+            )
+            stored = True
+        self._written()
+        return True if stored else None
+
+    def delete(self, key):
+        db = self.connection()
+        deleted = db.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount
+        deleted += db.execute("DELETE FROM members WHERE key = ?", (key,)).rowcount
+        return 1 if deleted else 0
+
+    def incr(self, key):
+        db = self.connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            value = int(self.get(key) or 0) + 1
+            db.execute(
+                "INSERT INTO entries (key, value, expires_at) VALUES (?, ?, NULL) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, to_bytes(value))
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return value
+
+    def expire(self, key, ttl):
+        db = self.connection()
+        expires_at = time.time() + ttl
+        updated = db.execute("UPDATE entries SET expires_at = ? WHERE key = ?", (expires_at, key)).rowcount
+        updated += db.execute("UPDATE members SET expires_at = ? WHERE key = ?", (expires_at, key)).rowcount
+        return updated > 0
+
+    def zadd(self, key, mapping):
+        db = self.connection()
+        # New members share the expiry the set already has
+        row = db.execute("SELECT MAX(expires_at) FROM members WHERE key = ?", (key,)).fetchone()
+        added = 0
+        for member, score in mapping.items():
+            member = to_bytes(member)
+            exists = db.execute("SELECT 1 FROM members WHERE key = ? AND member = ?", (key, member)).fetchone()
+            db.execute(
+                "INSERT INTO members (key, member, score, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key, member) DO UPDATE SET score = excluded.score",
+                (key, member, float(score), row[0])
+            )
+            added += exists is None
+        self._written()
+        return added
+
+    def _ranked(self, key):
+        rows = self.connection().execute(
+            "SELECT member FROM members WHERE key = ? AND (expires_at IS NULL OR expires_at > ?) "
+            "ORDER BY score, member",
+            (key, time.time())
+        ).fetchall()
+        return [bytes(row[0]) for row in rows]
+
+    def zrevrange(self, key, start, end):
+        return rank_slice(self._ranked(key)[::-1], start, end)
+
+    def zremrangebyrank(self, key, start, end):
+        removed = rank_slice(self._ranked(key), start, end)
+        self.connection().executemany(
+            "DELETE FROM members WHERE key = ? AND member = ?", [(key, member) for member in removed]
+        )
+        return len(removed)
+
+    def acquire_lock(self, name, token, ttl):
+        return bool(self.set(f"lock:{name}", token, nx=True, ex=ttl))
+
+    def release_lock(self, name, token):
+        self.connection().execute(
+            "DELETE FROM entries WHERE key = ? AND value = ?",
+            (f"lock:{name}", to_bytes(token))
+        )
+
+class DiskPipeline(StorePipeline):
+    """
+    Pipeline of a DiskStore, committed as one SQLite transaction
+    """
+
+    def execute(self):
+        db = self.store.connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            results = [getattr(self.store, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            self.commands = []
+        return results
+
+class RedisStore:
+    """
+    Store in Redis, shared by every worker and node
+    """
+
+    name = 'redis'
+
+    def __init__(self, redis_url, client=None):
+        """
+        Initialize the Redis store
+
+        Args:
+            redis_url (str): Redis connection URL
+            client (redis.Redis, optional): Client to use instead of a pool for
+                redis_url, e.g. a fakeredis client in tests
+        """
+        # Name of the node on the hash ring; the password is left out so
+        # rotating it does not move any keys
+        url = urlparse(redis_url)
+        self.node = f"{url.hostname}:{url.port or 6379}/{url.path.lstrip('/') or 0}"
+        
+        # One shared pool; connections idle longer than the health check
+        # interval are checked before reuse. Responses stay bytes because
+        # summary entries are stored in a binary format
+        if client is None:
+            self.pool = redis.ConnectionPool.from_url(
+                redis_url,
+                decode_responses=False,
+                max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),
+                socket_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT', 2)),
+                socket_connect_timeout=float(os.getenv('REDIS_SOCKET_TIMEOUT', 2)),
+                health_check_interval=30
+            )
+            client = redis.Redis(connection_pool=self.pool)
+        self.redis_client = client
+
+        # Connection state is kept up to date by the health monitor instead of
+        # a PING before every operation
+        self.health_check_interval = float(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 5))
+        self.reconnect_max_delay = float(os.getenv('REDIS_RECONNECT_MAX_DELAY', 30))
+        self._connected = self.ping()
+        self._recheck = threading.Event()
+        if self._connected:
+            print("Successfully connected to Redis Cloud!")
+        else:
+            print("Failed to connect to Redis, retrying in the background")
+        threading.Thread(target=self.monitor_health, name='redis-health', daemon=True).start()
+
+    def is_connected(self):
+        """Check if Redis is connected and working, as last seen by the health monitor"""
+        return self._connected
+
+    def is_available(self, key):
+        """Whether a key can be read, so a None read means it is not stored"""
+        return self._connected
+
+    def ping(self):
+        """
+        Send a PING to Redis
+
+        Returns:
+            bool: True if Redis answered
+        """
+        try:
+            return bool(self.redis_client.ping())
+        except Exception:
+            return False
+
+    def monitor_health(self):
+        """
+        Keep the connection state current, reconnecting with backoff after a failure
+
+        While Redis is healthy it is pinged every REDIS_HEALTH_CHECK_INTERVAL
+        seconds, or at once when an operation reports a connection error. While
+        it is down, reconnects are tried with jittered exponential backoff.
+        """
+        delay = 1.0
+        while True:
+            if self.ping():
+                if not self._connected:
+                    print(f"Reconnected to Redis ({self.node})")
+                self._connected = True
+                delay = 1.0
+                self._recheck.wait(self.health_check_interval)
+                self._recheck.clear()
+            else:
+                if self._connected:
+                    print(f"Lost connection to Redis ({self.node}), caching paused until it reconnects")
+                self._connected = False
+                time.sleep(random.uniform(delay / 2, delay))
+                delay = min(delay * 2, self.reconnect_max_delay)
+
+    def handle_error(self, action, error):
+        """
+        Report a failed Redis operation, marking the connection down if it was lost
+
+        Args:
+            action (str): Operation that failed, for the log
+            error (Exception): Raised exception
+        """
+        print(f"Redis {action} error: {str(error)}")
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self._connected = False
+            self._recheck.set()
+
+    def get(self, key):
+        return self.redis_client.get(key)
+
+    def mget(self, keys):
+        return self.redis_client.mget(keys)
+
+    def incr(self, key):
+        return self.redis_client.incr(key)
+
+    def pipeline(self):
+        return self.redis_client.pipeline(transaction=False)
+
+    def pubsub(self):
+        return self.redis_client.pubsub(ignore_subscribe_messages=True)
+
+    def acquire_lock(self, name, token, ttl):
+        """
+        Acquire a short-lived lock shared by every process using this Redis
+
+        Args:
+            name (str): Lock name
+            token (str): Unique token identifying the holder
+            ttl (float): Lock lifetime in seconds
+
+        Returns:
+            bool: True if the lock was acquired, False if another holder has it
+        """
+        return bool(self.redis_client.set(f"lock:{name}", token, nx=True, px=int(ttl * 1000)))
+
+    def release_lock(self, name, token):
+        """
+        Release a lock if it is still held by the given token
+
+        Args:
+            name (str): Lock name
+            token (str): Token used to acquire the lock
+        """
+        self.redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{name}", token)
+
+# Errors that mean a shard is unreachable rather than that a command is wrong
+SHARD_ERRORS = (redis.ConnectionError, redis.TimeoutError)
+
+class ShardedPipeline:
+    """
+    Pipeline over a ShardedStore, sent as one pipeline per shard
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            # Commands are routed by their key; messages go to the pub/sub shard
+            shard = self.store.pubsub_shard if name == 'publish' else self.store.shard_for(args[0])
+            self.commands.append((shard, name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        """
+        Run the queued commands, one round trip per shard involved
+
+        Commands of a shard that is down are skipped and their results are None.
+
+        Returns:
+            list: Result of each command, in the order they were queued
+        """
+        results = [None] * len(self.commands)
+        by_shard = {}
+        for index, (shard, name, args, kwargs) in enumerate(self.commands):
+            by_shard.setdefault(id(shard), (shard, []))[1].append((index, name, args, kwargs))
+        self.commands = []
+
+        for shard, commands in by_shard.values():
+            if not shard.is_connected():
+                continue
+            pipe = shard.pipeline()
+            for _, name, args, kwargs in commands:
+                getattr(pipe, name)(*args, **kwargs)
+            try:
+                for (index, *_), result in zip(commands, pipe.execute()):
+                    results[index] = result
+            except SHARD_ERRORS as e:
+                shard.handle_error('pipeline', e)
+        return results
+
+class ShardedStore:
+    """
+    Store that spreads keys over several stores with a consistent hash ring
+
+    Each shard keeps its own connection state. While a shard is down, reads of
+    its keys are misses and writes to it are dropped; the other shards keep
+    serving their keys, and no keys move while the shard is away.
+    """
+
+    def __init__(self, shards, virtual_nodes=160):
+        """
+        Initialize the sharded store
+
+        Args:
+            shards (list): Stores with a unique node attribute, all of one kind
+            virtual_nodes (int): Points on the ring per shard
+        """
+        self.shards = {shard.node: shard for shard in shards}
+        self.name = shards[0].name
+        self.ring = HashRing(self.shards, virtual_nodes=virtual_nodes)
+        # Invalidation messages are published and received on one shard
+        self.pubsub_shard = shards[0]
+        if hasattr(self.pubsub_shard, 'pubsub'):
+            self.pubsub = self.pubsub_shard.pubsub
+
+    def shard_for(self, key):
+        """Get the shard a key belongs to"""
+        return self.shards[self.ring.node_for(key)]
+
+    def is_connected(self):
+        """Available while any shard is"""
+        return any(shard.is_connected() for shard in self.shards.values())
+
+    def is_available(self, key):
+        """
+        Whether the shard of a key is connected
+
+        Reads of keys on a shard that is down return None like missing keys do;
+        this tells the two apart.
+
+        Args:
+            key (str): Store key
+
+        Returns:
+            bool: True if a None read of the key means it is not stored
+        """
+        return self.shard_for(key).is_connected()
+
+    def shard_health(self):
+        """
+        Get the connection state of each shard
+
+        Returns:
+            dict: Node name to True if it is connected
+        """
+        return {node: shard.is_connected() for node, shard in self.shards.items()}
+
+    def handle_error(self, action, error):
+        """
+        Report a failed operation; shard connection errors are handled where they occur
+
+        Args:
+            action (str): Operation that failed, for the log
+            error (Exception): Raised exception
+        """
+        print(f"Sharded cache {action} error: {str(error)}")
+
+    def _call(self, key, method, *args, default=None):
+        """Run a command on the shard of a key, returning default if the shard is down"""
+        shard = self.shard_for(key)
+        if not shard.is_connected():
+            return default
+        try:
+            return getattr(shard, method)(*args)
+        except SHARD_ERRORS as e:
+            shard.handle_error(method, e)
+            return default
+
+    def get(self, key):
+        return self._call(key, 'get', key)
+
+    def mget(self, keys):
+        by_shard = {}
+        for index, key in enumerate(keys):
+            shard = self.shard_for(key)
+            by_shard.setdefault(id(shard), (shard, []))[1].append(index)
+        values = [None] * len(keys)
+        for shard, indexes in by_shard.values():
+            shard_keys = [keys[index] for index in indexes]
+            for index, value in zip(indexes, self._call(shard_keys[0], 'mget', shard_keys, default=[])):
+                values[index] = value
+        return values
+
+    def incr(self, key):
+        return self._call(key, 'incr', key)
+
+    def pipeline(self):
+        return ShardedPipeline(self)
+
+    def acquire_lock(self, name, token, ttl):
+        # Without the lock's shard no other process can be coordinated with
+        return self._call(f"lock:{name}", 'acquire_lock', name, token, ttl, default=True)
+
+    def release_lock(self, name, token):
+        self._call(f"lock:{name}", 'release_lock', name, token)
+
+def create_store(name=None):
+    """
+    Create a cache store by name
+
+    Args:
+        name (str, optional): 'redis', 'memory' or 'disk', defaults to CACHE_BACKEND,
+            or to 'redis' when REDIS_URLS or REDIS_URL is set and 'memory' otherwise.
+            Redis is sharded when REDIS_URLS lists more than one node
+
+    Returns:
+        Store instance
+    """
+    redis_urls = [url.strip() for url in os.getenv('REDIS_URLS', '').split(',') if url.strip()]
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_urls and redis_url:
+        redis_urls = [redis_url]
+    name = (name or os.getenv('CACHE_BACKEND') or ('redis' if redis_urls else 'memory')).lower()
+
+    if name == 'disk':
+        return DiskStore(
+            path=os.getenv('CACHE_DISK_PATH', DEFAULT_DISK_PATH),
+            purge_interval=int(os.getenv('CACHE_DISK_PURGE_INTERVAL', 1000))
+        )
+    if name == 'redis':
+        if len(redis_urls) > 1:
+            return ShardedStore(
+                [RedisStore(url) for url in redis_urls],
+                virtual_nodes=int(os.getenv('REDIS_VIRTUAL_NODES', 160))
+            )
+        if redis_urls:
+            return RedisStore(redis_urls[0])
+        print("REDIS_URL environment variable is not set, caching in memory instead")
+    elif name != 'memory':
+        print(f"Unknown cache backend '{name}', caching in memory instead")
+    return MemoryStore(max_entries=int(os.getenv('CACHE_MEMORY_MAX_ENTRIES', 100000)))
@@ -0,0 +1,195 @@
+"""
+Cache Value Codec Module for AI Summary Feature
+
+This module turns cached values into compact bytes and back. Every encoded
+value starts with a zero byte and a format byte; the format byte names the
+serializer (high four bits) and the compressor (low four bits), so the format
+written can change while older values stay readable. Values above a size
+threshold are compressed, and kept compressed only if that makes them smaller.
+
+Values are written as JSON compressed with zlib, which every worker can read.
+msgpack and zstandard are optional and only written when configured, so they
+should be enabled only once every worker sharing the cache has them installed;
+a worker without them cannot read their values. Values written before this
+module existed (plain JSON or text without the zero byte) are recognized and
+read as they are.
+"""
+
+import os
+import json
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only when msgpack is missing
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only when zstandard is missing
+    zstandard = None
+
+# First byte of every encoded value; plain JSON and processed text never start with it
+CODEC_MARKER = 0
+
+# Serializer ids (high four bits of the format byte)
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+
+# Compressor ids (low four bits of the format byte)
+COMPRESSOR_NONE = 0
+COMPRESSOR_ZLIB = 1
+COMPRESSOR_ZSTD = 2
+
+SERIALIZER_NAMES = {'json': SERIALIZER_JSON, 'msgpack': SERIALIZER_MSGPACK}
+COMPRESSOR_NAMES = {'none': COMPRESSOR_NONE, 'zlib': COMPRESSOR_ZLIB, 'zstd': COMPRESSOR_ZSTD}
+
+class CodecError(ValueError):
+    """Raised when a value cannot be encoded or decoded in its format"""
+
+def serialize(serializer, value):
+    """Serialize a value with the given serializer id"""
+    if serializer == SERIALIZER_MSGPACK and msgpack is not None:
+        return msgpack.packb(value, use_bin_type=True)
+    if serializer == SERIALIZER_JSON:
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+    raise CodecError(f"Serializer {serializer} is not available")
+
+def deserialize(serializer, data):
+    """Deserialize bytes written by the given serializer id"""
+    if serializer == SERIALIZER_MSGPACK and msgpack is not None:
+        return msgpack.unpackb(data, raw=False)
+    if serializer == SERIALIZER_JSON:
+        return json.loads(data.decode('utf-8'))
+    raise CodecError(f"Serializer {serializer} is not available")
+
+def compress(compressor, data):
+    """Compress bytes with the given compressor id"""
+    if compressor == COMPRESSOR_ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data)
+    if compressor == COMPRESSOR_ZLIB:
+        return zlib.compress(data)
+    if compressor == COMPRESSOR_NONE:
+        return data
+    raise CodecError(f"Compressor {compressor} is not available")
+
+def decompress(compressor, data):
+    """Decompress bytes written by the given compressor id"""
+    if compressor == COMPRESSOR_ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data)
+    if compressor == COMPRESSOR_ZLIB:
+        return zlib.decompress(data)
+    if compressor == COMPRESSOR_NONE:
+        return data
+    raise CodecError(f"Compressor {compressor} is not available")
+
+def is_encoded(data):
+    """
+    Check whether stored bytes were written by a codec
+
+    Args:
+        data (bytes): Stored value
+
+    Returns:
+        bool: False for values written before the codec layer
+    """
+    return len(data) >= 2 and data[0] == CODEC_MARKER
+
+def decode_legacy(data):
+    """
+    Read a value written before the codec layer
+
+    Args:
+        data (bytes or str): Plain JSON or plain text
+
+    Returns:
+        object: Decoded JSON object, or the text itself
+    """
+    text = data.decode('utf-8') if isinstance(data, bytes) else data
+    if text.startswith('{'):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+class CacheCodec:
+    """
+    Serializer plus optional compression for cache values
+    """
+
+    def __init__(self, serializer='json', compressor='zlib', compress_threshold=512):
+        """
+        Initialize the codec
+
+        Args:
+            serializer (str): 'json' or 'msgpack'
+            compressor (str): 'none', 'zlib' or 'zstd'
+            compress_threshold (int): Serialized values of at least this many bytes are compressed
+        """
+        if serializer not in SERIALIZER_NAMES or compressor not in COMPRESSOR_NAMES:
+            raise CodecError(f"Unknown cache codec {serializer}+{compressor}")
+
+        # Fall back to the built-in formats when an optional package is missing
+        self.serializer = SERIALIZER_NAMES[serializer]
+        if self.serializer == SERIALIZER_MSGPACK and msgpack is None:
+            self.serializer = SERIALIZER_JSON
+        self.compressor = COMPRESSOR_NAMES[compressor]
+        if self.compressor == COMPRESSOR_ZSTD and zstandard is None:
+            self.compressor = COMPRESSOR_ZLIB
+        self.compress_threshold = compress_threshold
+
+    def encode(self, value):
+        """
+        Encode a value for storage
+
+        Args:
+            value (dict or str): JSON-compatible value
+
+        Returns:
+            bytes: Marker, format byte and payload
+        """
+        payload = serialize(self.serializer, value)
+        compressor = COMPRESSOR_NONE
+        if self.compressor != COMPRESSOR_NONE and len(payload) >= self.compress_threshold:
+            compressed = compress(self.compressor, payload)
+            if len(compressed) < len(payload):
+                payload, compressor = compressed, self.compressor
+        return bytes([CODEC_MARKER, self.serializer << 4 | compressor]) + payload
+
+    def decode(self, data):
+        """
+        Decode a stored value in any known format, including pre-codec values
+
+        Args:
+            data (bytes): Stored value
+
+        Returns:
+            object: Decoded value
+
+        Raises:
+            CodecError: If the format is unknown or its package is not installed
+        """
+        if not is_encoded(data):
+            return decode_legacy(data)
+        serializer, compressor = data[1] >> 4, data[1] & 0x0F
+        try:
+            return deserialize(serializer, decompress(compressor, data[2:]))
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Corrupt cache value in format {data[1]:#04x}: {str(e)}") from e
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a codec from the REDIS_CODEC_* environment variables
+
+        Returns:
+            CacheCodec: Configured codec
+        """
+        return cls(
+            serializer=os.getenv('REDIS_CODEC_SERIALIZER', 'json'),
+            compressor=os.getenv('REDIS_CODEC_COMPRESSOR', 'zlib'),
+            compress_threshold=int(os.getenv('REDIS_COMPRESS_THRESHOLD', 512))
+        )
@@ -0,0 +1,150 @@
+"""
+Circuit Breaker Module for AI Summary Feature
+
+This module stops sending requests to the model while it is failing. After a
+run of consecutive failures or slow calls the breaker opens and callers fail
+fast instead of each waiting for its own timeout. Once the open period has
+passed, a single probe call is let through (half-open); if it succeeds the
+breaker closes and normal service resumes, otherwise it opens again.
+"""
+
+import os
+import time
+import threading
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Breaker states
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with a single half-open probe
+    """
+
+    def __init__(self, failure_threshold=5, slow_call_threshold=30.0, reset_timeout=30.0):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold (int): Consecutive failures or slow calls that open the breaker
+            slow_call_threshold (float): Calls slower than this many seconds count as failures
+            reset_timeout (float): Seconds the breaker stays open before a probe is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.stats = {'opened': 0, 'rejected': 0, 'slow_calls': 0}
+
+    def allow(self):
+        """
+        Check whether a call may be sent now
+
+        Every allowed call must be followed by record_success, record_failure,
+        or cancel if it was never sent.
+
+        Returns:
+            bool: False while the breaker is open or a half-open probe is running
+        """
+        with self._lock:
+            if self.state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("Circuit breaker half-open, sending a probe call")
+
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self, latency=0.0):
+        """
+        Record a call that reached the model
+
+        Args:
+            latency (float): Call latency in seconds; slow calls count as failures
+        """
+        if latency > self.slow_call_threshold:
+            with self._lock:
+                self.stats['slow_calls'] += 1
+            self.record_failure()
+            return
+
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                logger.info("Circuit breaker closed, model calls restored")
+            self.state = STATE_CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def cancel(self):
+        """Give back an allowed call that never reached the model, so a half-open breaker can probe again"""
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, opening the breaker when the threshold is reached"""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == STATE_HALF_OPEN or (
+                    self.state == STATE_CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self._open()
+
+    @property
+    def is_open(self):
+        """Whether calls are currently being rejected"""
+        with self._lock:
+            if self.state == STATE_OPEN:
+                return time.monotonic() - self._opened_at < self.reset_timeout
+            return False
+
+    def get_stats(self):
+        """
+        Get breaker state and counters
+
+        Returns:
+            dict: State, consecutive failures and counters
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['state'] = self.state
+            stats['consecutive_failures'] = self.consecutive_failures
+        return stats
+
+    def _open(self):
+        """Open the breaker; the caller holds the lock"""
+        self.state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.stats['opened'] += 1
+        logger.warning(f"Circuit breaker opened after {self.consecutive_failures} consecutive failures")
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a breaker from the SUMMARY_BREAKER_* environment variables
+
+        Returns:
+            CircuitBreaker: Configured breaker
+        """
+        return cls(
+            failure_threshold=int(os.getenv('SUMMARY_BREAKER_FAILURES', 5)),
+            slow_call_threshold=float(os.getenv('SUMMARY_BREAKER_SLOW_CALL', 30)),
+            reset_timeout=float(os.getenv('SUMMARY_BREAKER_RESET', 30))
+        )
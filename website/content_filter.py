@@ -11,6 +11,10 @@ from collections import Counter
 import json
 import os
 from pathlib import Path
+try:
+    from .content_processor import as_envelope
+except ImportError:  # Imported as a top-level module, as the tests do
+    from content_processor import as_envelope
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -95,13 +99,13 @@ class ContentFilter:
         Detect keywords from filter lists in content
         
         Args:
-            content (str): Content to check
+            content (str or ContentEnvelope): Content to check
             filter_type (str, optional): Specific filter type to check
             
         Returns:
             dict: Dictionary with detected keywords and counts
         """
-        content = content.lower()
+        content = as_envelope(content).normalized
         detected = {}
         
         # If filter_type is specified, only check that filter
@@ -131,7 +135,7 @@ class ContentFilter:
         Detect the category of content based on keyword frequency
         
         Args:
-            content (str): Content to categorize
+            content (str or ContentEnvelope): Content to categorize
             
         Returns:
             dict: Dictionary with category information
@@ -149,7 +153,7 @@ class ContentFilter:
         }
         
         # Tokenize content
-        words = re.findall(r'\b\w+\b', content.lower())
+        words = as_envelope(content).tokens
         
         # Count category matches
         category_scores = {}
@@ -187,18 +191,22 @@ class ContentFilter:
             'confidence': confidence
         }
     
-    def is_content_appropriate(self, content):
+    def is_content_appropriate(self, content, detected=None):
         """
         Check if content is appropriate based on filter lists
         
         Args:
-            content (str): Content to check
+            content (str or ContentEnvelope): Content to check
+            detected (dict, optional): Keywords already detected in the content
             
         Returns:
             dict: Dictionary with appropriateness information
         """
         # Detect inappropriate keywords
-        detected = self.detect_keywords(content, 'inappropriate')
+        if detected is None:
+            detected = self.detect_keywords(content, 'inappropriate')
+        else:
+            detected = {name: matches for name, matches in detected.items() if name == 'inappropriate'}
         
         # If no inappropriate content detected
         if not detected:
@@ -240,19 +248,20 @@ class ContentFilter:
         Filter content and provide detailed analysis
         
         Args:
-            content (str): Content to filter
+            content (str or ContentEnvelope): Content to filter
             user_role (str): User role for permission checks (no longer used)
             
         Returns:
             dict: Dictionary with filtering results
         """
         # Admin bypass removed - all users are treated the same
+        envelope = as_envelope(content)
         
         # Check all filter types
-        all_detected = self.detect_keywords(content)
+        all_detected = self.detect_keywords(envelope)
         
         # Check if content is appropriate
-        appropriateness = self.is_content_appropriate(content)
+        appropriateness = self.is_content_appropriate(envelope, all_detected)
         
         # Generate warnings
         warnings = []
@@ -268,12 +277,12 @@ class ContentFilter:
         allowed = appropriateness['appropriate']
         
         # Get content category
-        categories = self.detect_content_category(content)
+        categories = self.detect_content_category(envelope)
         
         # Return filtering results
         return {
             'allowed': allowed,
-            'filtered_content': content if allowed else None,
+            'filtered_content': envelope.raw if allowed else None,
             'reason': appropriateness['reason'],
             'categories': categories,
             'warnings': warnings,
@@ -288,7 +297,7 @@ def filter_content(content, user_role='user', strict_mode=False):
     Filter content using the ContentFilter class
     
     Args:
-        content (str): Content to filter
+        content (str or ContentEnvelope): Content to filter
         user_role (str): User role for permission checks (no longer used)
         strict_mode (bool): Whether to use strict filtering mode
         
@@ -216,11 +216,13 @@ def extract_metadata(content):
     Extract metadata from content such as title, keywords, etc.
     
     Args:
-        content (str): Content to extract metadata from
+        content (str or ContentEnvelope): Content to extract metadata from
         
     Returns:
         dict: Dictionary containing extracted metadata
     """
+    envelope = as_envelope(content)
+    
     # Initialize metadata dictionary
     metadata = {
         "estimated_reading_time": 0,
@@ -230,8 +232,8 @@ def extract_metadata(content):
     }
     
     # Count words
-    words = re.findall(r'\b\w+\b', content)
-    word_count = len(words)
+    words = envelope.tokens
+    word_count = envelope.word_count
     metadata["word_count"] = word_count
     
     # Estimate reading time (average reading speed: 200-250 words per minute)
@@ -242,7 +244,6 @@ def extract_metadata(content):
     common_words = {'the', 'and', 'a', 'to', 'of', 'in', 'is', 'that', 'it', 'with', 'for', 'as', 'on', 'was', 'be', 'at'}
     word_freq = {}
     for word in words:
-        word = word.lower()
         if len(word) > 3 and word not in common_words:
             word_freq[word] = word_freq.get(word, 0) + 1
     
@@ -252,6 +253,87 @@ def extract_metadata(content):
     
     return metadata
 
+# Gemini averages roughly four characters of English text per token
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(content):
+    """
+    Estimate the number of Gemini tokens in content without calling the API
+    
+    Args:
+        content (str): Content to measure
+        
+    Returns:
+        int: Estimated token count
+    """
+    if not content:
+        return 0
+    return (len(content) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+# Words as matched by keyword, category and fingerprint checks
+WORD = re.compile(r'\w+')
+
+class ContentEnvelope:
+    """
+    Immutable view of a piece of processed content shared by every stage
+    
+    The lowercase text, hashes and counts are computed once when the
+    envelope is created; the word list is computed the first time it is used.
+    Filtering, caching and fingerprinting all read from the same envelope
+    instead of lowercasing, hashing or tokenizing the text again.
+    """
+    
+    __slots__ = ('raw', 'normalized', 'content_hash', 'key_hash', 'token_count', 'word_count', '_tokens')
+    
+    def __init__(self, raw):
+        """
+        Initialize the envelope
+        
+        Args:
+            raw (str): Processed content, exactly as it is sent to the model
+        """
+        set_field = object.__setattr__
+        set_field(self, 'raw', raw)
+        # Lowercase with whitespace collapsed, for matching rather than display
+        set_field(self, 'normalized', re.sub(r'\s+', ' ', raw).strip().lower())
+        set_field(self, 'content_hash', hashlib.md5(raw.encode('utf-8')).hexdigest())
+        # Hash of the text with whitespace collapsed, so cache keys match copies
+        # that differ only in spacing
+        set_field(self, 'key_hash', hashlib.blake2b(' '.join(raw.split()).encode('utf-8'), digest_size=16).hexdigest())
+        set_field(self, 'token_count', estimate_tokens(raw))
+        set_field(self, 'word_count', sum(1 for _ in WORD.finditer(raw)))
+        set_field(self, '_tokens', None)
+    
+    @property
+    def tokens(self):
+        """Lowercase words of the content, as a tuple"""
+        if self._tokens is None:
+            object.__setattr__(self, '_tokens', tuple(WORD.findall(self.normalized)))
+        return self._tokens
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("ContentEnvelope is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("ContentEnvelope is immutable")
+    
+    def __repr__(self):
+        return f"ContentEnvelope(hash={self.content_hash}, words={self.word_count}, tokens={self.token_count})"
+
+def as_envelope(content):
+    """
+    Wrap content in an envelope unless it already is one
+    
+    Args:
+        content (str or ContentEnvelope): Content
+        
+    Returns:
+        ContentEnvelope: Envelope of the content
+    """
+    if isinstance(content, ContentEnvelope):
+        return content
+    return ContentEnvelope(content)
+
 def preprocess_for_gemini(content, max_length=10000):
     """
     Preprocess content to make it compatible with Gemini API
@@ -278,6 +360,29 @@ def preprocess_for_gemini(content, max_length=10000):
     
     return content
 
+def apply_extractive_stage(content):
+    """
+    Reduce long content to its key sentences with the local extractive stage
+    
+    Args:
+        content (str): Plain text content
+        
+    Returns:
+        tuple: (content, info) where info describes the reduction, or None if
+            the content was left unchanged
+    """
+    from .extractive import extract_key_sentences
+    
+    normalized = normalize_content(content)
+    reduced = extract_key_sentences(normalized)
+    if reduced is normalized:
+        return content, None
+    
+    return reduced, {
+        'original_tokens': estimate_tokens(normalized),
+        'reduced_tokens': estimate_tokens(reduced)
+    }
+
 def process_content(input_data):
     """
     Main function to process content from various sources
@@ -287,14 +392,16 @@ def process_content(input_data):
             - content (str): Text content or HTML
             - url (str, optional): URL to extract content from
             - is_html (bool, optional): Whether the content is HTML
+            - extractive (bool, optional): Whether to keep only the key sentences of long content
             
     Returns:
-        dict: Dictionary containing processed content and metadata
+        dict: Dictionary containing processed content, its envelope and metadata
     """
     try:
         result = {
             "success": False,
             "content": "",
+            "envelope": None,
             "metadata": {},
             "error": None
         }
@@ -306,6 +413,13 @@ def process_content(input_data):
                 result["content"] = url_result["content"]
                 result["metadata"] = url_result["metadata"]
                 result["success"] = True
+                
+                # Optionally keep only the key sentences of long content
+                if input_data.get('extractive'):
+                    result["content"], extractive_info = apply_extractive_stage(result["content"])
+                    if extractive_info:
+                        result["metadata"]["extractive"] = extractive_info
+                result["envelope"] = ContentEnvelope(result["content"])
             else:
                 result["error"] = url_result["error"]
                 return result
@@ -322,13 +436,22 @@ def process_content(input_data):
                 # Then strip HTML tags
                 content = strip_html(content)
             
+            # Optionally keep only the key sentences of long content
+            extractive_info = None
+            if input_data.get('extractive'):
+                content, extractive_info = apply_extractive_stage(content)
+            
             # Normalize and preprocess content
             content = preprocess_for_gemini(content)
             
             # Extract metadata
-            metadata = extract_metadata(content)
+            envelope = ContentEnvelope(content)
+            metadata = extract_metadata(envelope)
+            if extractive_info:
+                metadata["extractive"] = extractive_info
             
             result["content"] = content
+            result["envelope"] = envelope
             result["metadata"] = metadata
             result["success"] = True
         
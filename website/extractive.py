@@ -0,0 +1,234 @@
+"""
+Extractive Summarization Module for AI Summary Feature
+
+This module provides a local extractive stage that ranks sentences with a
+TF-IDF similarity graph (TextRank) and keeps only the most central ones. It is
+used to shrink very long inputs before the Gemini prompt is built, cutting
+prompt tokens, latency and cost, and to produce a degraded summary without the
+model while the circuit breaker around it is open.
+
+NumPy is optional: without it the stage is skipped and content passes through
+unchanged.
+"""
+
+import os
+import re
+import logging
+from collections import Counter
+
+from .content_processor import estimate_tokens
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only when NumPy is missing
+    np = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whether /api/summarize runs the extractive stage when a request doesn't say
+EXTRACTIVE_ENABLED = os.getenv('SUMMARY_EXTRACTIVE', 'False') == 'True'
+
+# Content is reduced only above this many estimated tokens
+EXTRACTIVE_MIN_TOKENS = int(os.getenv('EXTRACTIVE_MIN_TOKENS', 1500))
+
+# Estimated tokens of sentences kept by the extractive stage
+EXTRACTIVE_TARGET_TOKENS = int(os.getenv('EXTRACTIVE_TARGET_TOKENS', 1200))
+
+# Vocabulary size of the TF-IDF vectors
+MAX_FEATURES = 2048
+
+# Above this many sentences the n x n TextRank graph is replaced by
+# similarity to the document centroid, which needs no pairwise matrix
+MAX_GRAPH_SENTENCES = 2000
+
+# TextRank damping factor and iteration limits
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+WORD = re.compile(r'\b\w+\b')
+
+STOP_WORDS = {
+    'the', 'and', 'a', 'an', 'to', 'of', 'in', 'is', 'that', 'it', 'with', 'for', 'as', 'on',
+    'was', 'be', 'at', 'by', 'this', 'are', 'or', 'from', 'but', 'not', 'have', 'has', 'had',
+    'were', 'they', 'their', 'its', 'which', 'will', 'would', 'can', 'been', 'also', 'he', 'she',
+}
+
+def is_available():
+    """
+    Check whether the extractive stage can run
+
+    Returns:
+        bool: True if NumPy is installed
+    """
+    return np is not None
+
+def split_sentences(content):
+    """
+    Split content into sentences
+
+    Args:
+        content (str): Content to split
+
+    Returns:
+        list: List of non-empty sentences
+    """
+    return [sentence for sentence in SENTENCE_SPLIT.split(content.strip()) if sentence]
+
+def tfidf_matrix(sentences):
+    """
+    Build L2-normalised TF-IDF vectors for sentences
+
+    Args:
+        sentences (list): Sentences to vectorise
+
+    Returns:
+        numpy.ndarray: Matrix of shape (len(sentences), vocabulary size)
+    """
+    tokenized = [
+        [word for word in WORD.findall(sentence.lower()) if word not in STOP_WORDS and len(word) > 2]
+        for sentence in sentences
+    ]
+
+    # Keep the terms that appear in the most sentences
+    document_frequency = Counter(word for words in tokenized for word in set(words))
+    vocabulary = {word: i for i, (word, _) in enumerate(document_frequency.most_common(MAX_FEATURES))}
+
+    matrix = np.zeros((len(sentences), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, words in enumerate(tokenized):
+        for word, count in Counter(words).items():
+            column = vocabulary.get(word)
+            if column is not None:
+                matrix[row, column] = count
+
+    df = np.array([document_frequency[word] for word in vocabulary], dtype=np.float32)
+    if len(df):
+        idf = np.log((1 + len(sentences)) / (1 + df)) + 1
+        matrix *= idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+def rank_sentences(sentences):
+    """
+    Score sentences by centrality
+
+    Uses TextRank (PageRank over the cosine similarity graph) for up to
+    MAX_GRAPH_SENTENCES sentences and similarity to the document centroid
+    beyond that.
+
+    Args:
+        sentences (list): Sentences to score
+
+    Returns:
+        numpy.ndarray: One score per sentence, higher is more central
+    """
+    vectors = tfidf_matrix(sentences)
+    count = len(sentences)
+
+    if count > MAX_GRAPH_SENTENCES:
+        centroid = vectors.mean(axis=0)
+        return vectors @ centroid
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+
+    # Row-normalise into a transition matrix; isolated sentences link everywhere
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(row_sums > 0, similarity / np.where(row_sums == 0, 1, row_sums), 1.0 / count)
+
+    scores = np.full(count, 1.0 / count, dtype=np.float32)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+def extract_key_sentences(content, target_tokens=None, min_tokens=None):
+    """
+    Keep the most central sentences of long content, in their original order
+
+    Args:
+        content (str): Content to reduce
+        target_tokens (int, optional): Estimated tokens to keep, defaults to EXTRACTIVE_TARGET_TOKENS
+        min_tokens (int, optional): Only reduce content above this size, defaults to EXTRACTIVE_MIN_TOKENS
+
+    Returns:
+        str: Reduced content, or the original content if it is small enough,
+            has too few sentences, or NumPy is unavailable
+    """
+    target_tokens = target_tokens or EXTRACTIVE_TARGET_TOKENS
+    min_tokens = min_tokens or EXTRACTIVE_MIN_TOKENS
+
+    if estimate_tokens(content) <= max(min_tokens, target_tokens):
+        return content
+
+    if not is_available():
+        logger.warning("NumPy is not installed, skipping extractive stage")
+        return content
+
+    sentences = split_sentences(content)
+    if len(sentences) < 3:
+        return content
+
+    scores = rank_sentences(sentences)
+
+    # Take sentences in score order until the budget is used
+    selected = []
+    used_tokens = 0
+    for index in np.argsort(-scores, kind='stable'):
+        tokens = estimate_tokens(sentences[index]) + 1
+        if selected and used_tokens + tokens > target_tokens:
+            continue
+        selected.append(index)
+        used_tokens += tokens
+
+    reduced = ' '.join(sentences[index] for index in sorted(selected))
+    logger.info(f"Extractive stage kept {len(selected)}/{len(sentences)} sentences "
+                f"({estimate_tokens(content)} -> {estimate_tokens(reduced)} tokens)")
+    return reduced
+
+def fallback_summary(content, length):
+    """
+    Summarize content locally, without the model
+
+    Keeps the most central sentences (or the leading ones when NumPy is not
+    installed) up to the requested share of the content, and uses the opening
+    sentence as the headline.
+
+    Args:
+        content (str): Preprocessed content
+        length (int): Summary length percentage
+
+    Returns:
+        dict: Dictionary with headline and summary
+    """
+    sentences = split_sentences(content)
+    if not sentences:
+        return {'headline': '', 'summary': content}
+
+    target_tokens = max(1, estimate_tokens(content) * length // 100)
+    if is_available() and len(sentences) >= 3:
+        summary = extract_key_sentences(content, target_tokens=target_tokens, min_tokens=1)
+    else:
+        selected = []
+        used_tokens = 0
+        for sentence in sentences:
+            if selected and used_tokens + estimate_tokens(sentence) > target_tokens:
+                break
+            selected.append(sentence)
+            used_tokens += estimate_tokens(sentence) + 1
+        summary = ' '.join(selected)
+
+    headline_words = sentences[0].split()
+    headline = ' '.join(headline_words[:12]).rstrip('.!?,;:')
+    if len(headline_words) > 12:
+        headline += '...'
+
+    return {'headline': headline, 'summary': summary}
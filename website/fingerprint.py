@@ -0,0 +1,143 @@
+"""
+Content Fingerprinting Module for AI Summary Feature
+
+This module computes SimHash fingerprints of content so that near-duplicate
+articles (the same wire story with a different byline, trailing whitespace or
+ad text) can share one cached summary. Fingerprints are 64-bit SimHashes over
+word shingles of normalized text; two texts are near-duplicates when their
+fingerprints differ in only a few bits.
+
+For lookup, a fingerprint is cut into bands (locality-sensitive hashing). With
+one more band than the allowed bit distance, any two fingerprints within that
+distance share at least one identical band, so indexing each band finds every
+candidate without comparing against all stored fingerprints.
+"""
+
+import re
+import hashlib
+from collections import Counter
+
+# Fingerprint width in bits
+FINGERPRINT_BITS = 64
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Content with fewer words than this is too short to fingerprint reliably
+MIN_FINGERPRINT_WORDS = 50
+
+WORD = re.compile(r'\w+')
+
+def normalize_for_fingerprint(content):
+    """
+    Reduce content to lowercase words, dropping punctuation and spacing
+
+    Args:
+        content (str): Content to normalize
+
+    Returns:
+        list: Words of the content
+    """
+    return WORD.findall(content.lower())
+
+def simhash(content, shingle_size=SHINGLE_SIZE):
+    """
+    Compute the SimHash fingerprint of content
+
+    Args:
+        content (str): Content to fingerprint
+        shingle_size (int): Words per shingle
+
+    Returns:
+        int: 64-bit fingerprint, or None if the content is too short
+    """
+    return simhash_words(normalize_for_fingerprint(content), shingle_size)
+
+def simhash_words(words, shingle_size=SHINGLE_SIZE):
+    """
+    Compute the SimHash fingerprint of content that is already split into words
+
+    Args:
+        words (sequence): Lowercase words, as from normalize_for_fingerprint
+        shingle_size (int): Words per shingle
+
+    Returns:
+        int: 64-bit fingerprint, or None if the content is too short
+    """
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+
+    shingles = Counter(
+        ' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)
+    )
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a, b):
+    """
+    Count the bits in which two fingerprints differ
+
+    Args:
+        a (int): Fingerprint
+        b (int): Fingerprint
+
+    Returns:
+        int: Number of differing bits
+    """
+    return bin(a ^ b).count('1')
+
+def similarity(a, b):
+    """
+    Similarity of two fingerprints
+
+    Args:
+        a (int): Fingerprint
+        b (int): Fingerprint
+
+    Returns:
+        float: 1.0 for identical fingerprints, down to 0.0
+    """
+    return 1 - hamming_distance(a, b) / FINGERPRINT_BITS
+
+def max_distance_for(threshold):
+    """
+    Convert a similarity threshold into the largest allowed bit distance
+
+    Args:
+        threshold (float): Minimum similarity between 0 and 1
+
+    Returns:
+        int: Largest Hamming distance that still meets the threshold
+    """
+    return max(0, int((1 - threshold) * FINGERPRINT_BITS + 1e-9))
+
+def lsh_bands(fingerprint, band_count):
+    """
+    Cut a fingerprint into bands for indexing
+
+    Args:
+        fingerprint (int): Fingerprint
+        band_count (int): Number of bands, one more than the allowed distance
+
+    Returns:
+        list: (band index, band value) pairs
+    """
+    band_count = max(1, min(band_count, FINGERPRINT_BITS))
+    band_width = FINGERPRINT_BITS // band_count
+    bands = []
+    for index in range(band_count):
+        start = index * band_width
+        # The last band takes any bits left over
+        width = FINGERPRINT_BITS - start if index == band_count - 1 else band_width
+        bands.append((index, fingerprint >> start & ((1 << width) - 1)))
+    return bands
@@ -0,0 +1,89 @@
+"""
+Consistent Hashing Module for AI Summary Feature
+
+This module maps cache keys to cache nodes with a consistent hash ring. Every
+node is placed on the ring at many points (virtual nodes) so keys spread
+evenly, and adding or removing a node only moves the keys between that node's
+points and their neighbours, about 1/n of the keys, instead of nearly all of them.
+"""
+
+import bisect
+import hashlib
+
+def ring_hash(value):
+    """
+    Hash a string to a position on the ring
+
+    Args:
+        value (str): Key or virtual node name
+
+    Returns:
+        int: 64-bit position
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes
+    """
+
+    def __init__(self, nodes=(), virtual_nodes=160):
+        """
+        Initialize the ring
+
+        Args:
+            nodes (iterable): Node names
+            virtual_nodes (int): Points on the ring per node
+        """
+        self.virtual_nodes = virtual_nodes
+        self.nodes = []
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add(node)
+
+    def _rebuild(self):
+        ring = sorted(
+            (ring_hash(f"{node}#{index}"), node)
+            for node in self.nodes
+            for index in range(self.virtual_nodes)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [node for _, node in ring]
+
+    def add(self, node):
+        """
+        Add a node to the ring
+
+        Args:
+            node (str): Node name
+        """
+        if node not in self.nodes:
+            self.nodes.append(node)
+            self._rebuild()
+
+    def remove(self, node):
+        """
+        Remove a node from the ring
+
+        Args:
+            node (str): Node name
+        """
+        if node in self.nodes:
+            self.nodes.remove(node)
+            self._rebuild()
+
+    def node_for(self, key):
+        """
+        Get the node a key belongs to
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str: Node name, or None if the ring is empty
+        """
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, ring_hash(key)) % len(self._points)
+        return self._owners[index]
@@ -0,0 +1,135 @@
+"""
+In-Process Cache Module for AI Summary Feature
+
+This module keeps recently used cache entries in the memory of each worker so
+that hot summaries are served without a round trip to Redis. Entries expire
+after a short TTL and the cache is bounded by the total size of the stored
+values rather than by entry count, since summaries vary widely in size.
+"""
+
+import os
+import threading
+from cachetools import TTLCache
+
+def value_size(value):
+    """
+    Get the size of a cached value in bytes
+
+    Args:
+        value (str or bytes): Cached value
+
+    Returns:
+        int: Size in bytes
+    """
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    return len(value)
+
+class LocalCache:
+    """
+    Thread-safe TTL cache bounded by the byte size of its values
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=60):
+        """
+        Initialize the local cache
+
+        Args:
+            max_bytes (int): Largest total size of the cached values; 0 disables the cache
+            ttl (float): Seconds an entry is kept; 0 disables the cache
+        """
+        self.enabled = max_bytes > 0 and ttl > 0
+        self.max_bytes = max_bytes
+        self._cache = TTLCache(maxsize=max(1, max_bytes), ttl=max(ttl, 1e-3), getsizeof=value_size)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key):
+        """
+        Get a cached value
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            str: Cached value, or None if it is missing or expired
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            value = self._cache.get(key)
+            self.stats['hits' if value is not None else 'misses'] += 1
+        return value
+
+    def get_many(self, keys):
+        """
+        Get several cached values
+
+        Args:
+            keys (list): Cache keys
+
+        Returns:
+            list: Cached value for each key, None where there is none
+        """
+        if not self.enabled:
+            return [None] * len(keys)
+        with self._lock:
+            values = [self._cache.get(key) for key in keys]
+            hits = sum(1 for value in values if value is not None)
+            self.stats['hits'] += hits
+            self.stats['misses'] += len(values) - hits
+        return values
+
+    def set(self, key, value):
+        """
+        Cache a value, unless it is larger than the whole cache
+
+        Args:
+            key (str): Cache key
+            value (str or bytes): Value to cache
+        """
+        if not self.enabled or value_size(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._cache[key] = value
+
+    def delete(self, key):
+        """
+        Drop a cached value
+
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        """Drop every cached value"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self):
+        """
+        Get hit counters and current size
+
+        Returns:
+            dict: Hits, misses, entries and bytes
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._cache)
+            stats['bytes'] = self._cache.currsize
+        return stats
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a cache from the REDIS_L1_CACHE_* environment variables
+
+        Returns:
+            LocalCache: Configured cache
+        """
+        return cls(
+            max_bytes=int(os.getenv('REDIS_L1_CACHE_BYTES', 32 * 1024 * 1024)),
+            ttl=float(os.getenv('REDIS_L1_CACHE_TTL', 60))
+        )
@@ -67,9 +67,31 @@ class SavedSummary(db.Model):
     length = db.Column(db.Integer)
     created_at = db.Column(db.DateTime(timezone=True), default=func.now())
     sent_at = db.Column(db.DateTime(timezone=True), nullable=True)  # Add this line
+    # key_hash of the summarized content, as returned with the generated summary; set
+    # only for unedited summaries, which the summary archive can serve again
+    key_hash = db.Column(db.String(64), index=True, nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
 
 
+# Generated summaries kept in the database behind the summary cache (see summary_archive.py)
+class ArchivedSummary(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    key_hash = db.Column(db.String(64), nullable=False)  # Hash of the content with whitespace collapsed
+    length = db.Column(db.Integer, nullable=False)
+    tone = db.Column(db.String(50), nullable=False)
+    prompt_version = db.Column(db.String(100), nullable=False)  # Prompt and model version of the summary
+    generation = db.Column(db.Integer, nullable=False, default=0)  # Generation of the summary cache namespace
+    data = db.Column(db.Text, nullable=False)  # Summary response data as JSON
+    compute_time = db.Column(db.Float, default=0)  # Seconds the summary took to generate
+    created_at = db.Column(db.DateTime(timezone=True), default=func.now())
+    updated_at = db.Column(db.DateTime(timezone=True), default=func.now(), onupdate=func.now(), index=True)
+
+    # One summary per lookup key; the unique index also serves the lookups
+    __table_args__ = (
+        db.UniqueConstraint('key_hash', 'length', 'tone', 'prompt_version', 'generation', name='unique_archived_summary'),
+    )
+
+
 # Favorite Summary model
 class FavoriteSummary(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -0,0 +1,240 @@
+"""
+Rate Limiting Module for AI Summary Feature
+
+This module keeps model calls under the provider's quota. Every API key gets one
+shared limiter that combines a token bucket (requests per minute) with an
+adaptive concurrency limit: the limit grows by one slot per window of
+successful calls and is halved whenever the provider reports throttling
+(additive increase, multiplicative decrease). A share of both the bucket and
+the concurrency slots is reserved for interactive requests, so batch and
+chunked work can never starve a user waiting on /api/summarize.
+"""
+
+import os
+import time
+import hashlib
+import threading
+import logging
+from contextlib import contextmanager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Request priorities, interactive calls are admitted ahead of background work
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BACKGROUND = 'background'
+
+# Exception class names and HTTP status used by providers to signal throttling
+THROTTLING_ERRORS = ('ResourceExhausted', 'TooManyRequests', 'RateLimitError')
+THROTTLING_STATUS = 429
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call could not be admitted before its wait deadline"""
+
+def is_throttling_error(error):
+    """
+    Check whether an exception means the provider is throttling us
+
+    Args:
+        error (Exception): Exception raised by a model call
+
+    Returns:
+        bool: True for quota and 429 errors
+    """
+    if error is None:
+        return False
+    if type(error).__name__ in THROTTLING_ERRORS:
+        return True
+    return getattr(error, 'code', None) == THROTTLING_STATUS
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket plus AIMD concurrency limit shared by all calls on one API key
+    """
+
+    def __init__(self, requests_per_minute=600, burst=20, max_concurrency=8, min_concurrency=1,
+                 interactive_reserve=0.25, max_wait=30.0, decrease_cooldown=2.0):
+        """
+        Initialize the limiter
+
+        Args:
+            requests_per_minute (float): Sustained request rate of the token bucket
+            burst (int): Bucket capacity, the most requests sent back to back
+            max_concurrency (int): Upper bound of the adaptive concurrency limit
+            min_concurrency (int): Lower bound of the adaptive concurrency limit
+            interactive_reserve (float): Share of bucket tokens and concurrency
+                slots that background calls may not use
+            max_wait (float): Longest a call waits for admission, in seconds
+            decrease_cooldown (float): Minimum seconds between two decreases, so
+                a burst of throttled calls that were already in flight halves
+                the limit only once
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.interactive_reserve = interactive_reserve
+        self.max_wait = max_wait
+        self.decrease_cooldown = decrease_cooldown
+
+        self.tokens = self.capacity
+        self.concurrency_limit = float(max_concurrency)
+        self.in_flight = 0
+        self._interactive_waiting = 0
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self.stats = {'admitted': 0, 'throttled': 0, 'rejected': 0, 'total_wait': 0.0}
+
+    def acquire(self, priority=PRIORITY_BACKGROUND, timeout=None):
+        """
+        Wait until a call may be sent
+
+        Args:
+            priority (str): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            timeout (float, optional): Override for max_wait
+
+        Raises:
+            RateLimitExceeded: If the call was not admitted in time
+        """
+        interactive = priority == PRIORITY_INTERACTIVE
+        start = time.monotonic()
+        deadline = start + (timeout if timeout is not None else self.max_wait)
+
+        with self._cond:
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+
+                    slots, token_floor = self._allowance(interactive)
+                    has_slot = self.in_flight < slots
+                    has_token = self.tokens - 1 >= token_floor
+                    # Background calls also yield to any interactive call already waiting
+                    yields = not interactive and self._interactive_waiting > 0
+
+                    if has_slot and has_token and not yields:
+                        self.tokens -= 1
+                        self.in_flight += 1
+                        self.stats['admitted'] += 1
+                        self.stats['total_wait'] += now - start
+                        return
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self.stats['rejected'] += 1
+                        raise RateLimitExceeded(f"Model call not admitted within {deadline - start:.1f}s")
+
+                    # Sleep until a token is due or a slot is released
+                    wait = remaining
+                    if has_slot and not has_token and self.rate > 0:
+                        wait = min(wait, (token_floor + 1 - self.tokens) / self.rate)
+                    self._cond.wait(max(wait, 0.001))
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+                    self._cond.notify_all()
+
+    def release(self, throttled=False):
+        """
+        Finish a call admitted by acquire and adapt the concurrency limit
+
+        Args:
+            throttled (bool): Whether the provider throttled the call
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                self.stats['throttled'] += 1
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self._last_decrease = now
+                    self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+                    # Drain the bucket so the provider gets a moment to recover
+                    self.tokens = min(self.tokens, 0.0)
+                    logger.warning(f"Model throttled, concurrency limit lowered to {self.concurrency_limit:.1f}")
+            else:
+                # Roughly one extra slot after a full window of successful calls
+                self.concurrency_limit = min(self.max_concurrency,
+                                             self.concurrency_limit + 1 / self.concurrency_limit)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority=PRIORITY_BACKGROUND, timeout=None):
+        """
+        Hold an admitted call for the duration of a with block
+
+        Throttling errors raised inside the block lower the concurrency limit
+        and are re-raised.
+
+        Args:
+            priority (str): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+            timeout (float, optional): Override for max_wait
+        """
+        self.acquire(priority, timeout)
+        throttled = False
+        try:
+            yield
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            raise
+        finally:
+            self.release(throttled)
+
+    def get_stats(self):
+        """
+        Get limiter state and counters
+
+        Returns:
+            dict: Current limit, calls in flight, available tokens and counters
+        """
+        with self._cond:
+            self._refill(time.monotonic())
+            stats = dict(self.stats)
+            stats['concurrency_limit'] = round(self.concurrency_limit, 2)
+            stats['in_flight'] = self.in_flight
+            stats['tokens'] = round(self.tokens, 2)
+        return stats
+
+    def _allowance(self, interactive):
+        """Concurrency slots and minimum bucket level available to a priority"""
+        slots = int(self.concurrency_limit)
+        if interactive:
+            return slots, 0.0
+        reserved_slots = int(slots * self.interactive_reserve)
+        return slots - reserved_slots, self.capacity * self.interactive_reserve
+
+    def _refill(self, now):
+        """Add the tokens earned since the last refill"""
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(api_key):
+    """
+    Get the limiter shared by every caller using an API key
+
+    Args:
+        api_key (str): Provider API key or another identifier of the quota
+
+    Returns:
+        AdaptiveRateLimiter: Limiter configured from the environment
+    """
+    key = hashlib.sha256((api_key or '').encode()).hexdigest()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(
+                requests_per_minute=float(os.getenv('SUMMARY_RATE_LIMIT_RPM', 600)),
+                burst=int(os.getenv('SUMMARY_RATE_LIMIT_BURST', 20)),
+                max_concurrency=int(os.getenv('SUMMARY_MAX_CONCURRENCY', 8)),
+                interactive_reserve=float(os.getenv('SUMMARY_INTERACTIVE_RESERVE', 0.25)),
+                max_wait=float(os.getenv('SUMMARY_RATE_LIMIT_MAX_WAIT', 30))
+            )
+            _limiters[key] = limiter
+        return limiter
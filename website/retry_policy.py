@@ -0,0 +1,198 @@
+"""
+Retry and Hedging Module for AI Summary Feature
+
+This module decides when a failed model call is worth retrying, how long to
+back off between attempts, and when a slow call should be hedged with a
+duplicate request. Backoff uses exponential delays with full jitter so that
+callers that failed together do not retry together, and every call gets an
+overall deadline that covers all of its attempts. The hedge delay follows the
+observed p95 latency, so only the slowest few percent of calls are duplicated.
+"""
+
+import os
+import time
+import random
+import threading
+from collections import deque
+
+# HTTP status codes of transient provider failures
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Provider exception class names of transient failures
+RETRYABLE_ERRORS = ('DeadlineExceeded', 'ServiceUnavailable', 'InternalServerError',
+                    'ResourceExhausted', 'TooManyRequests', 'Aborted')
+
+def is_retryable_error(error):
+    """
+    Check whether a failed model call may succeed if sent again
+
+    Errors the provider rejects for good (bad request, permission, not found, a
+    blocked response surfaced as ValueError) are not retried; timeouts,
+    throttling, server and connection errors are.
+
+    Args:
+        error (Exception): Exception raised by a model call
+
+    Returns:
+        bool: True if the call should be retried
+    """
+    if type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    code = getattr(error, 'code', None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return not isinstance(error, (ValueError, TypeError))
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff bounded by a per-call deadline
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0, deadline=120.0):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_attempts (int): Attempts per call, including the first
+            base_delay (float): Backoff ceiling before the second attempt, in seconds
+            max_delay (float): Largest backoff ceiling, in seconds
+            deadline (float): Seconds a call may take across all of its attempts
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(self, attempt):
+        """
+        Get the delay before the attempt after `attempt`
+
+        Args:
+            attempt (int): Number of the attempt that just failed, starting at 1
+
+        Returns:
+            float: Seconds to wait, drawn uniformly below the exponential ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a policy from the SUMMARY_RETRY_* environment variables
+
+        Returns:
+            RetryPolicy: Configured policy
+        """
+        return cls(
+            max_attempts=int(os.getenv('SUMMARY_RETRY_ATTEMPTS', 3)),
+            base_delay=float(os.getenv('SUMMARY_RETRY_BASE_DELAY', 0.5)),
+            max_delay=float(os.getenv('SUMMARY_RETRY_MAX_DELAY', 8)),
+            deadline=float(os.getenv('SUMMARY_RETRY_DEADLINE', 120))
+        )
+
+class LatencyTracker:
+    """
+    Rolling window of recent call latencies
+    """
+
+    def __init__(self, window=200, min_samples=20):
+        """
+        Initialize the tracker
+
+        Args:
+            window (int): Number of most recent latencies kept
+            min_samples (int): Samples needed before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        """
+        Add a latency sample
+
+        Args:
+            latency (float): Call latency in seconds
+        """
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percent):
+        """
+        Get a latency percentile over the window
+
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            float: Latency in seconds, or None with too few samples
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+class HedgePolicy:
+    """
+    When to send a duplicate request for a call that is running long
+    """
+
+    def __init__(self, enabled=False, percentile=95, min_delay=0.5, tracker=None):
+        """
+        Initialize the hedge policy
+
+        Args:
+            enabled (bool): Whether calls are hedged at all
+            percentile (float): Latency percentile after which a call is hedged
+            min_delay (float): Never hedge sooner than this many seconds
+            tracker (LatencyTracker, optional): Latency window, a new one by default
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.tracker = tracker or LatencyTracker()
+
+    def delay(self):
+        """
+        Get how long to wait for the first request before hedging
+
+        Returns:
+            float: Seconds, or None if the call should not be hedged
+        """
+        if not self.enabled:
+            return None
+        latency = self.tracker.percentile(self.percentile)
+        if latency is None:
+            return None
+        return max(self.min_delay, latency)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create a policy from the SUMMARY_HEDGE* environment variables
+
+        Returns:
+            HedgePolicy: Configured policy
+        """
+        return cls(
+            enabled=os.getenv('SUMMARY_HEDGE', 'False') == 'True',
+            percentile=float(os.getenv('SUMMARY_HEDGE_PERCENTILE', 95)),
+            min_delay=float(os.getenv('SUMMARY_HEDGE_MIN_DELAY', 0.5))
+        )
+
+def remaining_time(deadline):
+    """
+    Get the seconds left until a monotonic deadline
+
+    Args:
+        deadline (float): time.monotonic() value
+
+    Returns:
+        float: Seconds left, never negative
+    """
+    return max(0.0, deadline - time.monotonic())
@@ -0,0 +1,127 @@
+"""
+Request Coalescing Module for AI Summary Feature
+
+This module makes sure identical summary requests that arrive at the same time
+trigger a single model call. Callers in the same process wait on the leader's
+in-flight call; callers in other processes are held off by a short-lived lock
+in the cache and pick up the leader's result from the cache once it is written.
+"""
+
+import time
+import uuid
+import threading
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """An in-flight call shared by every in-process caller of the same key"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution
+    """
+
+    def __init__(self, lock_store=None, lock_ttl=60, poll_interval=0.1):
+        """
+        Initialize the coalescer
+
+        Args:
+            lock_store: Object with acquire_lock(name, token, ttl) and
+                release_lock(name, token) for cross-process coalescing, or None
+                to coalesce within this process only
+            lock_ttl (float): Lifetime of the cross-process lock in seconds, also
+                the longest a caller waits for another process's result
+            poll_interval (float): Seconds between checks for another process's result
+        """
+        self.lock_store = lock_store
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {'executions': 0, 'coalesced': 0, 'remote_hits': 0}
+
+    def do(self, key, fn, fetch_result=None):
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key (str): Coalescing key, e.g. the summary cache key
+            fn (callable): Function producing the result; it should store the
+                result where fetch_result can find it before returning
+            fetch_result (callable, optional): Returns the result written by
+                another process, or None if it is not available yet
+
+        Returns:
+            The result of fn, shared by every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_once_across_processes(key, fn, fetch_result)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _run_once_across_processes(self, key, fn, fetch_result):
+        """Run fn under the cross-process lock, or wait for the process holding it"""
+        if self.lock_store is None:
+            return self._execute(fn)
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl
+        waited = False
+
+        while time.monotonic() < deadline:
+            if self.lock_store.acquire_lock(key, token, self.lock_ttl):
+                try:
+                    # The previous holder may have just finished, check before generating
+                    result = fetch_result() if waited and fetch_result is not None else None
+                    if result is not None:
+                        self.stats['remote_hits'] += 1
+                        return result
+                    return self._execute(fn)
+                finally:
+                    self.lock_store.release_lock(key, token)
+
+            # Another process is generating this result, wait for it to land
+            if fetch_result is not None:
+                result = fetch_result()
+                if result is not None:
+                    self.stats['remote_hits'] += 1
+                    return result
+            waited = True
+            time.sleep(self.poll_interval)
+
+        logger.warning(f"Gave up waiting for in-flight result of {key}, generating it locally")
+        return self._execute(fn)
+
+    def _execute(self, fn):
+        """Run the leader's function"""
+        self.stats['executions'] += 1
+        return fn()
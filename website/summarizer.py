@@ -0,0 +1,1074 @@
+"""
+Summarization Engine Module for AI Summary Feature
+
+This module provides the single summarization engine used by every summary code
+path (synchronous requests, async tasks and chunked content). Prompt building,
+model invocation, response parsing, timeouts and instrumentation all live here,
+behind a pluggable model backend.
+"""
+
+import os
+import re
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from functools import partial
+
+from .content_processor import estimate_tokens
+from .rate_limiter import get_rate_limiter, is_throttling_error, RateLimitExceeded, PRIORITY_BACKGROUND
+from .circuit_breaker import CircuitBreaker
+from .retry_policy import RetryPolicy, HedgePolicy, is_retryable_error, remaining_time
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Model used by the Gemini backend
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+# Version of the prompt templates below; bump it whenever a prompt changes so
+# summaries cached from the old prompts are no longer served
+PROMPT_VERSION = 1
+
+# Categories the model is asked to choose from
+SUMMARY_CATEGORIES = 'technology, business, news, health, science, politics, entertainment, sports, general'
+
+# Generation settings for full summaries and for individual chunk summaries
+SUMMARY_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "max_output_tokens": 1500,
+}
+
+CHUNK_GENERATION_CONFIG = {
+    "temperature": 0.5,
+    "max_output_tokens": 800,
+}
+
+SUMMARY_PROMPT = """You are an AI assistant that creates {tone} summaries with headlines and categories.
+Create a summary that is approximately {length}% of the original length.
+Maintain the key points while adjusting the length and tone as specified.
+
+Also create a compelling headline in the {tone} tone that captures the essence of the content.
+
+Additionally, identify the primary and secondary categories that best describe this content.
+Choose from these categories: {categories}.
+
+Format your response exactly like this:
+HEADLINE: [Your headline here]
+
+CATEGORIES: [Primary Category], [Secondary Category]
+
+SUMMARY:
+[Your summary here]
+
+Please summarize the following text:
+
+{content}"""
+
+CHUNK_PROMPT = """You are an AI assistant that creates concise summaries.
+Summarize the following text in a {tone} tone, capturing the key points:
+
+{content}"""
+
+REDUCE_PROMPT = """You are an AI assistant that creates {tone} summaries with headlines and categories.
+The following text contains summaries of different sections of a larger document.
+Create a cohesive final summary in a {tone} tone that is approximately {length}% of the original length.
+
+Also create a compelling headline in the {tone} tone that captures the essence of the content.
+
+Additionally, identify the primary and secondary categories that best describe this content.
+Choose from these categories: {categories}.
+
+Format your response exactly like this:
+HEADLINE: [Your headline here]
+
+CATEGORIES: [Primary Category], [Secondary Category]
+
+SUMMARY:
+[Your summary here]
+
+Here are the section summaries to combine:
+
+{content}"""
+
+INTERMEDIATE_PROMPT = """You are an AI assistant that creates concise summaries.
+The following text contains summaries of consecutive sections of a larger document.
+Combine them into one summary in a {tone} tone, keeping the key points in order:
+
+{content}"""
+
+VARIANTS_PROMPT = """You are an AI assistant that creates several summaries of the same text, each with its own tone and length, with headlines and categories.
+Create {count} versions of the summary:
+{variant_list}
+
+For every version, maintain the key points while adjusting the length and tone as specified,
+and create a compelling headline in that version's tone that captures the essence of the content.
+
+Additionally, identify the primary and secondary categories that best describe this content.
+Choose from these categories: {categories}.
+
+Format your response exactly like this, with one block per version in the order listed:
+CATEGORIES: [Primary Category], [Secondary Category]
+
+=== VERSION 1 ===
+HEADLINE: [Your headline here]
+
+SUMMARY:
+[Your summary here]
+
+Please summarize the following text:
+
+{content}"""
+
+VARIANT_LINE = "VERSION {number}: {tone} tone, approximately {length}% of the original length"
+
+VARIANT_SEPARATOR = re.compile(r'^=== VERSION (\d+) ===[ \t]*$', re.MULTILINE)
+
+# Categories used when the model does not name any
+DEFAULT_CATEGORIES = {
+    'primary_category': 'general',
+    'secondary_category': 'informational',
+    'confidence': 50
+}
+
+# Upper bound on reduce levels, reached only if batches repeatedly fail to shrink
+MAX_REDUCE_LEVELS = 8
+
+# Most variants requested in one model call, and the output budget they share
+MAX_VARIANTS = 6
+MAX_VARIANT_OUTPUT_TOKENS = 8192
+
+
+class ModelUnavailableError(RuntimeError):
+    """Raised when no model backend is configured"""
+
+
+class CircuitOpenError(ModelUnavailableError):
+    """Raised without calling the model while the circuit breaker is open"""
+
+
+class CallDeadlineExceeded(TimeoutError):
+    """Raised without calling the model once a call's deadline has passed"""
+
+
+def build_summary_prompt(content, length, tone):
+    """
+    Build the prompt for a full summary with headline and categories
+
+    Args:
+        content (str): Content to summarize
+        length (int): Summary length percentage
+        tone (str): Summary tone
+
+    Returns:
+        str: Prompt text
+    """
+    return SUMMARY_PROMPT.format(tone=tone, length=length, categories=SUMMARY_CATEGORIES, content=content)
+
+
+def build_variants_prompt(content, variants):
+    """
+    Build one prompt asking for several tone/length versions of a summary
+
+    Args:
+        content (str): Content to summarize
+        variants (list): (length, tone) pairs, in the order they should be returned
+
+    Returns:
+        str: Prompt text
+    """
+    variant_list = "\n".join(
+        VARIANT_LINE.format(number=number, tone=tone, length=length)
+        for number, (length, tone) in enumerate(variants, 1)
+    )
+    return VARIANTS_PROMPT.format(count=len(variants), variant_list=variant_list,
+                                  categories=SUMMARY_CATEGORIES, content=content)
+
+
+def build_chunk_prompt(chunk, tone):
+    """
+    Build the prompt for summarizing a single chunk of a larger document
+
+    Args:
+        chunk (str): Chunk content
+        tone (str): Summary tone
+
+    Returns:
+        str: Prompt text
+    """
+    return CHUNK_PROMPT.format(tone=tone, content=chunk)
+
+
+def build_reduce_prompt(combined_summary, length, tone):
+    """
+    Build the prompt that combines section summaries into a final summary
+
+    Args:
+        combined_summary (str): Section summaries joined together
+        length (int): Summary length percentage
+        tone (str): Summary tone
+
+    Returns:
+        str: Prompt text
+    """
+    return REDUCE_PROMPT.format(tone=tone, length=length, categories=SUMMARY_CATEGORIES, content=combined_summary)
+
+
+def build_intermediate_prompt(combined_summary, tone):
+    """
+    Build the prompt that condenses one batch of section summaries
+
+    Args:
+        combined_summary (str): Batch of section summaries joined together
+        tone (str): Summary tone
+
+    Returns:
+        str: Prompt text
+    """
+    return INTERMEDIATE_PROMPT.format(tone=tone, content=combined_summary)
+
+
+def batch_by_tokens(summaries, token_budget):
+    """
+    Group consecutive summaries into batches that fit a token budget
+
+    Every batch holds at least two summaries (except a trailing single one),
+    so each reduce level at least halves the number of summaries even when
+    individual summaries are close to the budget.
+
+    Args:
+        summaries (list): Summaries in document order
+        token_budget (int): Maximum estimated tokens per batch
+
+    Returns:
+        list: List of batches, each a list of summaries
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for summary in summaries:
+        tokens = estimate_tokens(summary)
+        if len(current) >= 2 and current_tokens + tokens > token_budget:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(summary)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_summary_response(response_text):
+    """
+    Parse a HEADLINE/CATEGORIES/SUMMARY formatted model response
+
+    Args:
+        response_text (str): Raw model output
+
+    Returns:
+        dict: Dictionary with headline, summary and categories
+    """
+    headline = ""
+    summary = response_text
+    categories = {}
+
+    if "HEADLINE:" in response_text:
+        # Split by sections
+        sections = response_text.split("\n\n")
+
+        for section in sections:
+            if section.startswith("HEADLINE:"):
+                headline = section.replace("HEADLINE:", "").strip()
+            elif section.startswith("CATEGORIES:"):
+                categories = parse_categories(section)
+            elif section.startswith("SUMMARY:"):
+                summary = section.replace("SUMMARY:", "").strip()
+
+    return {
+        'headline': headline,
+        'summary': summary,
+        'categories': categories or dict(DEFAULT_CATEGORIES)
+    }
+
+
+def parse_categories(section):
+    """
+    Parse a "CATEGORIES: Primary, Secondary" line
+
+    Args:
+        section (str): Response section starting with CATEGORIES:
+
+    Returns:
+        dict: Primary and secondary category with confidence, empty if none were given
+    """
+    categories_text = section.replace("CATEGORIES:", "").strip()
+    category_list = [cat.strip() for cat in categories_text.split(",") if cat.strip()]
+
+    if len(category_list) >= 2:
+        return {
+            'primary_category': category_list[0],
+            'secondary_category': category_list[1],
+            'confidence': 90  # High confidence since it's AI-generated
+        }
+    elif len(category_list) == 1:
+        return {
+            'primary_category': category_list[0],
+            'secondary_category': 'general',
+            'confidence': 90
+        }
+    return {}
+
+
+def parse_variants_response(response_text, count):
+    """
+    Split a multi-version response into one parsed summary per version
+
+    Args:
+        response_text (str): Raw model output
+        count (int): Number of versions requested
+
+    Returns:
+        list: Dictionary with headline, summary and categories for each version,
+            None for versions missing from the response
+    """
+    parts = VARIANT_SEPARATOR.split(response_text)
+    # The shared categories precede the first version block
+    preamble = parts[0].strip()
+    categories = parse_categories(preamble[preamble.find("CATEGORIES:"):]) if "CATEGORIES:" in preamble else {}
+    categories = categories or dict(DEFAULT_CATEGORIES)
+
+    results = [None] * count
+    for number, block in zip(parts[1::2], parts[2::2]):
+        index = int(number) - 1
+        if 0 <= index < count and "SUMMARY:" in block:
+            result = parse_summary_response(block.strip())
+            result['categories'] = categories
+            results[index] = result
+    return results
+
+
+class SummaryStreamParser:
+    """
+    Incremental parser for a streamed HEADLINE/CATEGORIES/SUMMARY response
+
+    Text is fed in as it arrives and the parser returns the new headline and
+    summary text since the previous call. Sections end at a blank line, the
+    same way parse_summary_response reads them, and trailing whitespace is
+    held back until more text arrives so deltas never need to be retracted.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.emitted = {'headline': 0, 'summary': 0}
+
+    def feed(self, text):
+        """
+        Add streamed text and return the new section text
+
+        Args:
+            text (str): Newly received model output
+
+        Returns:
+            list: List of (field, text) tuples with field 'headline' or 'summary'
+        """
+        self.buffer += text
+        events = []
+        for field, marker in (('headline', 'HEADLINE:'), ('summary', 'SUMMARY:')):
+            value = self._section(marker)
+            if len(value) > self.emitted[field]:
+                events.append((field, value[self.emitted[field]:]))
+                self.emitted[field] = len(value)
+        return events
+
+    def _section(self, marker):
+        """Return the text of a section seen so far"""
+        position = self.buffer.find(marker)
+        if position == -1:
+            return ''
+        if position > 0 and not self.buffer[:position].endswith('\n\n'):
+            return ''
+        section = self.buffer[position + len(marker):]
+        end = section.find('\n\n', len(section) - len(section.lstrip()))
+        if end != -1:
+            section = section[:end]
+        return section.strip()
+
+
+class GeminiBackend:
+    """Model backend that calls the Google Gemini API"""
+
+    name = 'gemini'
+
+    def __init__(self, api_key=None, model_name=GEMINI_MODEL_NAME):
+        """
+        Initialize the Gemini backend
+
+        Args:
+            api_key (str, optional): Gemini API key, defaults to GEMINI_API_KEY
+            model_name (str): Gemini model name
+        """
+        import google.generativeai as genai
+
+        api_key = api_key or os.getenv('GEMINI_API_KEY')
+        genai.configure(api_key=api_key)
+        self.quota_key = api_key
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt, generation_config, timeout=None):
+        """
+        Generate text for a prompt
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (dict): Gemini generation config
+            timeout (float, optional): Request timeout in seconds
+
+        Returns:
+            str: Generated text
+        """
+        request_options = {'timeout': timeout} if timeout else None
+        response = self.model.generate_content(
+            contents=prompt,
+            generation_config=generation_config,
+            request_options=request_options
+        )
+        return response.text
+
+    def stream(self, prompt, generation_config, timeout=None):
+        """
+        Generate text for a prompt, yielding it as the model produces it
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (dict): Gemini generation config
+            timeout (float, optional): Request timeout in seconds
+
+        Yields:
+            str: Pieces of generated text
+        """
+        request_options = {'timeout': timeout} if timeout else None
+        response = self.model.generate_content(
+            contents=prompt,
+            generation_config=generation_config,
+            stream=True,
+            request_options=request_options
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+class StubBackend:
+    """
+    Deterministic in-process backend for tests and offline benchmarks
+
+    Builds its output from the leading sentences of the prompt payload, so the
+    same prompt always produces the same response without any network calls.
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency=0.0):
+        """
+        Initialize the stub backend
+
+        Args:
+            latency (float): Simulated model latency in seconds
+        """
+        self.model_name = 'stub'
+        self.quota_key = 'stub'
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, generation_config, timeout=None):
+        """
+        Generate a deterministic response for a prompt
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (dict): Generation config (max_output_tokens is honoured)
+            timeout (float, optional): Unused, accepted for interface compatibility
+
+        Returns:
+            str: Generated text
+        """
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        # The payload follows the first blank line that ends an instruction
+        payload = prompt.split(':\n\n', 1)[-1]
+        sentences = re.split(r'(?<=[.!?])\s+', payload.strip())
+        max_words = generation_config.get('max_output_tokens', 800) * 3 // 4
+        headline = ' '.join(sentences[0].split()[:12]) if sentences else ''
+
+        variants = re.findall(r'VERSION \d+: (\w+) tone, approximately (\d+)%', prompt)
+        if variants:
+            blocks = [
+                f"=== VERSION {number} ===\nHEADLINE: {headline}\n\n"
+                f"SUMMARY:\n{self._leading_sentences(sentences, payload, int(length) / 100, max_words // len(variants))}"
+                for number, (tone, length) in enumerate(variants, 1)
+            ]
+            return "CATEGORIES: General, Informational\n\n" + "\n\n".join(blocks)
+
+        match = re.search(r'approximately (\d+)%', prompt)
+        ratio = int(match.group(1)) / 100 if match else 0.3
+        summary = self._leading_sentences(sentences, payload, ratio, max_words)
+
+        if 'HEADLINE:' not in prompt:
+            return summary
+
+        return f"HEADLINE: {headline}\n\nCATEGORIES: General, Informational\n\nSUMMARY:\n{summary}"
+
+    @staticmethod
+    def _leading_sentences(sentences, payload, ratio, max_words):
+        """Take leading sentences up to a share of the payload's words"""
+        target_words = min(max_words, max(1, int(len(payload.split()) * ratio)))
+
+        selected = []
+        word_count = 0
+        for sentence in sentences:
+            if word_count >= target_words:
+                break
+            selected.append(sentence)
+            word_count += len(sentence.split())
+        return ' '.join(selected)
+
+    def stream(self, prompt, generation_config, timeout=None):
+        """
+        Yield the deterministic response for a prompt a few words at a time
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (dict): Generation config
+            timeout (float, optional): Unused, accepted for interface compatibility
+
+        Yields:
+            str: Pieces of generated text
+        """
+        text = self.generate(prompt, generation_config, timeout)
+        pieces = re.findall(r'\S+\s*|\s+', text)
+        for i in range(0, len(pieces), 4):
+            yield ''.join(pieces[i:i + 4])
+
+
+def create_backend(name=None):
+    """
+    Create a model backend by name
+
+    Args:
+        name (str, optional): Backend name ('gemini' or 'stub'), defaults to SUMMARY_BACKEND
+
+    Returns:
+        Backend instance, or None if the backend could not be initialized
+    """
+    name = (name or os.getenv('SUMMARY_BACKEND', 'gemini')).lower()
+
+    if name == 'stub':
+        return StubBackend(latency=float(os.getenv('SUMMARY_STUB_LATENCY', 0)))
+
+    try:
+        backend = GeminiBackend()
+        logger.info("Gemini API initialized successfully")
+        return backend
+    except Exception as e:
+        logger.error(f"Error initializing Gemini API: {str(e)}")
+        return None
+
+
+class SummaryEngine:
+    """
+    Summarization engine shared by all summary code paths
+    """
+
+    def __init__(self, backend=None, timeout=None, chunk_concurrency=None, chunk_attempts=None,
+                 reduce_token_budget=None, limiter=None, retry_policy=None, hedge_policy=None,
+                 breaker=None):
+        """
+        Initialize the summarization engine
+
+        Args:
+            backend: Model backend with a generate(prompt, generation_config, timeout) method
+            timeout (float, optional): Per-call model timeout in seconds
+            chunk_concurrency (int, optional): Maximum chunk summaries generated at once
+            chunk_attempts (int, optional): Attempts per chunk or reduce batch before it is given up
+            reduce_token_budget (int, optional): Maximum estimated tokens per reduce prompt
+            limiter (AdaptiveRateLimiter, optional): Limiter admitting every model
+                call, or None to call the backend without limits
+            retry_policy (RetryPolicy, optional): Backoff and deadline of failed
+                calls, configured from the environment by default
+            hedge_policy (HedgePolicy, optional): When slow calls are duplicated,
+                configured from the environment by default
+            breaker (CircuitBreaker, optional): Breaker that fails calls fast while
+                the model is down, or None to always call the backend
+        """
+        self.backend = backend
+        self.limiter = limiter
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self.hedge_policy = hedge_policy or HedgePolicy.from_env()
+        self.breaker = breaker
+        self._hedge_executor = None
+        self._hedge_executor_lock = threading.Lock()
+        self.timeout = timeout if timeout is not None else float(os.getenv('SUMMARY_MODEL_TIMEOUT', 60))
+        self.chunk_concurrency = chunk_concurrency or int(os.getenv('SUMMARY_CHUNK_CONCURRENCY', 4))
+        self.chunk_attempts = chunk_attempts or int(os.getenv('SUMMARY_CHUNK_ATTEMPTS', 2))
+        self.reduce_token_budget = reduce_token_budget or int(os.getenv('SUMMARY_REDUCE_TOKEN_BUDGET', 8000))
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'errors': 0,
+            'total_latency': 0.0,
+            'prompt_chars': 0,
+            'output_chars': 0,
+            'retries': 0,
+            'hedges': 0,
+            'hedge_wins': 0,
+        }
+
+    @property
+    def available(self):
+        """Whether a model backend is configured"""
+        return self.backend is not None
+
+    @property
+    def version(self):
+        """Prompt and model version of the summaries this engine produces"""
+        model_name = self.backend.model_name if self.backend is not None else 'none'
+        return f"{PROMPT_VERSION}:{model_name}"
+
+    @property
+    def degraded(self):
+        """Whether the circuit breaker is open and model calls fail fast"""
+        return self.breaker is not None and self.breaker.is_open
+
+    def generate(self, prompt, generation_config=None, priority=PRIORITY_BACKGROUND, max_attempts=None):
+        """
+        Run a prompt through the model backend with rate limiting, retries, timing and error accounting
+
+        Transient failures are retried with jittered exponential backoff until
+        the attempts or the retry policy's deadline run out. With hedging
+        enabled, an attempt still running after the p95 latency is duplicated
+        and whichever request answers first wins.
+
+        Args:
+            prompt (str): Prompt text
+            generation_config (dict, optional): Generation config, defaults to SUMMARY_GENERATION_CONFIG
+            priority (str): Rate limiter priority of the call
+            max_attempts (int, optional): Override for the retry policy's attempts
+
+        Returns:
+            str: Generated text
+        """
+        if self.backend is None:
+            raise ModelUnavailableError("AI service is currently unavailable")
+
+        generation_config = generation_config or SUMMARY_GENERATION_CONFIG
+        max_attempts = max_attempts or self.retry_policy.max_attempts
+        deadline = time.monotonic() + self.retry_policy.deadline
+
+        attempt = 1
+        last_error = None
+        while True:
+            # No attempt is started past the deadline; the last model error is raised instead
+            if last_error is not None and remaining_time(deadline) <= 0:
+                raise last_error
+            try:
+                return self._generate_hedged(prompt, generation_config, priority, deadline)
+            except (RateLimitExceeded, CallDeadlineExceeded):
+                if last_error is not None and remaining_time(deadline) <= 0:
+                    raise last_error
+                raise
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, max_attempts, deadline)
+                if delay is None:
+                    raise
+                last_error = e
+                time.sleep(delay)
+                attempt += 1
+
+    def summarize(self, content, length, tone, priority=PRIORITY_BACKGROUND):
+        """
+        Summarize content with a headline and categories
+
+        Args:
+            content (str): Content to summarize
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            priority (str): Rate limiter priority of the call
+
+        Returns:
+            dict: Dictionary with headline, summary and categories
+        """
+        response_text = self.generate(build_summary_prompt(content, length, tone), SUMMARY_GENERATION_CONFIG, priority)
+        return parse_summary_response(response_text)
+
+    def summarize_variants(self, content, variants, priority=PRIORITY_BACKGROUND):
+        """
+        Summarize content in several tone/length versions with one model call
+
+        The content is sent once for all versions instead of once per version.
+
+        Args:
+            content (str): Content to summarize
+            variants (list): (length, tone) pairs
+            priority (str): Rate limiter priority of the call
+
+        Returns:
+            list: Dictionary with headline, summary and categories for each
+                variant, in order, None for versions the model left out
+        """
+        generation_config = dict(
+            SUMMARY_GENERATION_CONFIG,
+            max_output_tokens=min(MAX_VARIANT_OUTPUT_TOKENS,
+                                  SUMMARY_GENERATION_CONFIG['max_output_tokens'] * len(variants))
+        )
+        response_text = self.generate(build_variants_prompt(content, variants), generation_config, priority)
+        return parse_variants_response(response_text, len(variants))
+
+    def stream_summary(self, content, length, tone, priority=PRIORITY_BACKGROUND):
+        """
+        Summarize content, yielding headline and summary text as it is generated
+
+        Args:
+            content (str): Content to summarize
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            priority (str): Rate limiter priority of the call
+
+        Yields:
+            tuple: ('headline', text) and ('summary', text) deltas, then
+                ('complete', result) with the parsed headline, summary and categories
+        """
+        if self.backend is None:
+            raise ModelUnavailableError("AI service is currently unavailable")
+
+        prompt = build_summary_prompt(content, length, tone)
+        deadline = time.monotonic() + self.retry_policy.deadline
+
+        # Failures are retried only until the first piece reaches the caller
+        attempt = 1
+        last_error = None
+        while True:
+            if last_error is not None and remaining_time(deadline) <= 0:
+                raise last_error
+            parser = SummaryStreamParser()
+            pieces = []
+            try:
+                self._check_deadline(deadline)
+                self._check_breaker()
+                with self._admitted(priority, deadline=deadline):
+                    start_time = time.perf_counter()
+                    try:
+                        for piece in self.backend.stream(prompt, SUMMARY_GENERATION_CONFIG,
+                                                         timeout=self._call_timeout(deadline)):
+                            pieces.append(piece)
+                            yield from parser.feed(piece)
+                    except GeneratorExit:
+                        # The client went away, the model itself was fine
+                        self._breaker_result(None, time.perf_counter() - start_time)
+                        raise
+                    except Exception as e:
+                        self._record(start_time, len(prompt), sum(len(piece) for piece in pieces), error=True)
+                        self._breaker_result(e, 0.0)
+                        raise
+                    elapsed = time.perf_counter() - start_time
+                    self._breaker_result(None, elapsed)
+                break
+            except (RateLimitExceeded, CallDeadlineExceeded) as e:
+                if isinstance(e, RateLimitExceeded):
+                    self._breaker_cancel()
+                if last_error is not None and remaining_time(deadline) <= 0:
+                    raise last_error
+                raise
+            except Exception as e:
+                delay = None if pieces else self._retry_delay(e, attempt, self.retry_policy.max_attempts, deadline)
+                if delay is None:
+                    raise
+                last_error = e
+                time.sleep(delay)
+                attempt += 1
+
+        response_text = ''.join(pieces)
+        self._record(start_time, len(prompt), len(response_text), error=False)
+        yield ('complete', parse_summary_response(response_text))
+
+    def summarize_chunk(self, chunk, tone):
+        """
+        Summarize one chunk of a larger document
+
+        Args:
+            chunk (str): Chunk content
+            tone (str): Summary tone
+
+        Returns:
+            str: Chunk summary
+        """
+        return self.generate(build_chunk_prompt(chunk, tone), CHUNK_GENERATION_CONFIG)
+
+    def summarize_chunks(self, chunks, tone, max_concurrency=None):
+        """
+        Summarize chunks concurrently, keeping document order
+
+        Each chunk is retried on its own up to chunk_attempts times, so one
+        failing chunk never holds up the others.
+
+        Args:
+            chunks (list): Chunk contents, in document order
+            tone (str): Summary tone
+            max_concurrency (int, optional): Override for chunk_concurrency
+
+        Returns:
+            list: Chunk summaries in document order, None for chunks that failed
+        """
+        prompts = [build_chunk_prompt(chunk, tone) for chunk in chunks]
+        return self._map_prompts(prompts, CHUNK_GENERATION_CONFIG, max_concurrency)
+
+    def reduce(self, chunk_summaries, length, tone, token_budget=None):
+        """
+        Combine chunk summaries into a final summary with headline and categories
+
+        When the joined summaries exceed the token budget they are grouped into
+        batches that each fit the budget, every batch is condensed concurrently,
+        and the process repeats on the condensed summaries until they fit into
+        a single final prompt.
+
+        Args:
+            chunk_summaries (list): Summaries of the document sections, in order
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            token_budget (int, optional): Override for reduce_token_budget
+
+        Returns:
+            dict: Dictionary with headline, summary and categories
+        """
+        token_budget = token_budget or self.reduce_token_budget
+        summaries = list(chunk_summaries)
+
+        level = 0
+        while len(summaries) > 1 and estimate_tokens("\n\n".join(summaries)) > token_budget:
+            if level >= MAX_REDUCE_LEVELS:
+                logger.warning(f"Reduce stopped after {level} levels with {len(summaries)} summaries left")
+                break
+            level += 1
+            batches = batch_by_tokens(summaries, token_budget)
+            logger.info(f"Reduce level {level}: {len(summaries)} summaries in {len(batches)} batches")
+
+            prompts = [build_intermediate_prompt("\n\n".join(batch), tone) for batch in batches]
+            condensed = self._map_prompts(prompts, CHUNK_GENERATION_CONFIG)
+
+            # Keep a failed batch's inputs so no section of the document is lost
+            summaries = []
+            for batch, batch_summary in zip(batches, condensed):
+                if batch_summary:
+                    summaries.append(batch_summary)
+                else:
+                    summaries.extend(batch)
+
+        combined_summary = "\n\n".join(summaries)
+        response_text = self.generate(build_reduce_prompt(combined_summary, length, tone), SUMMARY_GENERATION_CONFIG)
+        return parse_summary_response(response_text)
+
+    def _map_prompts(self, prompts, generation_config, max_concurrency=None):
+        """
+        Run prompts concurrently on a bounded pool, keeping their order
+
+        Args:
+            prompts (list): Prompt texts
+            generation_config (dict): Generation config for every prompt
+            max_concurrency (int, optional): Override for chunk_concurrency
+
+        Returns:
+            list: Generated texts in prompt order, None for prompts that failed
+        """
+        if not prompts:
+            return []
+
+        max_workers = min(max_concurrency or self.chunk_concurrency, len(prompts))
+        generate = partial(self._generate_with_retry, generation_config=generation_config)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(generate, range(len(prompts)), prompts))
+
+    def _generate_with_retry(self, index, prompt, generation_config):
+        """Run one prompt, retrying failures independently of other prompts"""
+        try:
+            return self.generate(prompt, generation_config, max_attempts=self.chunk_attempts)
+        except ModelUnavailableError:
+            raise
+        except Exception as e:
+            logger.warning(f"Prompt {index + 1} failed: {str(e)}")
+            return None
+
+    def _generate_hedged(self, prompt, generation_config, priority, deadline):
+        """Run one attempt, hedging it with a duplicate request once it runs past the p95 latency"""
+        hedge_delay = self.hedge_policy.delay()
+        if hedge_delay is None or hedge_delay >= remaining_time(deadline):
+            return self._call_backend(prompt, generation_config, priority, deadline)
+
+        executor = self._get_hedge_executor()
+        primary = executor.submit(self._call_backend, prompt, generation_config, priority, deadline)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        # The hedge only uses spare capacity, it is dropped if the limiter has none
+        hedge = executor.submit(self._call_backend, prompt, generation_config, priority, deadline,
+                                admit_timeout=0, hedge=True)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count('hedge_wins')
+                    return future.result()
+                if future is primary or error is None:
+                    error = future.exception()
+        raise error
+
+    def _call_backend(self, prompt, generation_config, priority, deadline, admit_timeout=None, hedge=False):
+        """Send one request to the backend under a rate limiter slot"""
+        # Checked first, so an attempt started past the deadline never counts as a model failure
+        self._check_deadline(deadline)
+        # Checked before waiting for a slot, so callers fail fast while the model is down
+        self._check_breaker()
+        try:
+            with self._admitted(priority, admit_timeout, deadline):
+                if hedge:
+                    self._count('hedges')
+                start_time = time.perf_counter()
+                try:
+                    text = self.backend.generate(prompt, generation_config, timeout=self._call_timeout(deadline))
+                except Exception as e:
+                    self._record(start_time, len(prompt), 0, error=True)
+                    self._breaker_result(e, 0.0)
+                    raise
+        except RateLimitExceeded:
+            self._breaker_cancel()
+            raise
+
+        elapsed = self._record(start_time, len(prompt), len(text), error=False)
+        self._breaker_result(None, elapsed)
+        self.hedge_policy.tracker.record(elapsed)
+        return text
+
+    def _check_breaker(self):
+        """Fail fast while the circuit breaker is open"""
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError("AI service is degraded, model calls are paused")
+
+    def _breaker_cancel(self):
+        """Report a call allowed by the circuit breaker that got no rate limiter slot"""
+        if self.breaker is not None:
+            self.breaker.cancel()
+
+    def _breaker_result(self, error, latency):
+        """Report a call allowed by the circuit breaker"""
+        if self.breaker is None:
+            return
+        # Only outages count against the model, rejected prompts and throttling do not
+        if error is not None and is_retryable_error(error) and not is_throttling_error(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success(latency)
+
+    def _check_deadline(self, deadline):
+        """Refuse to start an attempt once the call's deadline has passed"""
+        if remaining_time(deadline) <= 0:
+            raise CallDeadlineExceeded("Model call deadline exceeded")
+
+    def _call_timeout(self, deadline):
+        """Backend timeout of the next request, capped by the call's deadline"""
+        remaining = remaining_time(deadline)
+        return min(self.timeout, remaining) if self.timeout else remaining
+
+    def _retry_delay(self, error, attempt, max_attempts, deadline):
+        """Backoff before the next attempt, or None if the error should be raised"""
+        if isinstance(error, ModelUnavailableError) or not is_retryable_error(error):
+            return None
+        if attempt >= max_attempts:
+            return None
+        delay = self.retry_policy.backoff(attempt)
+        if delay >= remaining_time(deadline):
+            return None
+        self._count('retries')
+        logger.warning(f"Model call attempt {attempt}/{max_attempts} failed ({str(error)}), retrying in {delay:.2f}s")
+        return delay
+
+    def _get_hedge_executor(self):
+        """Pool running hedged attempts, created on first use"""
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.chunk_concurrency * 4)
+            return self._hedge_executor
+
+    def get_stats(self):
+        """
+        Get engine instrumentation counters
+
+        Returns:
+            dict: Call counts, error counts and latency figures
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['backend'] = self.backend.name if self.backend else None
+        stats['average_latency'] = stats['total_latency'] / stats['calls'] if stats['calls'] else 0.0
+        if self.limiter is not None:
+            stats['rate_limiter'] = self.limiter.get_stats()
+        if self.breaker is not None:
+            stats['circuit_breaker'] = self.breaker.get_stats()
+        return stats
+
+    def _admitted(self, priority, timeout=None, deadline=None):
+        """Context holding a rate limiter slot for one model call, waiting no later than the deadline"""
+        if self.limiter is None:
+            return nullcontext()
+        if deadline is not None:
+            timeout = min(self.limiter.max_wait if timeout is None else timeout, remaining_time(deadline))
+        return self.limiter.slot(priority, timeout)
+
+    def _count(self, name):
+        """Increment an instrumentation counter"""
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _record(self, start_time, prompt_chars, output_chars, error):
+        """Record timing and size of a model call"""
+        elapsed = time.perf_counter() - start_time
+        with self._stats_lock:
+            self.stats['calls'] += 1
+            self.stats['total_latency'] += elapsed
+            self.stats['prompt_chars'] += prompt_chars
+            self.stats['output_chars'] += output_chars
+            if error:
+                self.stats['errors'] += 1
+        logger.info(f"Model call ({self.backend.name}) took {elapsed:.3f}s, prompt={prompt_chars} chars, error={error}")
+        return elapsed
+
+
+def create_engine(backend_name=None):
+    """
+    Create a summarization engine whose calls share the rate limiter of their
+    API key and pass through a circuit breaker
+
+    Args:
+        backend_name (str, optional): Backend name, defaults to SUMMARY_BACKEND
+
+    Returns:
+        SummaryEngine: Configured engine
+    """
+    backend = create_backend(backend_name)
+    limiter = get_rate_limiter(backend.quota_key) if backend is not None else None
+    return SummaryEngine(backend, limiter=limiter, breaker=CircuitBreaker.from_env())
+
+
+# Create a global instance
+summary_engine = create_engine()
@@ -0,0 +1,214 @@
+"""
+Summary Archive Module for AI Summary Feature
+
+This module keeps every generated summary in the database, keyed like a cache
+entry: key hash of the content (whitespace collapsed), length, tone, prompt and
+model version, and the generation of the summary namespace. It is the last
+cache level, behind the in-process cache and the cache store: store entries
+expire after a few hours and are lost when Redis restarts or evicts them, while
+archived summaries are kept for CACHE_ARCHIVE_MAX_AGE days. The summary cache
+looks up a store miss here before the model is called and writes a hit back
+into the store. Invalidating the namespace moves every lookup to the new
+generation, so the old rows are never read again and are purged with age.
+
+Summaries users saved without editing them carry the same key hash and are
+served when no archived summary matches, so they outlive the archive.
+"""
+
+import json
+import os
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+
+from flask import has_app_context
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+from .models import ArchivedSummary, SavedSummary
+
+class SummaryArchive:
+    """
+    Database-backed store of generated summaries
+    """
+
+    def __init__(self, app=None):
+        """
+        Initialize the archive
+
+        Args:
+            app (Flask, optional): Application whose database is used
+        """
+        self.app = None
+        self.enabled = os.getenv('CACHE_ARCHIVE', 'True') == 'True'
+        self.max_age = timedelta(days=float(os.getenv('CACHE_ARCHIVE_MAX_AGE', 30)))
+        self.purge_interval = int(os.getenv('CACHE_ARCHIVE_PURGE_INTERVAL', 1000))
+        self._writes = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Use the database of an application
+
+        Args:
+            app (Flask): Application
+        """
+        self.app = app
+
+    @property
+    def available(self):
+        """Whether summaries can be read and written"""
+        return self.enabled and (self.app is not None or has_app_context())
+
+    def app_context(self):
+        # Background tasks and refreshes run outside of any request
+        return nullcontext() if has_app_context() else self.app.app_context()
+
+    def get(self, key_hash, length, tone, prompt_version, generation):
+        """
+        Get an archived summary, or else a summary a user saved unedited
+
+        Args:
+            key_hash (str): Hash of the summarized content, whitespace collapsed
+            length (int): Summary length percentage
+            tone (str): Summary tone
+            prompt_version (str): Prompt and model version
+            generation (int): Generation of the summary namespace
+
+        Returns:
+            tuple: (summary data, compute time), or None if there is none
+        """
+        if not self.available:
+            return None
+
+        try:
+            with self.app_context():
+                archived = ArchivedSummary.query.filter_by(
+                    key_hash=key_hash,
+                    length=length,
+                    tone=tone,
+                    prompt_version=prompt_version,
+                    generation=generation
+                ).first()
+                if archived is not None:
+                    return json.loads(archived.data), archived.compute_time or 0
+
+                saved = SavedSummary.query.filter_by(
+                    key_hash=key_hash,
+                    length=length,
+                    tone=tone
+                ).order_by(SavedSummary.created_at.desc()).first()
+                if saved is None:
+                    return None
+                return self.saved_summary_data(saved), 0
+        except Exception as e:
+            print(f"Summary archive get error: {str(e)}")
+            return None
+
+    def save(self, key_hash, summaries, prompt_version, generation, compute_time=0):
+        """
+        Archive summaries of one content, replacing older ones with the same key
+
+        Args:
+            key_hash (str): Hash of the summarized content, whitespace collapsed
+            summaries (list): (length, tone, summary data) tuples
+            prompt_version (str): Prompt and model version
+            generation (int): Generation of the summary namespace
+            compute_time (float): Seconds it took to generate the summaries
+
+        Returns:
+            bool: True if the summaries were archived
+        """
+        if not summaries or not self.available:
+            return False
+
+        try:
+            with self.app_context():
+                now = datetime.now(timezone.utc)
+                for length, tone, summary_data in summaries:
+                    data = json.dumps({key: value for key, value in summary_data.items() if key != 'original_content'})
+                    archived = ArchivedSummary.query.filter_by(
+                        key_hash=key_hash,
+                        length=length,
+                        tone=tone,
+                        prompt_version=prompt_version,
+                        generation=generation
+                    ).first()
+                    if archived is None:
+                        archived = ArchivedSummary(
+                            key_hash=key_hash,
+                            length=length,
+                            tone=tone,
+                            prompt_version=prompt_version,
+                            generation=generation
+                        )
+                        db.session.add(archived)
+                    archived.data = data
+                    archived.compute_time = round(compute_time, 3)
+                    archived.updated_at = now
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    # Another worker archived the same summary first
+                    db.session.rollback()
+                self._written()
+            return True
+        except Exception as e:
+            print(f"Summary archive save error: {str(e)}")
+            with self.app_context():
+                db.session.rollback()
+            return False
+
+    def purge(self):
+        """
+        Delete summaries not written for max_age, including those of older
+        generations and versions, which are never read again
+
+        Returns:
+            int: Number of summaries deleted
+        """
+        if not self.available:
+            return 0
+
+        try:
+            with self.app_context():
+                cutoff = datetime.now(timezone.utc) - self.max_age
+                deleted = ArchivedSummary.query.filter(ArchivedSummary.updated_at < cutoff).delete()
+                db.session.commit()
+                return deleted
+        except Exception as e:
+            print(f"Summary archive purge error: {str(e)}")
+            with self.app_context():
+                db.session.rollback()
+            return 0
+
+    @staticmethod
+    def saved_summary_data(saved):
+        """
+        Build summary response data from a saved summary
+
+        Args:
+            saved (SavedSummary): Summary a user saved unedited
+
+        Returns:
+            dict: Headline, summary, settings and the saved tags as categories
+        """
+        return {
+            'headline': saved.headline,
+            'summary': saved.summary,
+            'key_hash': saved.key_hash,
+            'settings': {
+                'length': saved.length,
+                'tone': saved.tone
+            },
+            'metadata': {'categories': [tag for tag in (saved.tags or '').split(',') if tag]},
+            'warnings': []
+        }
+
+    def _written(self):
+        self._writes += 1
+        if self._writes % self.purge_interval == 0:
+            self.purge()
+
+# Create a global instance
+summary_archive = SummaryArchive()
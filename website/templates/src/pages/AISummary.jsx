@@ -95,6 +95,7 @@ const AISummary = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [metadata, setMetadata] = useState(null);
+  const [generatedKey, setGeneratedKey] = useState(null);
   const [warnings, setWarnings] = useState([]);
   const [showWarnings, setShowWarnings] = useState(false);
   const [progress, setProgress] = useState(0);
@@ -582,6 +583,15 @@ const AISummary = () => {
     }
   };
 
+  // Only a summary saved unedited, with the settings it was generated with, can be served from the cache
+  const reusableKeyHash = () => {
+    if (!generatedKey || isEditing || summary !== originalSummary || headline !== originalHeadline ||
+        generatedKey.length !== length || generatedKey.tone !== tone) {
+      return null;
+    }
+    return generatedKey.hash;
+  };
+
   const handleSaveSummary = async () => {
     if (!summary) {
       setSnackbar({
@@ -595,7 +605,7 @@ const AISummary = () => {
     setSaving(true);
   
     try {
-      const response = await saveSummary(headline, summary, '', tone, length);
+      const response = await saveSummary(headline, summary, '', tone, length, reusableKeyHash());
   
       if (response.success) {
         setSnackbar({
@@ -680,7 +690,7 @@ const AISummary = () => {
     setSaving(true);
   
     try {
-      const response = await saveSummary(headline, summary, '', tone, length);
+      const response = await saveSummary(headline, summary, '', tone, length, reusableKeyHash());
   
       if (response.success) {
         setSnackbar({
@@ -734,6 +744,7 @@ const AISummary = () => {
     setHeadline('');
     setError(null);
     setMetadata(null);
+    setGeneratedKey(null);
     setWarnings([]);
     setLoading(true);
     setProgress(0);
@@ -770,6 +781,7 @@ const AISummary = () => {
       setSummary(result.summary);
       setHeadline(result.headline || '');
       setMetadata(result.metadata);
+      setGeneratedKey(result.key_hash ? { hash: result.key_hash, length, tone } : null);
       
       // Store original summary and headline for comparison
       setOriginalSummary(result.summary);
@@ -134,9 +134,11 @@ export const logout = async () => {
  * @param {string} url - URL to extract content from (optional)
  * @param {boolean} strictFiltering - Whether to use strict content filtering
  * @param {function} onProgress - Callback for progress updates (optional)
+ * @param {Array} variants - Extra {length, tone} versions generated in the same call (optional),
+ *   returned in the response's `variants` array
  * @returns {Promise<Object>} - The summary response
  */
-export const generateSummary = async (content, length = 50, tone = 'professional', isHtml = false, url = '', strictFiltering = false, onProgress = null) => {
+export const generateSummary = async (content, length = 50, tone = 'professional', isHtml = false, url = '', strictFiltering = false, onProgress = null, variants = null) => {
   try {
     const payload = {
       length,
@@ -144,6 +146,10 @@ export const generateSummary = async (content, length = 50, tone = 'professional
       strict_filtering: strictFiltering
     };
     
+    if (variants && variants.length) {
+      payload.variants = variants;
+    }
+    
     // Add content or URL based on what's provided
     if (content) {
       payload.content = content;
@@ -176,6 +182,72 @@ export const generateSummary = async (content, length = 50, tone = 'professional
   }
 };
 
+/**
+ * Generate AI summary of content, receiving headline and summary text as it is generated
+ * @param {string} content - The content to summarize
+ * @param {number} length - The desired summary length (percentage of original)
+ * @param {string} tone - The tone of the summary (professional, casual, etc.)
+ * @param {function} onToken - Callback called with (field, text) for each headline/summary delta
+ * @param {boolean} strictFiltering - Whether to use strict content filtering
+ * @returns {Promise<Object>} - The complete summary response
+ */
+export const generateSummaryStream = async (content, length = 50, tone = 'professional', onToken = null, strictFiltering = false) => {
+  const token = localStorage.getItem('token');
+  const response = await fetch(`${API_URL}/api/summarize`, {
+    method: 'POST',
+    credentials: 'include',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'text/event-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify({ content, length, tone, strict_filtering: strictFiltering, stream: true }),
+  });
+
+  // Validation errors and async fallbacks still come back as JSON
+  if (!response.headers.get('Content-Type')?.includes('text/event-stream')) {
+    const data = await response.json();
+    if (!response.ok) {
+      throw data;
+    }
+    return data.status === 'processing' && data.task_id ? pollForResults(data.task_id) : data;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      const event = rawEvent.match(/^event: (.*)$/m)?.[1];
+      const data = JSON.parse(rawEvent.match(/^data: (.*)$/m)?.[1] || '{}');
+
+      if (event === 'complete') {
+        return data;
+      }
+      if (event === 'error') {
+        throw data;
+      }
+      if (onToken) {
+        onToken(event, data.text);
+      }
+    }
+  }
+
+  throw { error: 'Summary stream ended unexpectedly' };
+};
+
 /**
  * Poll for asynchronous task results
  * @param {string} taskId - The task ID to poll for
@@ -293,8 +365,8 @@ export const generateBatchSummaries = async (items, length = 50, tone = 'profess
         totalItems: items.length
       });
       
-      // Start tracking progress for each task
-      trackBatchProgress(response.data.tasks, onProgress);
+      // Poll the batch job for progress and partial results
+      trackBatchProgress(response.data.batch_id, onProgress);
     }
     
     return response.data;
@@ -305,63 +377,62 @@ export const generateBatchSummaries = async (items, length = 50, tone = 'profess
 };
 
 /**
- * Track progress of a batch of tasks
- * @param {Array} tasks - Array of task objects with task_id
+ * Track progress of a batch job
+ * @param {string} batchId - The batch ID returned by the batch endpoint
  * @param {function} onProgress - Callback for progress updates
+ * @param {number} interval - Polling interval in milliseconds
+ * @param {number} timeout - Maximum polling time in milliseconds
  */
-const trackBatchProgress = async (tasks, onProgress) => {
-  // Filter out tasks with errors
-  const validTasks = tasks.filter(task => task.status !== 'error');
-  const totalTasks = validTasks.length;
-  let completedTasks = 0;
-  
-  // Create a map to track completion status
-  const taskStatus = new Map();
-  validTasks.forEach(task => {
-    taskStatus.set(task.task_id, false);
-  });
+const trackBatchProgress = async (batchId, onProgress, interval = 1000, timeout = 600000) => {
+  const startTime = Date.now();
   
-  // Poll for each task
-  const pollPromises = validTasks.map(async (task) => {
-    try {
-      // Poll for this task's results
-      await pollForResults(
-        task.task_id,
-        (progress) => {
-          // If task completed
-          if (progress.status === 'completed' && !taskStatus.get(task.task_id)) {
-            taskStatus.set(task.task_id, true);
-            completedTasks++;
-            
-            // Update overall progress
-            onProgress({
-              status: 'processing',
-              progress: Math.floor((completedTasks / totalTasks) * 100),
-              message: `Completed ${completedTasks} of ${totalTasks} items`,
-              completedItems: completedTasks,
-              totalItems: totalTasks
-            });
-            
-            // Check if all tasks are complete
-            if (completedTasks === totalTasks) {
-              onProgress({
-                status: 'completed',
-                progress: 100,
-                message: `All ${totalTasks} items processed successfully`,
-                completedItems: totalTasks,
-                totalItems: totalTasks
-              });
-            }
-          }
-        }
-      );
-    } catch (error) {
-      console.error(`Error polling task ${task.task_id}:`, error);
+  try {
+    while (Date.now() - startTime < timeout) {
+      const response = await api.get(`/api/summarize/status/${batchId}`);
+      const data = response.data;
+      
+      // Batch still running: report finished items so far
+      if (data.status === 'processing') {
+        const batchProgress = data.progress || {};
+        const totalItems = batchProgress.total || 0;
+        const completedItems = batchProgress.completed || 0;
+        onProgress({
+          status: 'processing',
+          progress: totalItems ? Math.floor((completedItems / totalItems) * 100) : 0,
+          message: `Completed ${completedItems} of ${totalItems} items`,
+          completedItems,
+          totalItems,
+          items: batchProgress.items || []
+        });
+        await new Promise(resolve => setTimeout(resolve, interval));
+        continue;
+      }
+      
+      if (data.status === 'completed') {
+        onProgress({
+          status: 'completed',
+          progress: 100,
+          message: data.failed
+            ? `Processed ${data.total} items, ${data.failed} failed`
+            : `All ${data.total} items processed successfully`,
+          completedItems: data.total,
+          totalItems: data.total,
+          items: data.items
+        });
+        return data;
+      }
+      
+      throw new Error(data.error || 'Unknown error');
     }
-  });
-  
-  // Wait for all polling to complete
-  await Promise.all(pollPromises);
+    throw new Error('Batch timed out');
+  } catch (error) {
+    console.error(`Error polling batch ${batchId}:`, error);
+    onProgress({
+      status: 'error',
+      progress: 0,
+      message: error.response?.data?.error || error.message || 'Failed to process batch'
+    });
+  }
 };
 
 /**
@@ -371,16 +442,18 @@ const trackBatchProgress = async (tasks, onProgress) => {
  * @param {string} tags - Comma-separated list of tags
  * @param {string} tone - The tone used for the summary
  * @param {number} length - The length percentage used
+ * @param {string} [keyHash] - The key_hash of the summarized content, only for unedited summaries
  * @returns {Promise<Object>} - The response with the saved summary ID
  */
-export const saveSummary = async (headline, summary, tags, tone, length) => {
+export const saveSummary = async (headline, summary, tags, tone, length, keyHash = null) => {
   try {
     const response = await api.post('/api/summary/save', {
       headline,
       summary,
       tags,
       tone,
-      length
+      length,
+      key_hash: keyHash
     });
     
     return response.data;
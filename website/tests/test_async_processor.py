@@ -148,6 +148,32 @@ class TestAsyncProcessor(unittest.TestCase):
         for task_id in task_ids:
             self.assertNotIn(task_id, self.processor.results)
 
+class TestTaskProgress(unittest.TestCase):
+    """Test cases for progress reporting of running tasks"""
+
+    def setUp(self):
+        """Create a processor without starting its worker"""
+        from website.async_processor import AsyncProcessor
+        self.processor = AsyncProcessor(max_workers=1)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.processor.executor.shutdown(wait=False)
+
+    def test_progress_of_pending_task(self):
+        """Test that progress is attached to a pending task"""
+        task_id = self.processor.submit_task(lambda: None, task_id='batch')
+        self.processor.update_task_progress(task_id, {'completed': 1, 'total': 3})
+        self.assertEqual(self.processor.get_task_status(task_id)['progress'], {'completed': 1, 'total': 3})
+
+    def test_progress_after_completion_is_ignored(self):
+        """Test that late progress does not overwrite a finished task"""
+        self.processor.results['done'] = {'status': 'timeout', 'error': 'Task timed out'}
+        self.processor.update_task_progress('done', {'completed': 2})
+        self.processor.update_task_progress('missing', {'completed': 2})
+        self.assertNotIn('progress', self.processor.results['done'])
+        self.assertNotIn('missing', self.processor.results)
+
 class TestContentCompression(unittest.TestCase):
     """Test cases for content compression functions"""
     
@@ -213,5 +239,68 @@ class TestContentChunking(unittest.TestCase):
         # Verify mock was called
         mock_chunk.assert_called_once_with(content, max_chunk_size=10, overlap=2)
 
+class TestIterChunks(unittest.TestCase):
+    """Test cases for the token-budget chunker"""
+    
+    def setUp(self):
+        """Build content well over one chunk"""
+        from website.async_processor import iter_chunks, chunk_content
+        self.iter_chunks = iter_chunks
+        self.chunk_content = chunk_content
+        self.content = " ".join(f"Sentence number {i} talks about topic {i % 7}." for i in range(2000))
+    
+    def test_small_content_is_one_chunk(self):
+        """Test that content within the budget is returned whole"""
+        self.assertEqual(self.chunk_content("A short piece of content."), ["A short piece of content."])
+        self.assertEqual(self.chunk_content(""), [])
+    
+    def test_large_content_terminates(self):
+        """Test that chunking large content finishes and covers the whole input"""
+        chunks = self.chunk_content(self.content, max_tokens=500, overlap_tokens=50)
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertLess(len(chunks), len(self.content) // 1000)
+        self.assertTrue(self.content.startswith(chunks[0]))
+        self.assertTrue(self.content.endswith(chunks[-1]))
+    
+    def test_chunks_fit_budget(self):
+        """Test that no chunk exceeds the token budget"""
+        for chunk in self.iter_chunks(self.content, max_tokens=500, overlap_tokens=50):
+            self.assertLessEqual(len(chunk), 500 * 4)
+    
+    def test_chunks_end_at_sentences(self):
+        """Test that chunks end on sentence boundaries when one is available"""
+        chunks = self.chunk_content(self.content, max_tokens=500, overlap_tokens=50)
+        for chunk in chunks:
+            self.assertTrue(chunk.rstrip().endswith('.'))
+    
+    def test_chunks_overlap(self):
+        """Test that each chunk starts with text from the end of the previous one"""
+        chunks = self.chunk_content(self.content, max_tokens=500, overlap_tokens=50)
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertIn(current[:40], previous)
+    
+    def test_unpunctuated_content(self):
+        """Test that content without sentence boundaries is still split and terminates"""
+        content = "word " * 10000
+        chunks = self.chunk_content(content, max_tokens=250, overlap_tokens=25)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+    
+    def test_is_lazy(self):
+        """Test that the chunker yields chunks on demand"""
+        chunks = self.iter_chunks(self.content, max_tokens=500)
+        self.assertTrue(self.content.startswith(next(chunks)))
+
+    def test_edit_keeps_later_chunks(self):
+        """Test that chunks after an edit realign with the original ones"""
+        edited = self.content.replace("Sentence number 3 talks", "Sentence number 3, which was edited, talks", 1)
+
+        original_chunks = self.chunk_content(self.content, max_tokens=500, overlap_tokens=50)
+        edited_chunks = self.chunk_content(edited, max_tokens=500, overlap_tokens=50)
+
+        unchanged = set(original_chunks) & set(edited_chunks)
+        self.assertGreaterEqual(len(unchanged), len(original_chunks) - 3)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Tests for the Bloom Filter Module
+"""
+
+import unittest
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.bloom_filter import BloomFilter, optimal_size
+from website.cache import SummaryCache
+from website.cache_backends import MemoryStore, ShardedStore
+
+ARTICLE = (
+    "The city council approved a new transit budget on Tuesday after a lengthy debate. "
+    "The plan adds bus routes to the eastern suburbs and extends light rail service hours. "
+    "Council members said the funding would come from a combination of provincial grants "
+    "and a small increase in parking fees downtown. Critics argued the fee increase would "
+    "hurt local businesses, while supporters pointed to rising ridership since the pandemic."
+)
+
+class BitmapStore(MemoryStore):
+    """Memory store with the SETBIT command the shared filter is written with"""
+
+    def setbit(self, key, offset, value):
+        with self.lock:
+            bitmap = bytearray(self.get(key) or b'')
+            if len(bitmap) <= offset >> 3:
+                bitmap.extend(b'\0' * ((offset >> 3) + 1 - len(bitmap)))
+            bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+            self.set(key, bytes(bitmap))
+            return 0
+
+def bitmap_shards():
+    """Create a sharded store of bitmap stores"""
+    shards = []
+    for node in ('a:6379/0', 'b:6379/0', 'c:6379/0'):
+        shard = BitmapStore()
+        shard.node = node
+        shards.append(shard)
+    return ShardedStore(shards)
+
+class TestBloomFilter(unittest.TestCase):
+    """Test cases for the BloomFilter class"""
+
+    def test_no_false_negatives(self):
+        """Test that every added key is reported as possibly present"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f"summary:{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+
+    def test_false_positive_rate(self):
+        """Test that the false positive rate at capacity is close to the target"""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"summary:{i}")
+        false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.02)
+
+    def test_sizing(self):
+        """Test the standard bit and hash counts"""
+        self.assertEqual(optimal_size(1000, 0.01), (9586, 7))
+
+    def test_load_union_of_bitmaps(self):
+        """Test that a filter loaded from Redis-style bitmaps holds the keys of each"""
+        first, second = BloomFilter(capacity=100), BloomFilter(capacity=100)
+        first.add('summary:a')
+        second.add('summary:b')
+        # Redis stores a bitmap only up to its highest set byte
+        last = max(second.positions('summary:b')) >> 3
+        merged = BloomFilter(capacity=100)
+        merged.load(bytes(first.bits), bytes(second.bits[:last + 1]), None)
+        self.assertIn('summary:a', merged)
+        self.assertIn('summary:b', merged)
+        self.assertGreater(merged.fill_ratio(), first.fill_ratio())
+
+class TestCacheBloomFilter(unittest.TestCase):
+    """Test cases for the bloom filter in front of the summary cache"""
+
+    def create_cache(self, store):
+        cache = SummaryCache(store)
+        cache.bloom_enabled = True
+        self.assertTrue(cache.load_bloom_filter())
+        return cache
+
+    def test_definite_misses_skip_the_store(self):
+        """Test that content never cached is answered without reading the store"""
+        cache = self.create_cache(BitmapStore())
+        self.assertIsNone(cache.get_cached_summary(ARTICLE, 50, 'professional'))
+        self.assertEqual(cache.get_cached_variants(ARTICLE, [(25, 'casual')]), [None])
+
+        stats = cache.get_stats()
+        # Exact key and near-duplicate bands of the first lookup, variant of the second
+        self.assertEqual(stats['round_trips_saved'], 3)
+        self.assertEqual(stats['false_positives'], 0)
+
+    def test_filter_is_shared(self):
+        """Test that an entry written by one worker passes another worker's filter"""
+        store = BitmapStore()
+        writer = self.create_cache(store)
+        reader = self.create_cache(store)
+        writer.cache_summary(ARTICLE, 50, 'professional', {'summary': 'Council approves budget.'})
+
+        # Until it reloads, the reader's filter rules the new entry out
+        self.assertIsNone(reader.get_cached_summary(ARTICLE, 50, 'professional'))
+        self.assertIsNotNone(reader.get_cached_summary(ARTICLE, 50, 'professional', use_filter=False))
+
+        reader.local_cache.clear()
+        reader.load_bloom_filter()
+        self.assertIsNotNone(reader.get_cached_summary(ARTICLE, 50, 'professional'))
+        self.assertIsNotNone(reader.get_cached_summary("By Jane Smith\n\n" + ARTICLE, 50, 'professional'))
+
+    def test_bitmap_shard_down(self):
+        """Test that the filter is not used while the shard of its bitmap is down"""
+        store = bitmap_shards()
+        writer = self.create_cache(store)
+        reader = self.create_cache(store)
+        contents = [f"{ARTICLE} Update {i}." for i in range(10)]
+        for content in contents:
+            writer.cache_summary(content, 50, 'professional', {'summary': 'Council approves budget.'})
+
+        bitmap_shard = store.shard_for(f"bloom:{reader.bloom_period()}")
+        bitmap_shard.is_connected = lambda: False
+        self.assertFalse(reader.load_bloom_filter())
+        self.assertFalse(reader.bloom_ready)
+
+        # Entries on the other shards are still found
+        for content in contents:
+            if store.shard_for(reader.generate_cache_key(content, 50, 'professional')) is not bitmap_shard:
+                self.assertIsNotNone(reader.get_cached_summary(content, 50, 'professional'))
+        self.assertEqual(reader.get_stats()['round_trips_saved'], 0)
+
+        del bitmap_shard.is_connected
+        self.assertTrue(reader.load_bloom_filter())
+        self.assertTrue(all(reader.get_cached_summary(content, 50, 'professional') for content in contents))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,318 @@
+"""
+Tests for the Cache Storage Backends
+"""
+
+import unittest
+import sys
+import os
+import time
+import tempfile
+from unittest.mock import patch
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.cache import SummaryCache
+from website.content_processor import as_envelope
+from website.fingerprint import simhash_words
+from website.cache_backends import MemoryStore, DiskStore, RedisStore, ShardedStore, create_store
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover - exercised only when fakeredis is missing
+    fakeredis = None
+
+ARTICLE = (
+    "The city council approved a new transit budget on Tuesday after a lengthy debate. "
+    "The plan adds bus routes to the eastern suburbs and extends light rail service hours. "
+    "Council members said the funding would come from a combination of provincial grants "
+    "and a small increase in parking fees downtown. Critics argued the fee increase would "
+    "hurt local businesses, while supporters pointed to rising ridership since the pandemic. "
+    "The mayor said construction on the first new routes could begin as early as next spring, "
+    "pending a final environmental review and public consultation sessions in each ward."
+)
+
+SUMMARY = {'summary': 'Council approves transit budget.', 'original_content': ARTICLE}
+
+class StoreTests:
+    """Test cases shared by every store"""
+
+    def create_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self.create_store()
+        self.cache = SummaryCache(self.store)
+
+    def test_summary_round_trip(self):
+        """Test that a cached summary is found and references its content by hash"""
+        self.assertIsNone(self.cache.get_cached_summary(ARTICLE, 50, 'professional'))
+        self.assertTrue(self.cache.cache_summaries(ARTICLE, [
+            (50, 'professional', SUMMARY),
+            (25, 'casual', SUMMARY)
+        ]))
+
+        cached = self.cache.get_cached_summary(ARTICLE, 50, 'professional')
+        self.assertEqual(cached['summary'], SUMMARY['summary'])
+        self.assertTrue(cached['cached'])
+        self.assertNotIn('original_content', cached)
+        self.assertEqual(cached['content_hash'], as_envelope(ARTICLE).content_hash)
+        self.assertIsNone(self.store.get(f"original:{cached['content_hash']}"))
+        self.assertEqual(
+            [result is not None for result in self.cache.get_cached_variants(ARTICLE, [(25, 'casual'), (75, 'casual')])],
+            [True, False]
+        )
+
+    def test_near_duplicate(self):
+        """Test that a copy of cached content with a byline is served from the cache"""
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        cached = self.cache.get_cached_summary("By Jane Smith\n\n" + ARTICLE, 50, 'professional')
+        self.assertTrue(cached['near_duplicate'])
+
+    def test_near_duplicate_lookup_is_bounded(self):
+        """Test that a near-duplicate lookup compares the most recent band members only, however full the bands are"""
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        content = "By Jane Smith\n\n" + ARTICLE
+        fingerprint = simhash_words(as_envelope(content).tokens)
+        pipe = self.store.pipeline()
+        for band_key in self.cache.generate_fingerprint_keys(fingerprint, 50, 'professional'):
+            # Older unrelated summaries that happen to share the band
+            pipe.zadd(band_key, {f"{fingerprint ^ 0xffff00ff00ff ^ i << 48:016x}:summary:{i}": i for i in range(500)})
+            self.cache.bloom_add(pipe, band_key)
+        pipe.execute()
+
+        self.assertTrue(self.cache.get_cached_summary(content, 50, 'professional')['near_duplicate'])
+        candidates = self.cache.get_stats()['near_duplicate_candidates']
+        self.assertLessEqual(candidates, self.cache.near_duplicate_max_candidates)
+
+    def test_bands_keep_recent_members(self):
+        """Test that each fingerprint band is trimmed to its most recent members"""
+        self.cache.near_duplicate_max_candidates = 2 * self.cache.near_duplicate_band_count
+        fingerprint = simhash_words(as_envelope(ARTICLE).tokens)
+        for i in range(5):
+            pipe = self.store.pipeline()
+            self.cache.index_fingerprint(pipe, ARTICLE, 50, 'professional', f"summary:{i}")
+            pipe.execute()
+
+        band_key = self.cache.generate_fingerprint_keys(fingerprint, 50, 'professional')[0]
+        members = self.store.pipeline().zrevrange(band_key, 0, -1).execute()[0]
+        self.assertEqual(len(members), 2)
+
+    def test_chunk_summaries(self):
+        """Test that chunk summaries are cached per chunk and tone"""
+        self.cache.cache_chunk_summaries({'chunk one': 'Summary one'}, 'casual')
+        self.assertEqual(
+            self.cache.get_cached_chunk_summaries(['chunk one', 'chunk two'], 'casual'),
+            ['Summary one', None]
+        )
+        self.assertEqual(self.cache.get_cached_chunk_summaries(['chunk one'], 'formal'), [None])
+
+    def test_locks(self):
+        """Test that a lock is held by one token until released or expired"""
+        self.assertTrue(self.cache.acquire_lock('key', 'a', 0.05))
+        self.assertFalse(self.cache.acquire_lock('key', 'b', 0.05))
+        self.cache.release_lock('key', 'b')
+        self.assertFalse(self.cache.acquire_lock('key', 'b', 0.05))
+        time.sleep(0.06)
+        self.assertTrue(self.cache.acquire_lock('key', 'b', 0.05))
+        self.cache.release_lock('key', 'b')
+        self.assertTrue(self.cache.acquire_lock('key', 'c', 0.05))
+
+    def test_stale_entries_refresh_once(self):
+        """Test that a summary past its soft TTL is served stale and refreshed by one reader"""
+        refreshes = []
+        self.cache.refresher = lambda content, length, tone, cached: refreshes.append((length, tone))
+        self.cache.cache_expiry = 0
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+
+        for _ in range(3):
+            cached = self.cache.get_cached_summary(ARTICLE, 50, 'professional')
+            self.assertTrue(cached['stale'])
+            self.assertNotIn('fresh_until', cached)
+        self.assertEqual(refreshes, [(50, 'professional')])
+
+    def test_dropped_refresh_is_retried(self):
+        """Test that a refresh dropped for lack of capacity is tried again by the next reader"""
+        refreshes = []
+        def refresher(content, length, tone, cached):
+            refreshes.append((length, tone))
+            return False
+        self.cache.refresher = refresher
+        self.cache.cache_expiry = 0
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+
+        for _ in range(2):
+            self.assertTrue(self.cache.get_cached_summary(ARTICLE, 50, 'professional')['stale'])
+        self.assertEqual(len(refreshes), 2)
+
+    def test_fresh_entries_are_not_refreshed(self):
+        """Test that a fresh summary quickly generated is served without a refresh"""
+        refreshes = []
+        self.cache.refresher = lambda *args: refreshes.append(args)
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY, compute_time=0.5)
+        self.assertNotIn('stale', self.cache.get_cached_summary(ARTICLE, 50, 'professional'))
+        self.assertEqual(refreshes, [])
+
+    def test_keys_ignore_whitespace(self):
+        """Test that content differing only in spacing shares a cache entry"""
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        cached = self.cache.get_cached_summary("  " + ARTICLE.replace(". ", ".\n\n"), 50, 'professional')
+        self.assertNotIn('near_duplicate', cached)
+
+    def test_version_change_misses(self):
+        """Test that summaries cached for another prompt or model version are not served"""
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        self.cache.model_version = '2:other-model'
+        self.assertIsNone(self.cache.get_cached_summary(ARTICLE, 50, 'professional'))
+
+    def test_invalidate_namespace(self):
+        """Test that bumping a generation hides every entry of its namespace only"""
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        self.cache.cache_chunk_summaries({'chunk one': 'Summary one'}, 'casual')
+        other = SummaryCache(self.store)
+        self.assertIsNotNone(other.get_cached_summary(ARTICLE, 50, 'professional'))
+
+        self.assertTrue(self.cache.invalidate('summary'))
+        self.assertIsNone(self.cache.get_cached_summary(ARTICLE, 50, 'professional'))
+        self.assertEqual(self.cache.get_cached_chunk_summaries(['chunk one'], 'casual'), ['Summary one'])
+        # Other workers see the new generation once their copy of it is reread
+        other.generation_ttl = 0
+        self.assertIsNone(other.get_cached_summary(ARTICLE, 50, 'professional'))
+        with self.assertRaises(ValueError):
+            self.cache.invalidate('everything')
+
+    def test_entries_expire(self):
+        """Test that entries are dropped after their TTL"""
+        pipe = self.store.pipeline()
+        pipe.setex('summary:a', 0.05, b'A')
+        pipe.zadd('lsh:a', {b'member': 1})
+        pipe.expire('lsh:a', 0.05)
+        pipe.execute()
+        self.assertEqual(self.store.get('summary:a'), b'A')
+        time.sleep(0.06)
+        self.assertIsNone(self.store.get('summary:a'))
+        self.assertEqual(self.store.pipeline().zrevrange('lsh:a', 0, -1).execute(), [[]])
+
+class TestMemoryStore(StoreTests, unittest.TestCase):
+    """Test cases for the in-memory store"""
+
+    def create_store(self):
+        return MemoryStore()
+
+    def test_bounded_by_entries(self):
+        """Test that the oldest keys are evicted past the entry limit"""
+        store = MemoryStore(max_entries=2)
+        for key in 'abc':
+            store.setex(key, 60, key)
+        self.assertEqual(store.mget(['a', 'b', 'c']), [None, b'b', b'c'])
+
+class TestDiskStore(StoreTests, unittest.TestCase):
+    """Test cases for the SQLite store"""
+
+    def create_store(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        return DiskStore(os.path.join(self.directory.name, 'cache.sqlite3'))
+
+    def test_persists_across_instances(self):
+        """Test that entries written by one worker are read by another"""
+        self.cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        other = SummaryCache(DiskStore(self.store.path))
+        self.assertEqual(other.get_cached_summary(ARTICLE, 50, 'professional')['summary'], SUMMARY['summary'])
+
+def memory_shard(node):
+    """Create a memory store standing in for one shard"""
+    store = MemoryStore()
+    store.node = node
+    return store
+
+class TestShardedStore(StoreTests, unittest.TestCase):
+    """Test cases for a store sharded over several memory stores"""
+
+    def create_store(self):
+        return ShardedStore([memory_shard(node) for node in ('a:6379/0', 'b:6379/0', 'c:6379/0')])
+
+    def test_keys_are_spread(self):
+        """Test that summaries land on every shard and are read back from theirs"""
+        contents = [f"{ARTICLE} Update {i}." for i in range(30)]
+        for content in contents:
+            self.cache.cache_summary(content, 50, 'professional', SUMMARY)
+        self.assertTrue(all(shard._data for shard in self.store.shards.values()))
+        self.assertTrue(all(self.cache.get_cached_summaries(contents, 50, 'professional')))
+
+    def test_shard_down(self):
+        """Test that keys of a shard that is down miss while the other shards keep serving"""
+        contents = [f"{ARTICLE} Update {i}." for i in range(30)]
+        for content in contents:
+            self.cache.cache_summary(content, 50, 'professional', SUMMARY)
+        down = self.store.shards['b:6379/0']
+        down.is_connected = lambda: False
+
+        keys = [self.cache.generate_cache_key(content, 50, 'professional') for content in contents]
+        values = self.store.mget(keys)
+        for key, value in zip(keys, values):
+            self.assertEqual(value is None, self.store.shard_for(key) is down)
+        self.assertTrue(self.store.is_connected())
+        self.assertEqual(self.cache.get_stats()['shards']['b:6379/0'], False)
+
+    def test_generation_shard_down(self):
+        """Test that a down generation counter keeps the last known generation"""
+        self.cache.generation_ttl = 0
+        self.assertTrue(self.cache.invalidate('summary'))
+        self.assertEqual(self.cache.get_generation('summary'), 1)
+
+        counter_shard = self.store.shard_for('generation:summary')
+        counter_shard.is_connected = lambda: False
+        self.assertEqual(self.cache.get_generation('summary'), 1)
+        # Still read again on every call, so the new value is seen once the shard is back
+        counter_shard.incr('generation:summary')
+        del counter_shard.is_connected
+        self.assertEqual(self.cache.get_generation('summary'), 2)
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestShardedRedisStore(StoreTests, unittest.TestCase):
+    """Test cases for a store sharded over several fake Redis servers"""
+
+    def create_store(self):
+        return ShardedStore([
+            RedisStore(f"redis://shard-{index}:6379/0", client=fakeredis.FakeRedis(server=fakeredis.FakeServer()))
+            for index in range(3)
+        ])
+
+    def test_entries_expire(self):
+        """Redis expires keys in whole milliseconds, checked with a longer TTL"""
+        pipe = self.store.pipeline()
+        pipe.setex('summary:a', 1, b'A')
+        pipe.execute()
+        self.assertEqual(self.store.get('summary:a'), b'A')
+        time.sleep(1.1)
+        self.assertIsNone(self.store.get('summary:a'))
+
+class TestEarlyRefresh(unittest.TestCase):
+    """Test cases for probabilistic early refreshes"""
+
+    def test_refresh_due(self):
+        """Test that slow summaries are refreshed earlier than quick ones"""
+        cache = SummaryCache(MemoryStore())
+        now = time.time()
+        with patch('website.cache.random.random', return_value=0.9):
+            # -ln(0.1) is about 2.3 times the compute time ahead of now
+            self.assertTrue(cache.refresh_due(now + 20, 10, now))
+            self.assertFalse(cache.refresh_due(now + 20, 5, now))
+            self.assertFalse(cache.refresh_due(now + 20, 0, now))
+            self.assertTrue(cache.refresh_due(now, 0, now))
+        cache.xfetch_beta = 0
+        self.assertFalse(cache.refresh_due(now + 1, 1000, now))
+
+class TestCreateStore(unittest.TestCase):
+    """Test cases for choosing a store from the environment"""
+
+    def test_defaults_to_memory_without_redis_url(self):
+        """Test that a missing REDIS_URL falls back to memory instead of failing"""
+        environ = {key: value for key, value in os.environ.items() if key not in ('REDIS_URL', 'CACHE_BACKEND')}
+        with patch.dict(os.environ, environ, clear=True):
+            self.assertEqual(create_store().name, 'memory')
+            self.assertEqual(create_store('redis').name, 'memory')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the Cache Value Codec Module
+"""
+
+import unittest
+import sys
+import os
+import json
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.cache_codec import CacheCodec, CodecError, is_encoded, CODEC_MARKER
+
+SUMMARY = {
+    'headline': 'Council approves transit budget',
+    'summary': 'The city council approved a new transit budget. ' * 40,
+    'settings': {'length': 50, 'tone': 'professional'},
+    'metadata': {'keywords': ['budget', 'transit'], 'word_count': 420},
+    'warnings': [],
+    'cached': False
+}
+
+class TestCacheCodec(unittest.TestCase):
+    """Test cases for the CacheCodec class"""
+
+    def test_round_trip(self):
+        """Test that every available format decodes to the original value"""
+        for serializer in ('json', 'msgpack'):
+            for compressor in ('none', 'zlib', 'zstd'):
+                codec = CacheCodec(serializer, compressor)
+                encoded = codec.encode(SUMMARY)
+                self.assertTrue(is_encoded(encoded))
+                self.assertEqual(codec.decode(encoded), SUMMARY)
+                self.assertEqual(codec.decode(codec.encode("Plain text é")), "Plain text é")
+
+    def test_large_values_are_compressed(self):
+        """Test that values above the threshold are stored compressed and smaller"""
+        codec = CacheCodec('json', 'zlib', compress_threshold=512)
+        encoded = codec.encode(SUMMARY)
+        self.assertEqual(encoded[1] & 0x0F, 1)
+        self.assertLess(len(encoded), len(json.dumps(SUMMARY)) / 3)
+
+    def test_small_values_are_not_compressed(self):
+        """Test that values below the threshold are stored as they are"""
+        codec = CacheCodec('json', 'zlib', compress_threshold=512)
+        encoded = codec.encode({'summary': 'short'})
+        self.assertEqual(encoded[1] & 0x0F, 0)
+
+    def test_default_format_is_portable(self):
+        """Test that values are written as JSON and zlib unless another format is configured"""
+        encoded = CacheCodec().encode(SUMMARY)
+        self.assertEqual(encoded[1], 1 << 4 | 1)
+        self.assertEqual(CacheCodec('json', 'none').decode(encoded), SUMMARY)
+
+    def test_any_format_is_readable(self):
+        """Test that a codec reads values written in another available format"""
+        written = CacheCodec('json', 'none').encode(SUMMARY)
+        self.assertEqual(CacheCodec('json', 'zlib').decode(written), SUMMARY)
+
+    def test_legacy_values(self):
+        """Test that values written before the codec layer are still readable"""
+        codec = CacheCodec()
+        self.assertEqual(codec.decode(json.dumps(SUMMARY).encode('utf-8')), SUMMARY)
+        self.assertEqual(codec.decode("An original article.".encode('utf-8')), "An original article.")
+
+    def test_unknown_format(self):
+        """Test that an unknown format byte is reported instead of misread"""
+        with self.assertRaises(CodecError):
+            CacheCodec().decode(bytes([CODEC_MARKER, 0x91]) + b'payload')
+        with self.assertRaises(CodecError):
+            CacheCodec(serializer='pickle')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the Circuit Breaker Module
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.circuit_breaker import CircuitBreaker, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+from website.extractive import fallback_summary
+from website.rate_limiter import AdaptiveRateLimiter
+from website.retry_policy import RetryPolicy
+from website.summarizer import SummaryEngine, StubBackend, CircuitOpenError
+
+PROMPT = "Summarize:\n\nThe council approved the budget. Transit funding rises."
+
+class ServiceUnavailable(Exception):
+    """Stand-in for google.api_core.exceptions.ServiceUnavailable"""
+    code = 503
+
+class SwitchableBackend(StubBackend):
+    """Stub backend that fails while `down` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.down = True
+        self.attempts = 0
+
+    def generate(self, prompt, generation_config, timeout=None):
+        self.attempts += 1
+        if self.down:
+            raise ServiceUnavailable("model is down")
+        return super().generate(prompt, generation_config, timeout)
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for the CircuitBreaker class"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the breaker opens at the failure threshold and rejects calls"""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+        for _ in range(3):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+
+        self.assertEqual(breaker.state, STATE_OPEN)
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+
+    def test_success_resets_failures(self):
+        """Test that a success in between keeps the breaker closed"""
+        breaker = CircuitBreaker(failure_threshold=3)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success(0.1)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, STATE_CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        """Test that latency spikes open the breaker"""
+        breaker = CircuitBreaker(failure_threshold=2, slow_call_threshold=1.0)
+        breaker.record_success(5.0)
+        breaker.record_success(5.0)
+        self.assertEqual(breaker.state, STATE_OPEN)
+        self.assertEqual(breaker.stats['slow_calls'], 2)
+
+    def test_half_open_probe(self):
+        """Test that one probe is allowed after the reset timeout and closes the breaker"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, STATE_HALF_OPEN)
+        # Only one probe at a time
+        self.assertFalse(breaker.allow())
+
+        breaker.record_success(0.1)
+        self.assertEqual(breaker.state, STATE_CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe opens the breaker again"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, STATE_OPEN)
+        self.assertFalse(breaker.allow())
+
+class TestEngineBreaker(unittest.TestCase):
+    """Test cases for the circuit breaker in the summarization engine"""
+
+    def test_engine_fails_fast_and_recovers(self):
+        """Test that an open breaker stops model calls until the probe succeeds"""
+        backend = SwitchableBackend()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        engine = SummaryEngine(backend, breaker=breaker, retry_policy=RetryPolicy(max_attempts=1))
+
+        for _ in range(2):
+            with self.assertRaises(ServiceUnavailable):
+                engine.generate(PROMPT)
+        self.assertTrue(engine.degraded)
+
+        with self.assertRaises(CircuitOpenError):
+            engine.generate(PROMPT)
+        self.assertEqual(backend.attempts, 2)
+
+        backend.down = False
+        time.sleep(0.06)
+        self.assertTrue(engine.generate(PROMPT))
+        self.assertFalse(engine.degraded)
+        self.assertEqual(engine.get_stats()['circuit_breaker']['state'], STATE_CLOSED)
+
+    def test_open_breaker_skips_rate_limiter(self):
+        """Test that an open breaker fails without waiting for, or releasing, a limiter slot"""
+        limiter = AdaptiveRateLimiter(max_concurrency=1, max_wait=5)
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        engine = SummaryEngine(SwitchableBackend(), limiter=limiter, breaker=breaker)
+
+        # Every slot is taken, so a call admitted first would wait max_wait
+        limiter.acquire()
+        start = time.monotonic()
+        with self.assertRaises(CircuitOpenError):
+            engine.generate(PROMPT)
+        self.assertLess(time.monotonic() - start, 1)
+        limiter.release()
+        self.assertEqual(limiter.get_stats()['concurrency_limit'], 1)
+
+    def test_rejected_prompts_do_not_open(self):
+        """Test that client errors are not counted as outages"""
+        class RejectingBackend(StubBackend):
+            def generate(self, prompt, generation_config, timeout=None):
+                raise ValueError("response blocked")
+
+        breaker = CircuitBreaker(failure_threshold=1)
+        engine = SummaryEngine(RejectingBackend(), breaker=breaker)
+        with self.assertRaises(ValueError):
+            engine.generate(PROMPT)
+        self.assertEqual(breaker.state, STATE_CLOSED)
+
+class TestFallbackSummary(unittest.TestCase):
+    """Test cases for the local summary used while the model is degraded"""
+
+    def test_fallback_summary(self):
+        """Test that the fallback keeps whole sentences within the requested length"""
+        content = " ".join(f"Sentence {i} reports on the city budget and transit plans." for i in range(40))
+        result = fallback_summary(content, 25)
+
+        self.assertTrue(result['headline'].startswith("Sentence 0"))
+        self.assertTrue(result['summary'].endswith('.'))
+        self.assertLess(len(result['summary']), len(content) * 0.4)
+
+    def test_fallback_of_short_content(self):
+        """Test that very short content is returned as its own summary"""
+        result = fallback_summary("Just one sentence here.", 50)
+        self.assertEqual(result['summary'], "Just one sentence here.")
+
+if __name__ == '__main__':
+    unittest.main()
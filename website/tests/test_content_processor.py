@@ -11,8 +11,11 @@ from content_processor import (
     sanitize_html,
     normalize_content,
     extract_metadata,
+    estimate_tokens,
     preprocess_for_gemini,
-    process_content
+    process_content,
+    ContentEnvelope,
+    as_envelope
 )
 
 class TestContentProcessor(unittest.TestCase):
@@ -79,6 +82,13 @@ class TestContentProcessor(unittest.TestCase):
         # Test that it ends with a complete sentence when possible
         self.assertTrue(preprocessed.endswith('.'))
     
+    def test_estimate_tokens(self):
+        """Test local token estimation"""
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd"), 1)
+        self.assertEqual(estimate_tokens("abcde"), 2)
+        self.assertEqual(estimate_tokens("x" * 4000), 1000)
+    
     def test_process_content_with_text(self):
         """Test processing plain text content"""
         input_data = {
@@ -110,6 +120,28 @@ class TestContentProcessor(unittest.TestCase):
         result = process_content(input_data)
         self.assertFalse(result["success"])
         self.assertEqual(result["error"], "No content or URL provided")
+    
+    def test_process_content_envelope(self):
+        """Test that processed content comes with an envelope of the same text"""
+        result = process_content({"content": "The Council met.\n\nIt approved the  budget."})
+        envelope = result["envelope"]
+        self.assertEqual(envelope.raw, result["content"])
+        self.assertEqual(envelope.word_count, result["metadata"]["word_count"])
+    
+    def test_content_envelope(self):
+        """Test the values computed once by a content envelope"""
+        envelope = ContentEnvelope("The Council met. It approved the  Budget.")
+        self.assertEqual(envelope.normalized, "the council met. it approved the budget.")
+        self.assertEqual(envelope.word_count, 7)
+        self.assertEqual(envelope.token_count, estimate_tokens(envelope.raw))
+        self.assertEqual(envelope.tokens, ("the", "council", "met", "it", "approved", "the", "budget"))
+        self.assertEqual(envelope.content_hash, ContentEnvelope(envelope.raw).content_hash)
+        self.assertEqual(envelope.key_hash, ContentEnvelope(" The Council met.\nIt approved the Budget. ").key_hash)
+        self.assertNotEqual(envelope.key_hash, ContentEnvelope(envelope.raw.lower()).key_hash)
+        self.assertIs(as_envelope(envelope), envelope)
+        
+        with self.assertRaises(AttributeError):
+            envelope.raw = "changed"
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
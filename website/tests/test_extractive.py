@@ -0,0 +1,70 @@
+"""
+Tests for the Extractive Summarization Module
+"""
+
+import unittest
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.extractive import extract_key_sentences, rank_sentences, split_sentences, is_available
+from website.content_processor import estimate_tokens, process_content
+
+ON_TOPIC = [
+    "The central bank raised interest rates to fight inflation.",
+    "Higher interest rates are expected to slow inflation over the next year.",
+    "Economists said the central bank may raise interest rates again if inflation persists.",
+]
+
+OFF_TOPIC = "A local bakery won a prize for its sourdough bread."
+
+@unittest.skipUnless(is_available(), "NumPy is not installed")
+class TestExtractiveStage(unittest.TestCase):
+    """Test cases for sentence ranking and extraction"""
+
+    def test_split_sentences(self):
+        """Test sentence splitting"""
+        self.assertEqual(split_sentences("One. Two! Three?"), ["One.", "Two!", "Three?"])
+
+    def test_central_sentences_rank_higher(self):
+        """Test that sentences sharing the document's topic outrank an outlier"""
+        sentences = ON_TOPIC + [OFF_TOPIC]
+        scores = rank_sentences(sentences)
+        self.assertEqual(int(scores.argmin()), len(sentences) - 1)
+
+    def test_small_content_is_unchanged(self):
+        """Test that content under the threshold is returned as is"""
+        content = " ".join(ON_TOPIC)
+        self.assertIs(extract_key_sentences(content), content)
+
+    def test_long_content_fits_target(self):
+        """Test that long content is reduced to the target budget in original order"""
+        sentences = [f"{ON_TOPIC[i % 3]} Report {i} was published." for i in range(300)]
+        sentences.insert(150, OFF_TOPIC)
+        content = " ".join(sentences)
+
+        reduced = extract_key_sentences(content, target_tokens=400, min_tokens=400)
+
+        self.assertLess(estimate_tokens(reduced), 420)
+        self.assertNotIn(OFF_TOPIC, reduced)
+
+        # Kept sentences appear in their original order
+        kept = split_sentences(reduced)
+        positions = [content.index(sentence) for sentence in kept]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_process_content_applies_stage(self):
+        """Test that process_content runs the stage when asked and records it"""
+        content = " ".join(f"{ON_TOPIC[i % 3]} Item {i}." for i in range(600))
+
+        result = process_content({'content': content, 'extractive': True})
+
+        self.assertTrue(result['success'])
+        self.assertIn('extractive', result['metadata'])
+        self.assertLess(result['metadata']['extractive']['reduced_tokens'],
+                        result['metadata']['extractive']['original_tokens'])
+
+if __name__ == '__main__':
+    unittest.main()
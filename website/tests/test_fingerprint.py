@@ -0,0 +1,66 @@
+"""
+Tests for the Content Fingerprinting Module
+"""
+
+import unittest
+import sys
+import os
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.fingerprint import simhash, similarity, hamming_distance, max_distance_for, lsh_bands
+
+ARTICLE = (
+    "The city council approved a new transit budget on Tuesday after a lengthy debate. "
+    "The plan adds bus routes to the eastern suburbs and extends light rail service hours. "
+    "Council members said the funding would come from a combination of provincial grants "
+    "and a small increase in parking fees downtown. Critics argued the fee increase would "
+    "hurt local businesses, while supporters pointed to rising ridership since the pandemic. "
+    "The mayor said construction on the first new routes could begin as early as next spring, "
+    "pending a final environmental review and public consultation sessions in each ward."
+)
+
+OTHER_ARTICLE = (
+    "A local bakery won the national bread competition this weekend with a sourdough recipe "
+    "passed down through three generations. The owners thanked their customers and staff "
+    "and said the prize money would go towards a second oven and training for apprentices. "
+    "Judges praised the crust and the open crumb, noting the loaf had been fermented for "
+    "almost two days. The bakery expects long lines on Saturday morning and plans to open "
+    "an hour earlier for the rest of the month to keep up with demand from new visitors."
+)
+
+class TestFingerprint(unittest.TestCase):
+    """Test cases for SimHash fingerprints and LSH bands"""
+
+    def test_syndicated_copy_is_similar(self):
+        """Test that a copy with a byline, trailing ad text and different spacing stays within the threshold"""
+        copy = "By Jane Smith\n\n" + ARTICLE.replace(". ", ".  ").upper() + " Subscribe today!"
+        distance = hamming_distance(simhash(ARTICLE), simhash(copy))
+        self.assertLessEqual(distance, max_distance_for(0.9))
+
+    def test_different_articles_are_not_similar(self):
+        """Test that unrelated articles are far apart"""
+        self.assertLess(similarity(simhash(ARTICLE), simhash(OTHER_ARTICLE)), 0.8)
+
+    def test_normalization(self):
+        """Test that case, punctuation and whitespace do not change the fingerprint"""
+        self.assertEqual(simhash(ARTICLE), simhash(ARTICLE.lower().replace(",", "").replace(" ", "\n")))
+
+    def test_short_content_has_no_fingerprint(self):
+        """Test that content too short to compare reliably is not fingerprinted"""
+        self.assertIsNone(simhash("Breaking: council approves budget."))
+
+    def test_bands_catch_close_fingerprints(self):
+        """Test that fingerprints within the allowed distance share a band"""
+        max_distance = max_distance_for(0.95)
+        self.assertEqual(max_distance, 3)
+        fingerprint = simhash(ARTICLE)
+        # Flip bits spread over the fingerprint
+        close = fingerprint ^ (1 << 2) ^ (1 << 30) ^ (1 << 60)
+        bands = set(lsh_bands(fingerprint, max_distance + 1))
+        self.assertTrue(bands & set(lsh_bands(close, max_distance + 1)))
+        self.assertEqual(len(bands), max_distance + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Tests for the Consistent Hashing Module
+"""
+
+import unittest
+import sys
+import os
+from collections import Counter
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.hash_ring import HashRing
+
+KEYS = [f"summary:{i}" for i in range(10000)]
+
+class TestHashRing(unittest.TestCase):
+    """Test cases for the HashRing class"""
+
+    def test_keys_spread_evenly(self):
+        """Test that virtual nodes give every node a similar share of keys"""
+        ring = HashRing(['a:6379/0', 'b:6379/0', 'c:6379/0'])
+        shares = Counter(ring.node_for(key) for key in KEYS)
+        self.assertEqual(set(shares), set(ring.nodes))
+        for count in shares.values():
+            self.assertAlmostEqual(count / len(KEYS), 1 / 3, delta=0.05)
+
+    def test_adding_a_node_moves_few_keys(self):
+        """Test that only keys taken over by a new node change nodes"""
+        ring = HashRing(['a:6379/0', 'b:6379/0', 'c:6379/0'])
+        before = {key: ring.node_for(key) for key in KEYS}
+        ring.add('d:6379/0')
+        moved = [key for key in KEYS if ring.node_for(key) != before[key]]
+
+        self.assertAlmostEqual(len(moved) / len(KEYS), 1 / 4, delta=0.05)
+        self.assertTrue(all(ring.node_for(key) == 'd:6379/0' for key in moved))
+
+    def test_removing_a_node_restores_mapping(self):
+        """Test that keys of the other nodes stay put when a node leaves"""
+        ring = HashRing(['a:6379/0', 'b:6379/0', 'c:6379/0'])
+        before = {key: ring.node_for(key) for key in KEYS}
+        ring.remove('c:6379/0')
+        for key in KEYS:
+            if before[key] != 'c:6379/0':
+                self.assertEqual(ring.node_for(key), before[key])
+
+        ring.add('c:6379/0')
+        self.assertEqual({key: ring.node_for(key) for key in KEYS}, before)
+
+    def test_empty_ring(self):
+        """Test that an empty ring has no node for any key"""
+        self.assertIsNone(HashRing().node_for('summary:1'))
+
+if __name__ == '__main__':
+    unittest.main()
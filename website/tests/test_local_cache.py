@@ -0,0 +1,70 @@
+"""
+Tests for the In-Process Cache Module
+"""
+
+import unittest
+import sys
+import os
+import time
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.local_cache import LocalCache, value_size
+
+class TestLocalCache(unittest.TestCase):
+    """Test cases for the LocalCache class"""
+
+    def test_get_and_set(self):
+        """Test that stored values are returned and counted as hits"""
+        cache = LocalCache(max_bytes=1024, ttl=60)
+        cache.set('summary:a', '{"summary": "A"}')
+
+        self.assertEqual(cache.get('summary:a'), '{"summary": "A"}')
+        self.assertIsNone(cache.get('summary:b'))
+        self.assertEqual(cache.get_many(['summary:b', 'summary:a']), [None, '{"summary": "A"}'])
+
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 2))
+
+    def test_bounded_by_bytes(self):
+        """Test that the least recently used values are evicted past the byte limit"""
+        cache = LocalCache(max_bytes=250, ttl=60)
+        for key in 'abc':
+            cache.set(key, key * 100)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), 'c' * 100)
+        self.assertLessEqual(cache.get_stats()['bytes'], 250)
+
+    def test_sizes_are_in_bytes(self):
+        """Test that multi-byte characters count by their encoded size"""
+        self.assertEqual(value_size('é'), 2)
+        self.assertEqual(value_size(b'ab'), 2)
+
+    def test_oversized_value_is_skipped(self):
+        """Test that a value larger than the whole cache is not stored"""
+        cache = LocalCache(max_bytes=10, ttl=60)
+        cache.set('big', 'x' * 11)
+        self.assertIsNone(cache.get('big'))
+
+    def test_entries_expire(self):
+        """Test that entries are dropped after the TTL"""
+        cache = LocalCache(max_bytes=1024, ttl=0.05)
+        cache.set('summary:a', 'A')
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('summary:a'))
+
+    def test_delete_and_disable(self):
+        """Test invalidation and a disabled cache"""
+        cache = LocalCache(max_bytes=1024, ttl=60)
+        cache.set('summary:a', 'A')
+        cache.delete('summary:a')
+        self.assertIsNone(cache.get('summary:a'))
+
+        disabled = LocalCache(max_bytes=0)
+        disabled.set('summary:a', 'A')
+        self.assertIsNone(disabled.get('summary:a'))
+
+if __name__ == '__main__':
+    unittest.main()
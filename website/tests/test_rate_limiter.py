@@ -0,0 +1,133 @@
+"""
+Tests for the Rate Limiting Module
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.rate_limiter import (
+    AdaptiveRateLimiter, RateLimitExceeded, is_throttling_error, get_rate_limiter,
+    PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+)
+from website.summarizer import SummaryEngine, StubBackend
+
+class ResourceExhausted(Exception):
+    """Stand-in for google.api_core.exceptions.ResourceExhausted"""
+    code = 429
+
+class ThrottledBackend(StubBackend):
+    """Stub backend that reports throttling for every call"""
+
+    def generate(self, prompt, generation_config, timeout=None):
+        raise ResourceExhausted("Quota exceeded")
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """Test cases for the AdaptiveRateLimiter class"""
+
+    def test_throttling_errors(self):
+        """Test detection of provider throttling errors"""
+        self.assertTrue(is_throttling_error(ResourceExhausted("quota")))
+        self.assertFalse(is_throttling_error(ValueError("bad input")))
+        self.assertFalse(is_throttling_error(None))
+
+    def test_bucket_limits_rate(self):
+        """Test that calls beyond the burst wait for the bucket to refill"""
+        limiter = AdaptiveRateLimiter(requests_per_minute=600, burst=2, max_concurrency=10,
+                                      interactive_reserve=0)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire(PRIORITY_INTERACTIVE)
+            limiter.release()
+        # The third call waits roughly 1/10 of a second for a token
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_rejects_after_max_wait(self):
+        """Test that a call is rejected when it cannot be admitted in time"""
+        limiter = AdaptiveRateLimiter(max_concurrency=1, interactive_reserve=0)
+        limiter.acquire(PRIORITY_INTERACTIVE)
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire(PRIORITY_INTERACTIVE, timeout=0.05)
+        self.assertEqual(limiter.stats['rejected'], 1)
+
+    def test_throttling_halves_limit_once(self):
+        """Test multiplicative decrease with a cooldown between decreases"""
+        limiter = AdaptiveRateLimiter(max_concurrency=8, decrease_cooldown=60)
+        for _ in range(3):
+            limiter.acquire(PRIORITY_INTERACTIVE)
+        for _ in range(3):
+            limiter.release(throttled=True)
+        self.assertEqual(limiter.concurrency_limit, 4)
+        self.assertEqual(limiter.stats['throttled'], 3)
+
+    def test_success_grows_limit(self):
+        """Test additive increase back towards the maximum"""
+        limiter = AdaptiveRateLimiter(requests_per_minute=60000, burst=100, max_concurrency=8)
+        limiter.concurrency_limit = 2.0
+        for _ in range(4):
+            limiter.acquire(PRIORITY_INTERACTIVE)
+            limiter.release()
+        self.assertGreater(limiter.concurrency_limit, 3)
+        self.assertLessEqual(limiter.concurrency_limit, 8)
+
+    def test_background_leaves_reserved_slots(self):
+        """Test that background calls cannot take the slots reserved for interactive calls"""
+        limiter = AdaptiveRateLimiter(burst=100, max_concurrency=4, interactive_reserve=0.5)
+        limiter.acquire(PRIORITY_BACKGROUND)
+        limiter.acquire(PRIORITY_BACKGROUND)
+        with self.assertRaises(RateLimitExceeded):
+            limiter.acquire(PRIORITY_BACKGROUND, timeout=0.05)
+
+        # Interactive calls still get through
+        limiter.acquire(PRIORITY_INTERACTIVE, timeout=0.05)
+        limiter.acquire(PRIORITY_INTERACTIVE, timeout=0.05)
+        self.assertEqual(limiter.in_flight, 4)
+
+    def test_interactive_admitted_first(self):
+        """Test that a waiting interactive call is admitted before waiting background calls"""
+        limiter = AdaptiveRateLimiter(burst=100, max_concurrency=1, interactive_reserve=0)
+        limiter.acquire(PRIORITY_BACKGROUND)
+        order = []
+
+        def call(priority):
+            limiter.acquire(priority, timeout=5)
+            order.append(priority)
+            time.sleep(0.02)
+            limiter.release()
+
+        background = threading.Thread(target=call, args=(PRIORITY_BACKGROUND,))
+        background.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=call, args=(PRIORITY_INTERACTIVE,))
+        interactive.start()
+        time.sleep(0.05)
+
+        limiter.release()
+        background.join()
+        interactive.join()
+        self.assertEqual(order, [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND])
+
+    def test_shared_per_api_key(self):
+        """Test that callers with the same API key share one limiter"""
+        self.assertIs(get_rate_limiter('key-a'), get_rate_limiter('key-a'))
+        self.assertIsNot(get_rate_limiter('key-a'), get_rate_limiter('key-b'))
+
+    def test_engine_reports_throttling(self):
+        """Test that throttled model calls lower the engine's concurrency limit"""
+        limiter = AdaptiveRateLimiter(max_concurrency=8)
+        engine = SummaryEngine(ThrottledBackend(), limiter=limiter)
+
+        with self.assertRaises(ResourceExhausted):
+            engine.generate("Summarize:\n\nSome text.")
+
+        self.assertEqual(limiter.concurrency_limit, 4)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertIn('rate_limiter', engine.get_stats())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Tests for the Retry and Hedging Module
+"""
+
+import unittest
+import sys
+import os
+import time
+from unittest.mock import patch
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.retry_policy import RetryPolicy, HedgePolicy, LatencyTracker, is_retryable_error
+from website.summarizer import SummaryEngine, StubBackend
+from website.circuit_breaker import CircuitBreaker
+
+PROMPT = "Summarize:\n\nThe council approved the budget. Transit funding rises."
+
+class ServiceUnavailable(Exception):
+    """Stand-in for google.api_core.exceptions.ServiceUnavailable"""
+    code = 503
+
+class InvalidArgument(Exception):
+    """Stand-in for google.api_core.exceptions.InvalidArgument"""
+    code = 400
+
+class FakeClock:
+    """Stand-in for the time module whose sleeps advance a counter, overshooting by `overshoot`"""
+
+    def __init__(self, overshoot=0.0):
+        self.now = 0.0
+        self.overshoot = overshoot
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds + self.overshoot
+
+class FailingFirstBackend(StubBackend):
+    """Stub backend whose first `failures` calls raise the given error"""
+
+    def __init__(self, error, failures, clock=None, latency=0.0):
+        super().__init__()
+        self.error = error
+        self.failures = failures
+        self.attempts = 0
+        self.clock = clock
+        self.call_latency = latency
+
+    def generate(self, prompt, generation_config, timeout=None):
+        with self._lock:
+            self.attempts += 1
+            fail = self.attempts <= self.failures
+        if self.clock is not None:
+            self.clock.now += self.call_latency
+        if fail:
+            raise self.error
+        return super().generate(prompt, generation_config, timeout)
+
+class FirstCallSlowBackend(StubBackend):
+    """Stub backend whose first call hangs, later calls answer at once"""
+
+    def __init__(self, slow_latency):
+        super().__init__()
+        self.slow_latency = slow_latency
+        self.started = 0
+
+    def generate(self, prompt, generation_config, timeout=None):
+        with self._lock:
+            self.started += 1
+            first = self.started == 1
+        if first:
+            time.sleep(self.slow_latency)
+        return super().generate(prompt, generation_config, timeout)
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02, deadline=5)
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for retry classification and backoff"""
+
+    def test_retryable_errors(self):
+        """Test which errors are worth retrying"""
+        self.assertTrue(is_retryable_error(ServiceUnavailable("down")))
+        self.assertTrue(is_retryable_error(TimeoutError("slow")))
+        self.assertTrue(is_retryable_error(RuntimeError("connection reset")))
+        self.assertFalse(is_retryable_error(InvalidArgument("bad prompt")))
+        self.assertFalse(is_retryable_error(ValueError("response blocked")))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that backoff stays under the exponential ceiling"""
+        policy = RetryPolicy(base_delay=0.5, max_delay=2)
+        delays = [policy.backoff(attempt) for attempt in range(1, 6) for _ in range(20)]
+        self.assertTrue(all(0 <= delay <= 2 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+        self.assertTrue(all(policy.backoff(1) <= 0.5 for _ in range(20)))
+
+    def test_latency_percentile(self):
+        """Test the rolling latency percentile"""
+        tracker = LatencyTracker(window=100, min_samples=10)
+        self.assertIsNone(tracker.percentile(95))
+        for i in range(100):
+            tracker.record(i / 100)
+        self.assertAlmostEqual(tracker.percentile(95), 0.95)
+
+class TestEngineRetries(unittest.TestCase):
+    """Test cases for retries and hedging in the summarization engine"""
+
+    def test_transient_failure_is_retried(self):
+        """Test that a transient failure is retried and the call succeeds"""
+        backend = FailingFirstBackend(ServiceUnavailable("down"), failures=2)
+        engine = SummaryEngine(backend, retry_policy=FAST_RETRIES)
+
+        self.assertTrue(engine.generate(PROMPT))
+        self.assertEqual(backend.attempts, 3)
+        self.assertEqual(engine.get_stats()['retries'], 2)
+
+    def test_permanent_failure_is_not_retried(self):
+        """Test that a rejected request fails on the first attempt"""
+        backend = FailingFirstBackend(InvalidArgument("bad prompt"), failures=5)
+        engine = SummaryEngine(backend, retry_policy=FAST_RETRIES)
+
+        with self.assertRaises(InvalidArgument):
+            engine.generate(PROMPT)
+        self.assertEqual(backend.attempts, 1)
+
+    def test_deadline_stops_retries(self):
+        """Test that no attempt is started once the deadline has passed and the last model error is raised"""
+        # Each attempt takes 0.25s and each 0.15s backoff oversleeps by 0.1s, so
+        # the second backoff ends exactly at the deadline
+        clock = FakeClock(overshoot=0.1)
+        backend = FailingFirstBackend(ServiceUnavailable("down"), failures=100, clock=clock, latency=0.25)
+        policy = RetryPolicy(max_attempts=100, deadline=1.0)
+        breaker = CircuitBreaker(failure_threshold=100)
+        engine = SummaryEngine(backend, retry_policy=policy, breaker=breaker)
+
+        with patch('website.summarizer.time', clock), patch('website.retry_policy.time', clock), \
+                patch.object(policy, 'backoff', return_value=0.15):
+            with self.assertRaises(ServiceUnavailable):
+                engine.generate(PROMPT)
+        self.assertEqual(backend.attempts, 2)
+        self.assertEqual(engine.get_stats()['errors'], backend.attempts)
+        self.assertEqual(breaker.consecutive_failures, backend.attempts)
+
+    def test_stream_retries_before_first_piece(self):
+        """Test that a stream failing before any output is retried"""
+        backend = FailingFirstBackend(ServiceUnavailable("down"), failures=1)
+        engine = SummaryEngine(backend, retry_policy=FAST_RETRIES)
+
+        events = list(engine.stream_summary("The council approved the budget.", 50, 'casual'))
+        self.assertEqual(events[-1][0], 'complete')
+        self.assertEqual(backend.attempts, 2)
+
+    def test_slow_call_is_hedged(self):
+        """Test that a call running past the hedge delay is duplicated and the faster answer wins"""
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(0.05)
+        hedge_policy = HedgePolicy(enabled=True, min_delay=0.05, tracker=tracker)
+        backend = FirstCallSlowBackend(slow_latency=1.0)
+        engine = SummaryEngine(backend, hedge_policy=hedge_policy)
+
+        start = time.monotonic()
+        self.assertTrue(engine.generate(PROMPT))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        stats = engine.get_stats()
+        self.assertEqual(stats['hedges'], 1)
+        self.assertEqual(stats['hedge_wins'], 1)
+
+    def test_no_hedging_without_history(self):
+        """Test that calls are not hedged before enough latencies are known"""
+        hedge_policy = HedgePolicy(enabled=True, tracker=LatencyTracker(min_samples=5))
+        engine = SummaryEngine(StubBackend(), hedge_policy=hedge_policy)
+
+        engine.generate(PROMPT)
+        self.assertEqual(engine.get_stats()['hedges'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
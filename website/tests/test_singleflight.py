@@ -0,0 +1,150 @@
+"""
+Tests for the Request Coalescing Module
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.singleflight import SingleFlight
+
+class FakeLockStore:
+    """In-memory stand-in for the lock methods of SummaryCache"""
+
+    def __init__(self):
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def acquire_lock(self, name, token, ttl):
+        with self.lock:
+            if name in self.locks:
+                return False
+            self.locks[name] = token
+            return True
+
+    def release_lock(self, name, token):
+        with self.lock:
+            if self.locks.get(name) == token:
+                del self.locks[name]
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for the SingleFlight class"""
+
+    def run_concurrently(self, flight, key, fn, count, fetch_result=None):
+        """Call flight.do from several threads at once and collect the results"""
+        results = []
+        barrier = threading.Barrier(count)
+
+        def worker():
+            barrier.wait()
+            results.append(flight.do(key, fn, fetch_result))
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_run_once(self):
+        """Test that concurrent callers with the same key share one execution"""
+        calls = []
+
+        def generate():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'summary': 'shared'}
+
+        flight = SingleFlight()
+        results = self.run_concurrently(flight, 'summary:abc', generate, 5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'summary': 'shared'}] * 5)
+        self.assertEqual(flight.stats['coalesced'], 4)
+
+    def test_different_keys_run_separately(self):
+        """Test that different keys are not coalesced"""
+        flight = SingleFlight()
+        self.assertEqual(flight.do('a', lambda: 1), 1)
+        self.assertEqual(flight.do('b', lambda: 2), 2)
+        self.assertEqual(flight.stats['executions'], 2)
+
+    def test_errors_reach_every_waiter(self):
+        """Test that a failed leader call raises for all waiters"""
+        def generate():
+            time.sleep(0.1)
+            raise RuntimeError("model failed")
+
+        flight = SingleFlight()
+        errors = []
+        barrier = threading.Barrier(3)
+
+        def worker():
+            barrier.wait()
+            try:
+                flight.do('key', generate)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, ['model failed'] * 3)
+
+        # The key is released after a failure so later calls can retry
+        self.assertEqual(flight.do('key', lambda: 'ok'), 'ok')
+
+    def test_waits_for_other_process(self):
+        """Test that a caller picks up the result written by the lock holder"""
+        store = FakeLockStore()
+        store.locks['key'] = 'other-process'
+        cache = {}
+
+        def other_process_finishes():
+            time.sleep(0.2)
+            cache['key'] = 'remote result'
+            store.release_lock('key', 'other-process')
+
+        threading.Thread(target=other_process_finishes).start()
+
+        flight = SingleFlight(store, lock_ttl=5, poll_interval=0.02)
+        result = flight.do('key', lambda: 'local result', fetch_result=lambda: cache.get('key'))
+
+        self.assertEqual(result, 'remote result')
+        self.assertEqual(flight.stats['executions'], 0)
+        self.assertEqual(flight.stats['remote_hits'], 1)
+
+    def test_lock_is_released(self):
+        """Test that the cross-process lock is released after the call"""
+        store = FakeLockStore()
+        flight = SingleFlight(store)
+        flight.do('key', lambda: 'value')
+        self.assertEqual(store.locks, {})
+
+    def test_takes_over_abandoned_lock(self):
+        """Test that a caller generates the result itself once the holder's lock is gone"""
+        store = FakeLockStore()
+        store.locks['key'] = 'crashed-process'
+
+        def lock_expires():
+            time.sleep(0.1)
+            store.locks.pop('key')
+
+        threading.Thread(target=lock_expires).start()
+
+        flight = SingleFlight(store, lock_ttl=5, poll_interval=0.02)
+        result = flight.do('key', lambda: 'local result', fetch_result=lambda: None)
+
+        self.assertEqual(result, 'local result')
+        self.assertEqual(flight.stats['executions'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,313 @@
+"""
+Tests for the Summarization Engine Module
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website.summarizer import (
+    SummaryEngine,
+    StubBackend,
+    SummaryStreamParser,
+    ModelUnavailableError,
+    build_summary_prompt,
+    build_chunk_prompt,
+    batch_by_tokens,
+    build_variants_prompt,
+    parse_summary_response,
+    parse_variants_response
+)
+from website.retry_policy import RetryPolicy
+
+SAMPLE_CONTENT = (
+    "The city council approved a new budget on Tuesday. "
+    "The plan increases funding for public transit and parks. "
+    "Critics argue the budget relies on optimistic revenue forecasts. "
+    "Supporters say the investments will pay off within five years."
+)
+
+class TestResponseParsing(unittest.TestCase):
+    """Test cases for parsing model responses"""
+
+    def test_parse_full_response(self):
+        """Test parsing a well-formed response"""
+        text = "HEADLINE: Budget Passes\n\nCATEGORIES: Politics, News\n\nSUMMARY:\nThe council approved the budget."
+        result = parse_summary_response(text)
+
+        self.assertEqual(result['headline'], 'Budget Passes')
+        self.assertEqual(result['summary'], 'The council approved the budget.')
+        self.assertEqual(result['categories']['primary_category'], 'Politics')
+        self.assertEqual(result['categories']['secondary_category'], 'News')
+        self.assertEqual(result['categories']['confidence'], 90)
+
+    def test_parse_single_category(self):
+        """Test parsing a response with only one category"""
+        text = "HEADLINE: Budget Passes\n\nCATEGORIES: Politics\n\nSUMMARY:\nText."
+        result = parse_summary_response(text)
+        self.assertEqual(result['categories']['secondary_category'], 'general')
+
+    def test_parse_unstructured_response(self):
+        """Test that unstructured output is used as the summary"""
+        result = parse_summary_response("Just a plain summary.")
+
+        self.assertEqual(result['headline'], '')
+        self.assertEqual(result['summary'], 'Just a plain summary.')
+        self.assertEqual(result['categories']['primary_category'], 'general')
+        self.assertEqual(result['categories']['confidence'], 50)
+
+class TestSummaryEngine(unittest.TestCase):
+    """Test cases for the SummaryEngine class"""
+
+    def setUp(self):
+        """Set up an engine with the stub backend"""
+        self.backend = StubBackend()
+        self.engine = SummaryEngine(self.backend, timeout=5)
+
+    def test_prompts_include_parameters(self):
+        """Test that prompts carry the tone, length and content"""
+        prompt = build_summary_prompt(SAMPLE_CONTENT, 30, 'casual')
+        self.assertIn('casual summaries', prompt)
+        self.assertIn('approximately 30%', prompt)
+        self.assertTrue(prompt.endswith(SAMPLE_CONTENT))
+
+        chunk_prompt = build_chunk_prompt(SAMPLE_CONTENT, 'academic')
+        self.assertIn('academic tone', chunk_prompt)
+
+    def test_summarize_with_stub(self):
+        """Test a full summary through the stub backend"""
+        result = self.engine.summarize(SAMPLE_CONTENT, 50, 'professional')
+
+        self.assertTrue(result['headline'])
+        self.assertTrue(result['summary'])
+        self.assertIn(result['summary'].split('.')[0], SAMPLE_CONTENT)
+        self.assertEqual(result['categories']['primary_category'], 'General')
+
+    def test_stub_is_deterministic(self):
+        """Test that the stub backend returns the same output for the same prompt"""
+        first = self.engine.summarize(SAMPLE_CONTENT, 50, 'professional')
+        second = self.engine.summarize(SAMPLE_CONTENT, 50, 'professional')
+        self.assertEqual(first, second)
+
+    def test_reduce(self):
+        """Test combining chunk summaries"""
+        summaries = [self.engine.summarize_chunk(SAMPLE_CONTENT, 'professional') for _ in range(2)]
+        result = self.engine.reduce(summaries, 50, 'professional')
+        self.assertTrue(result['summary'])
+
+    def test_stats(self):
+        """Test instrumentation counters"""
+        self.engine.summarize(SAMPLE_CONTENT, 50, 'professional')
+        stats = self.engine.get_stats()
+
+        self.assertEqual(stats['calls'], 1)
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(stats['backend'], 'stub')
+        self.assertGreater(stats['prompt_chars'], len(SAMPLE_CONTENT))
+
+    def test_unavailable_backend(self):
+        """Test that an engine without a backend raises"""
+        engine = SummaryEngine(None)
+        self.assertFalse(engine.available)
+        with self.assertRaises(ModelUnavailableError):
+            engine.summarize(SAMPLE_CONTENT, 50, 'professional')
+
+    def test_backend_errors_are_counted(self):
+        """Test that backend failures propagate and are recorded"""
+        class FailingBackend:
+            name = 'failing'
+
+            def generate(self, prompt, generation_config, timeout=None):
+                raise RuntimeError("boom")
+
+        engine = SummaryEngine(FailingBackend(), retry_policy=RetryPolicy(max_attempts=1))
+        with self.assertRaises(RuntimeError):
+            engine.summarize(SAMPLE_CONTENT, 50, 'professional')
+        self.assertEqual(engine.get_stats()['errors'], 1)
+
+class TestChunkMap(unittest.TestCase):
+    """Test cases for concurrent chunk summarization"""
+
+    def test_order_is_preserved(self):
+        """Test that chunk summaries come back in document order"""
+        engine = SummaryEngine(StubBackend(), chunk_concurrency=4)
+        chunks = [f"Section number {i} describes topic {i}." for i in range(10)]
+
+        results = engine.summarize_chunks(chunks, 'professional')
+        self.assertEqual(results, [engine.summarize_chunk(chunk, 'professional') for chunk in chunks])
+
+    def test_chunks_run_concurrently(self):
+        """Test that latency scales with ceil(N/k) rather than N"""
+        engine = SummaryEngine(StubBackend(latency=0.1), chunk_concurrency=4)
+        chunks = [f"Section {i}." for i in range(8)]
+
+        start = time.perf_counter()
+        engine.summarize_chunks(chunks, 'professional')
+        elapsed = time.perf_counter() - start
+
+        # 8 chunks at concurrency 4 take two rounds, not eight
+        self.assertLess(elapsed, 0.6)
+
+    def test_failed_chunk_is_retried(self):
+        """Test that a failing chunk is retried without affecting the others"""
+        class FlakyBackend(StubBackend):
+            def __init__(self):
+                super().__init__()
+                self.failed = set()
+                self.flaky_lock = threading.Lock()
+
+            def generate(self, prompt, generation_config, timeout=None):
+                with self.flaky_lock:
+                    if 'flaky' in prompt and prompt not in self.failed:
+                        self.failed.add(prompt)
+                        raise RuntimeError("transient error")
+                return super().generate(prompt, generation_config, timeout)
+
+        engine = SummaryEngine(FlakyBackend(), chunk_concurrency=2, chunk_attempts=2)
+        results = engine.summarize_chunks(["First chunk.", "A flaky chunk.", "Last chunk."], 'casual')
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(results))
+        self.assertIn('flaky', results[1])
+
+    def test_chunk_failure_returns_none(self):
+        """Test that a chunk failing every attempt yields None in its slot"""
+        class BrokenBackend(StubBackend):
+            def generate(self, prompt, generation_config, timeout=None):
+                if 'broken' in prompt:
+                    raise RuntimeError("permanent error")
+                return super().generate(prompt, generation_config, timeout)
+
+        engine = SummaryEngine(BrokenBackend(), chunk_attempts=1)
+        results = engine.summarize_chunks(["Good chunk.", "A broken chunk."], 'casual')
+
+        self.assertIsNotNone(results[0])
+        self.assertIsNone(results[1])
+
+class TestTreeReduce(unittest.TestCase):
+    """Test cases for the hierarchical reduce"""
+
+    def test_batches_fit_budget(self):
+        """Test that batches respect the token budget"""
+        summaries = ["x" * 400] * 10  # 100 tokens each
+        batches = batch_by_tokens(summaries, 300)
+
+        self.assertEqual(sum(len(batch) for batch in batches), 10)
+        self.assertTrue(all(len(batch) == 3 for batch in batches[:-1]))
+
+    def test_batches_hold_at_least_two(self):
+        """Test that oversized summaries are still paired so each level shrinks"""
+        summaries = ["x" * 4000] * 5  # 1000 tokens each, over the budget
+        batches = batch_by_tokens(summaries, 500)
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+    def test_small_input_uses_single_reduce(self):
+        """Test that summaries within the budget need only the final call"""
+        backend = StubBackend()
+        engine = SummaryEngine(backend)
+        engine.reduce(["First section.", "Second section."], 50, 'professional', token_budget=1000)
+        self.assertEqual(backend.calls, 1)
+
+    def test_large_input_reduces_in_levels(self):
+        """Test that many summaries are condensed level by level before the final call"""
+        backend = StubBackend()
+        engine = SummaryEngine(backend, chunk_concurrency=4)
+        summaries = [f"Section {i} reports that revenue grew by {i} percent. " * 20 for i in range(32)]
+
+        result = engine.reduce(summaries, 50, 'professional', token_budget=1000)
+
+        self.assertTrue(result['summary'])
+        self.assertGreater(backend.calls, 1)
+        self.assertLess(backend.calls, len(summaries))
+
+class TestVariants(unittest.TestCase):
+    """Test cases for several tone/length versions in one model call"""
+
+    def test_variants_prompt_sends_content_once(self):
+        """Test that the prompt lists every version and contains the content once"""
+        prompt = build_variants_prompt(SAMPLE_CONTENT, [(30, 'casual'), (70, 'academic')])
+
+        self.assertIn("VERSION 1: casual tone, approximately 30%", prompt)
+        self.assertIn("VERSION 2: academic tone, approximately 70%", prompt)
+        self.assertEqual(prompt.count(SAMPLE_CONTENT), 1)
+
+    def test_parse_variants(self):
+        """Test splitting a multi-version response, with shared categories"""
+        response = (
+            "CATEGORIES: Politics, News\n\n"
+            "=== VERSION 1 ===\nHEADLINE: Budget passes\n\nSUMMARY:\nThe council approved it.\n\n"
+            "=== VERSION 2 ===\nHEADLINE: A detailed look\n\nSUMMARY:\nThe council approved the budget."
+        )
+        results = parse_variants_response(response, 2)
+
+        self.assertEqual(results[0]['headline'], 'Budget passes')
+        self.assertEqual(results[1]['summary'], 'The council approved the budget.')
+        self.assertEqual(results[1]['categories']['primary_category'], 'Politics')
+
+    def test_missing_version_is_none(self):
+        """Test that versions left out of the response come back as None"""
+        response = "=== VERSION 2 ===\nHEADLINE: Only two\n\nSUMMARY:\nText."
+        results = parse_variants_response(response, 3)
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1]['headline'], 'Only two')
+        self.assertIsNone(results[2])
+
+    def test_engine_makes_one_call(self):
+        """Test that all versions are generated by a single model call"""
+        backend = StubBackend()
+        engine = SummaryEngine(backend)
+        results = engine.summarize_variants(SAMPLE_CONTENT, [(20, 'casual'), (80, 'academic'), (50, 'friendly')])
+
+        self.assertEqual(backend.calls, 1)
+        self.assertTrue(all(results))
+        self.assertLess(len(results[0]['summary']), len(results[1]['summary']))
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for streamed summaries"""
+
+    RESPONSE = "HEADLINE: Budget Passes After Long Debate\n\nCATEGORIES: Politics, News\n\nSUMMARY:\nThe council approved the budget on Tuesday."
+
+    def collect(self, pieces):
+        """Feed pieces to a parser and join the deltas per field"""
+        parser = SummaryStreamParser()
+        fields = {'headline': '', 'summary': ''}
+        for piece in pieces:
+            for field, text in parser.feed(piece):
+                fields[field] += text
+        return fields
+
+    def test_parser_matches_full_parse(self):
+        """Test that deltas add up to the parsed sections for any split"""
+        expected = parse_summary_response(self.RESPONSE)
+        for size in (1, 2, 3, 7, 50):
+            pieces = [self.RESPONSE[i:i + size] for i in range(0, len(self.RESPONSE), size)]
+            fields = self.collect(pieces)
+            self.assertEqual(fields['headline'], expected['headline'])
+            self.assertEqual(fields['summary'], expected['summary'])
+
+    def test_headline_arrives_before_summary(self):
+        """Test that headline text is emitted as soon as it is received"""
+        parser = SummaryStreamParser()
+        self.assertEqual(parser.feed("HEADLINE: Budget "), [('headline', 'Budget')])
+        self.assertEqual(parser.feed("Passes\n"), [('headline', ' Passes')])
+        self.assertEqual(parser.feed("\nCATEGORIES: Politics"), [])
+
+    def test_stream_summary_events(self):
+        """Test that the engine streams deltas and finishes with the parsed result"""
+        engine = SummaryEngine(StubBackend())
+        events = list(engine.stream_summary(SAMPLE_CONTENT, 50, 'professional'))
+
+        self.assertEqual(events[-1][0], 'complete')
+        self.assertEqual(events[-1][1], engine.summarize(SAMPLE_CONTENT, 50, 'professional'))
+
+        streamed_summary = ''.join(text for field, text in events if field == 'summary')
+        self.assertEqual(streamed_summary, events[-1][1]['summary'])
+        self.assertGreater(len([field for field, _ in events if field == 'summary']), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for the Summary Archive Module
+"""
+
+import unittest
+import sys
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Add the parent directory to sys.path to allow imports from the website package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from website import create_app, db
+from website.cache import SummaryCache
+from website.cache_backends import MemoryStore
+from website.content_processor import as_envelope
+from website.models import ArchivedSummary, SavedSummary
+from website.summary_archive import SummaryArchive
+
+ARTICLE = (
+    "The city council approved a new transit budget on Tuesday after a lengthy debate. "
+    "The plan adds bus routes to the eastern suburbs and extends light rail service hours. "
+    "Council members said the funding would come from a combination of provincial grants "
+    "and a small increase in parking fees downtown. Critics argued the fee increase would "
+    "hurt local businesses, while supporters pointed to rising ridership since the pandemic."
+)
+SUMMARY = {'headline': 'Council approves budget', 'summary': 'Council approves transit budget.', 'cached': False}
+
+class TestSummaryArchive(unittest.TestCase):
+    """Test cases for the SummaryArchive class and the cache reading through it"""
+
+    def setUp(self):
+        """Set up test app and database"""
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+            'SQLALCHEMY_TRACK_MODIFICATIONS': False
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.archive = SummaryArchive(self.app)
+
+    def tearDown(self):
+        """Clean up after tests"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def create_cache(self):
+        cache = SummaryCache(MemoryStore())
+        cache.model_version = '1:test-model'
+        cache.archive = self.archive
+        return cache
+
+    def test_save_and_get(self):
+        """Test that a summary is found under its full key only"""
+        self.assertTrue(self.archive.save('abc', [(50, 'professional', SUMMARY)], '1:test-model', 0, 2.5))
+        summary_data, compute_time = self.archive.get('abc', 50, 'professional', '1:test-model', 0)
+        self.assertEqual(summary_data['summary'], SUMMARY['summary'])
+        self.assertEqual(compute_time, 2.5)
+
+        self.assertIsNone(self.archive.get('abc', 25, 'professional', '1:test-model', 0))
+        self.assertIsNone(self.archive.get('abc', 50, 'professional', '2:test-model', 0))
+        self.assertIsNone(self.archive.get('abc', 50, 'professional', '1:test-model', 1))
+
+    def test_save_replaces(self):
+        """Test that archiving a key again replaces its summary"""
+        self.archive.save('abc', [(50, 'professional', SUMMARY)], '1:test-model', 0)
+        self.archive.save('abc', [(50, 'professional', dict(SUMMARY, summary='Budget passes.'))], '1:test-model', 0)
+        self.assertEqual(ArchivedSummary.query.count(), 1)
+        self.assertEqual(self.archive.get('abc', 50, 'professional', '1:test-model', 0)[0]['summary'], 'Budget passes.')
+
+    def test_purge(self):
+        """Test that summaries not written for max_age are deleted every purge_interval writes"""
+        self.archive.purge_interval = 2
+        self.archive.save('old', [(50, 'professional', SUMMARY)], '1:test-model', 0)
+        ArchivedSummary.query.update({'updated_at': datetime.now(timezone.utc) - timedelta(days=31)})
+        db.session.commit()
+
+        self.archive.save('new', [(50, 'professional', SUMMARY)], '1:test-model', 0)
+        self.assertIsNone(self.archive.get('old', 50, 'professional', '1:test-model', 0))
+        self.assertIsNotNone(self.archive.get('new', 50, 'professional', '1:test-model', 0))
+
+    def test_store_miss_reads_archive(self):
+        """Test that a summary lost from the store is served from the archive and written back"""
+        self.create_cache().cache_summary(ARTICLE, 50, 'professional', SUMMARY, compute_time=1.0)
+
+        # A new store, as after a Redis restart; spacing does not change the key
+        cache = self.create_cache()
+        cached_result = cache.get_cached_summary("  " + ARTICLE.replace(". ", ".\n"), 50, 'professional')
+        self.assertEqual(cached_result['summary'], SUMMARY['summary'])
+        self.assertTrue(cached_result['cached'])
+        self.assertIsNotNone(cache.store.get(cache.generate_cache_key(ARTICLE, 50, 'professional')))
+        self.assertIsNone(cache.get_cached_variants(ARTICLE, [(50, 'professional'), (25, 'casual')])[1])
+        self.assertIsNone(self.create_cache().get_cached_summary(ARTICLE, 50, 'professional', use_archive=False))
+
+    def test_saved_summary_is_served(self):
+        """Test that a summary saved unedited is served when nothing is archived"""
+        key_hash = as_envelope(ARTICLE).key_hash
+        db.session.add(SavedSummary(headline='Council approves budget', summary='Saved summary.', tags='politics',
+                                    tone='professional', length=50, key_hash=key_hash))
+        db.session.commit()
+
+        cached_result = self.create_cache().get_cached_summary(ARTICLE, 50, 'professional')
+        self.assertEqual(cached_result['summary'], 'Saved summary.')
+        self.assertEqual(cached_result['metadata']['categories'], ['politics'])
+        self.assertIsNone(self.archive.get(key_hash, 25, 'professional', '1:test-model', 0))
+
+    def test_invalidate_skips_archive(self):
+        """Test that summaries archived before an invalidation are not read, without deleting them"""
+        cache = self.create_cache()
+        cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        self.assertTrue(cache.invalidate('summary'))
+        self.assertEqual(ArchivedSummary.query.count(), 1)
+        self.assertIsNone(cache.get_cached_summary(ARTICLE, 50, 'professional'))
+
+    def test_generation_survives_store_restart(self):
+        """Test that a worker puts back a generation counter lost with the store"""
+        cache = self.create_cache()
+        cache.generation_ttl = 0
+        cache.cache_summary(ARTICLE, 50, 'professional', SUMMARY)
+        cache.invalidate('summary')
+
+        # The store restarts empty while the worker keeps running
+        cache.store = MemoryStore()
+        self.assertEqual(cache.get_generation('summary'), 1)
+        self.assertEqual(cache.store.get('generation:summary'), b'1')
+        self.assertIsNone(cache.get_cached_summary(ARTICLE, 50, 'professional'))
+
+    def test_outside_app_context(self):
+        """Test that background threads use the app the archive was initialized with"""
+        self.archive.save('abc', [(50, 'professional', SUMMARY)], '1:test-model', 0)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.archive.get('abc', 50, 'professional', '1:test-model', 0)))
+        thread.start()
+        thread.join()
+        self.assertEqual(results[0][0]['headline'], SUMMARY['headline'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,14 +4,19 @@ from email.mime.text import MIMEText
 import random
 import smtplib
 import uuid
-from flask import Blueprint, current_app, render_template, request, flash, jsonify, redirect, session, url_for
+from flask import Blueprint, current_app, render_template, request, flash, jsonify, redirect, session, url_for, Response, stream_with_context
 from flask_login import login_required, current_user
 from .models import Note, User, ScheduledPost, SavedSummary, FavoriteSummary, Subscriber, Article, FavoriteArticle, SavedTemplate
 from . import db
-from .cache import redis_cache
-from .content_processor import process_content, preprocess_for_gemini
+from .cache import summary_cache
+from .summary_archive import summary_archive
+from .content_processor import process_content, preprocess_for_gemini, as_envelope
 from .content_filter import filter_content
-from .async_processor import async_processor, compress_content, decompress_content, chunk_content
+from .async_processor import async_processor, batch_processor, chunk_content
+from .summarizer import summary_engine, CircuitOpenError, MAX_VARIANTS
+from .rate_limiter import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from .singleflight import SingleFlight
+from .extractive import EXTRACTIVE_ENABLED, fallback_summary, split_sentences
 import json
 import requests
 import markdown
@@ -21,8 +26,8 @@ from cryptography.fernet import Fernet
 import base64
 import os
 from os import environ
-import google.generativeai as genai
 import time
+import threading
 import hmac
 import hashlib
 from werkzeug.utils import secure_filename
@@ -31,6 +36,7 @@ from .models import db, SavedContent
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 from flask_mail import Message
 from sqlalchemy import func, extract
 from flask import current_app
@@ -42,17 +48,6 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Gemini API initialization
-try:
-    # Initialize Gemini API client
-    genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-    # Set up the model
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    print("Gemini API initialized successfully")
-except Exception as e:
-    print(f"Error initializing Gemini API: {str(e)}")
-    model = None
-
 # For API key encryption (in production, use a proper key management system)
 # This is a simple implementation for demonstration purposes
 def get_encryption_key():
@@ -72,6 +67,25 @@ def decrypt_api_key(encrypted_key):
 # views blueprint
 views = Blueprint("views", __name__)
 
+# Coalesces identical in-flight summary requests, across workers through the cache store
+summary_coalescer = SingleFlight(summary_cache, lock_ttl=int(os.getenv('SUMMARY_COALESCE_TTL', 60)))
+
+# Background refreshes of cached summaries run on their own small pool and are
+# dropped while it is busy, so they never queue ahead of or crowd out user requests
+REFRESH_CONCURRENCY = int(os.getenv('SUMMARY_REFRESH_CONCURRENCY', 2))
+refresh_executor = ThreadPoolExecutor(max_workers=REFRESH_CONCURRENCY)
+refresh_slots = threading.BoundedSemaphore(REFRESH_CONCURRENCY)
+
+# Summaries cached from another prompt or model version are not served
+summary_cache.model_version = summary_engine.version
+
+# Store misses are looked up in the database archive before the model is called
+summary_cache.archive = summary_archive
+
+# Batch summarization limits
+BATCH_MAX_ITEMS = int(os.getenv('SUMMARY_BATCH_MAX_ITEMS', 50))
+BATCH_CONCURRENCY = int(os.getenv('SUMMARY_BATCH_CONCURRENCY', 4))
+
 # Email configuration
 EMAIL_ADDRESS = os.getenv('EMAIL_ADDRESS')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
@@ -950,6 +964,65 @@ def save_media_files(request_files):
     
     return media_paths
 
+def validate_summary_settings(data):
+    """
+    Validate the length and tone of a summary request
+    
+    Args:
+        data (dict): Request data
+        
+    Returns:
+        tuple: (length, tone, error) where error is None if the settings are valid
+    """
+    try:
+        length = int(data.get('length', 50))
+        if length < 10 or length > 90:
+            return None, None, 'Length must be between 10 and 90 percent.'
+    except (ValueError, TypeError):
+        return None, None, 'Length must be a valid number.'
+        
+    # Validate tone parameter
+    valid_tones = ['professional', 'casual', 'academic', 'friendly', 'promotional', 'informative']
+    tone = str(data.get('tone', 'professional')).lower()
+    if tone not in valid_tones:
+        return None, None, f'Invalid tone. Must be one of: {", ".join(valid_tones)}'
+        
+    return length, tone, None
+
+def parse_summary_variants(data, length, tone):
+    """
+    Validate the extra length/tone variants of a summary request
+    
+    Each variant may set length, tone or both; missing values default to the
+    request's own. Duplicates and the request's own settings are dropped.
+    
+    Args:
+        data (dict): Request data
+        length (int): Validated request length
+        tone (str): Validated request tone
+        
+    Returns:
+        tuple: (variants, error) where variants is a list of (length, tone) pairs
+    """
+    requested = data.get('variants') or []
+    if not isinstance(requested, list) or not all(isinstance(variant, dict) for variant in requested):
+        return None, 'Variants must be a list of objects with length and/or tone.'
+        
+    variants = []
+    for variant in requested:
+        variant_length, variant_tone, settings_error = validate_summary_settings({
+            'length': variant.get('length', length),
+            'tone': variant.get('tone', tone)
+        })
+        if settings_error:
+            return None, settings_error
+        if (variant_length, variant_tone) != (length, tone) and (variant_length, variant_tone) not in variants:
+            variants.append((variant_length, variant_tone))
+            
+    if len(variants) >= MAX_VARIANTS:
+        return None, f'At most {MAX_VARIANTS - 1} variants can be requested.'
+    return variants, None
+
 @views.route('/api/summarize', methods=['POST'])
 @login_required
 def summarize():
@@ -968,27 +1041,32 @@ def summarize():
             return jsonify({'error': 'No content or URL provided.'}), 400
             
         # Validate and sanitize parameters
-        try:
-            length = int(data.get('length', 50))
-            if length < 10 or length > 90:
-                return jsonify({'error': 'Length must be between 10 and 90 percent.'}), 400
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Length must be a valid number.'}), 400
-            
-        # Validate tone parameter
-        valid_tones = ['professional', 'casual', 'academic', 'friendly', 'promotional', 'informative']
-        tone = data.get('tone', 'professional').lower()
-        if tone not in valid_tones:
-            return jsonify({'error': f'Invalid tone. Must be one of: {", ".join(valid_tones)}'}), 400
+        length, tone, settings_error = validate_summary_settings(data)
+        if settings_error:
+            return jsonify({'error': settings_error}), 400
+        
+        # Other lengths and tones to generate in the same model call
+        variants, variants_error = parse_summary_variants(data, length, tone)
+        if variants_error:
+            return jsonify({'error': variants_error}), 400
         
         # Check if this is a batch request
         is_batch = data.get('is_batch', False)
         
+        # The client already has the content, so it is only echoed back on request
+        include_original = bool(data.get('include_original', False))
+        
+        # Check if the client asked for a Server-Sent Events stream
+        stream = bool(data.get('stream', False))
+        if stream and variants:
+            return jsonify({'error': 'Variants cannot be combined with streaming.'}), 400
+        
         # Process the content using our content processor
         processing_input = {
             'content': data.get('content', ''),
             'url': data.get('url', ''),
-            'is_html': data.get('is_html', False)
+            'is_html': data.get('is_html', False),
+            'extractive': data.get('extractive', EXTRACTIVE_ENABLED)
         }
         
         processing_result = process_content(processing_input)
@@ -996,22 +1074,15 @@ def summarize():
         if not processing_result['success']:
             return jsonify({'error': processing_result['error']}), 400
         
-        content = processing_result['content']
+        # Every later stage reads the hash, counts and words from this envelope
+        envelope = processing_result['envelope']
+        content = envelope.raw
         metadata = processing_result['metadata']
         
         # Check content length after processing
-        if len(content) > 10000:
-            # For very large content, use chunking
-            if len(content) > 20000:
-                # Use chunking for extremely large content
-                return handle_chunked_content(content, length, tone, metadata, data)
-            else:
-                # For moderately large content, use compression
-                compressed = compress_content(content)
-                if compressed:
-                    metadata['compressed'] = True
-                    metadata['original_size'] = len(content)
-                    content = compressed
+        if len(content) > 20000:
+            # Use chunking for extremely large content
+            return handle_chunked_content(content, length, tone, metadata, data)
         elif len(content) < 50:
             return jsonify({'error': 'Content must be at least 50 characters.'}), 400
         
@@ -1020,7 +1091,7 @@ def summarize():
         user_role = 'user'
         strict_mode = data.get('strict_filtering', False)
         
-        filtering_result = filter_content(content, user_role=user_role, strict_mode=strict_mode)
+        filtering_result = filter_content(envelope, user_role=user_role, strict_mode=strict_mode)
         
         # Add filtering results to metadata
         metadata['categories'] = filtering_result['categories']
@@ -1039,15 +1110,19 @@ def summarize():
         print(f"Summary request: length={length}, tone={tone}, content_length={len(content)}")
         
         # For batch requests or long content, use async processing
-        if is_batch or len(content) > 5000:
+        # (streaming requests stay synchronous since output starts arriving right away,
+        # and so does everything while the model is degraded and answers come locally)
+        if is_batch or (len(content) > 5000 and not stream and not summary_engine.degraded):
             # Submit task to async processor
             task_id = async_processor.submit_task(
                 generate_summary_task,
-                content=content,
+                content=envelope,
                 length=length,
                 tone=tone,
                 metadata=metadata,
-                warnings=warnings
+                warnings=warnings,
+                variants=variants,
+                include_original=include_original
             )
             
             # Return task ID for client to poll
@@ -1058,116 +1133,136 @@ def summarize():
             })
         
         # For regular requests, process synchronously
+        if variants:
+            try:
+                responses = generate_variant_responses(
+                    envelope, [(length, tone)] + variants, metadata, warnings, priority=PRIORITY_INTERACTIVE
+                )
+            except Exception as api_error:
+                print(f"Gemini API error: {str(api_error)}")
+                return jsonify({'error': 'Failed to generate summary. API service unavailable.'}), 503
+            response_data = with_original(responses[0], envelope, include_original)
+            response_data['variants'] = responses[1:]
+            return jsonify(response_data)
+        
         # Try to get cached summary
-        if metadata.get('compressed'):
-            # Decompress content for cache lookup
-            decompressed = decompress_content(content)
-            cached_result = redis_cache.get_cached_summary(decompressed, length, tone)
-        else:
-            cached_result = redis_cache.get_cached_summary(content, length, tone)
-            
+        cached_result = summary_cache.get_cached_summary(envelope, length, tone)
         if cached_result:
             print("Returning cached summary")
             # Add metadata and filtering results to cached result
             cached_result['metadata'] = metadata
             cached_result['warnings'] = warnings
+            with_original(cached_result, envelope, include_original)
+            if stream:
+                return sse_response(stream_cached_summary(cached_result))
             return jsonify(cached_result)
         
         # Check if Gemini model is available
-        if model is None:
+        if not summary_engine.available:
             return jsonify({'error': 'AI service is currently unavailable. Please try again later.'}), 503
         
-        # If content is compressed, decompress it
-        if metadata.get('compressed'):
-            content = decompress_content(content)
-            if not content:
-                return jsonify({'error': 'Failed to decompress content.'}), 500
+        # Stream the summary to the client as it is generated
+        if stream:
+            return sse_response(stream_summary_events(envelope, length, tone, metadata, warnings, include_original))
         
-        # Create prompt for Gemini that includes headline generation
-        prompt = f"""You are an AI assistant that creates {tone} summaries with headlines and categories.
-Create a summary that is approximately {length}% of the original length.
-Maintain the key points while adjusting the length and tone as specified.
-
-Also create a compelling headline in the {tone} tone that captures the essence of the content.
-
-Additionally, identify the primary and secondary categories that best describe this content.
-Choose from these categories: technology, business, news, health, science, politics, entertainment, sports, general.
-
-Format your response exactly like this:
-HEADLINE: [Your headline here]
+        # Generate the summary with headline and categories
+        try:
+            # Interactive requests get the capacity reserved ahead of batch and chunked work
+            response_data = generate_summary_response(
+                envelope, length, tone, metadata, warnings, priority=PRIORITY_INTERACTIVE
+            )
+            return jsonify(with_original(response_data, envelope, include_original))
+            
+        except Exception as api_error:
+            print(f"Gemini API error: {str(api_error)}")
+            return jsonify({'error': 'Failed to generate summary. API service unavailable.'}), 503
+        
+    except Exception as e:
+        print(f"Summarization error: {str(e)}")
+        return jsonify({'error': 'An unexpected error occurred while processing your request.'}), 500
 
-CATEGORIES: [Primary Category], [Secondary Category]
+def sse_event(event, data):
+    """
+    Format a Server-Sent Event
+    
+    Args:
+        event (str): Event name
+        data (dict): JSON-serializable event payload
+        
+    Returns:
+        str: Encoded event
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
-SUMMARY:
-[Your summary here]
+def sse_response(events):
+    """
+    Wrap an event generator in a streaming text/event-stream response
+    
+    Args:
+        events (generator): Generator of encoded events
+        
+    Returns:
+        Response: Streaming Flask response
+    """
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Stop reverse proxies from buffering the stream
+        }
+    )
 
-Please summarize the following text:
+def stream_cached_summary(cached_result):
+    """
+    Replay a cached summary as a complete event stream
+    
+    Args:
+        cached_result (dict): Cached summary response
+        
+    Yields:
+        str: Encoded events
+    """
+    yield sse_event('headline', {'text': cached_result.get('headline', '')})
+    yield sse_event('summary', {'text': cached_result.get('summary', '')})
+    yield sse_event('complete', cached_result)
 
-{content}"""
+def stream_summary_events(content, length, tone, metadata, warnings, include_original=False):
+    """
+    Generate a summary as a stream of Server-Sent Events
+    
+    Emits 'headline' and 'summary' events carrying new text as the model
+    produces it, then a 'complete' event with the same payload a regular
+    /api/summarize response would contain. Failures are sent as an 'error' event.
+    
+    Args:
+        content (str or ContentEnvelope): Content to summarize
+        length (int): Summary length percentage
+        tone (str): Summary tone
+        metadata (dict): Content metadata
+        warnings (list): Content warnings
+        include_original (bool): Whether the complete event echoes the content
         
-        # Make API call to Gemini with error handling
-        try:
-            # Gemini API call
-            response = model.generate_content(
-                contents=prompt,
-                generation_config={
-                    "temperature": 0.7,
-                    "max_output_tokens": 1500,
-                }
-            )
-            
-            # Extract the headline and summary from the response
-            response_text = response.text
-            
-            # Parse the response to extract headline and summary
-            headline = ""
-            summary = response_text
-            categories = {}
-            
-            if "HEADLINE:" in response_text:
-                # Split by sections
-                sections = response_text.split("\n\n")
-                
-                # Extract headline
-                for section in sections:
-                    if section.startswith("HEADLINE:"):
-                        headline = section.replace("HEADLINE:", "").strip()
-                    elif section.startswith("CATEGORIES:"):
-                        # Extract categories
-                        categories_text = section.replace("CATEGORIES:", "").strip()
-                        category_list = [cat.strip() for cat in categories_text.split(",")]
-                        
-                        if len(category_list) >= 2:
-                            categories = {
-                                'primary_category': category_list[0],
-                                'secondary_category': category_list[1],
-                                'confidence': 90  # High confidence since it's AI-generated
-                            }
-                        elif len(category_list) == 1:
-                            categories = {
-                                'primary_category': category_list[0],
-                                'secondary_category': 'general',
-                                'confidence': 90
-                            }
-                    elif section.startswith("SUMMARY:"):
-                        summary = section.replace("SUMMARY:", "").strip()
-            
-            # If no categories were extracted, use default
-            if not categories:
-                categories = {
-                    'primary_category': 'general',
-                    'secondary_category': 'informational',
-                    'confidence': 50
-                }
+    Yields:
+        str: Encoded events
+    """
+    envelope = as_envelope(content)
+    content = envelope.raw
+    start_time = time.time()
+    try:
+        for field, value in summary_engine.stream_summary(content, length, tone, priority=PRIORITY_INTERACTIVE):
+            if field != 'complete':
+                yield sse_event(field, {'text': value})
+                continue
             
             # Update metadata with AI-generated categories
-            metadata['categories'] = categories
+            metadata['categories'] = value['categories']
             
-            # Prepare response data
             response_data = {
-                'headline': headline,
-                'summary': summary,
-                'original_content': content,
+                'headline': value['headline'],
+                'summary': value['summary'],
+                'content_hash': envelope.content_hash,
+                'key_hash': envelope.key_hash,
                 'settings': {
                     'length': length,
                     'tone': tone
@@ -1178,18 +1273,18 @@ Please summarize the following text:
             }
             
             # Cache the result
-            if not metadata.get('compressed'):
-                redis_cache.cache_summary(content, length, tone, response_data)
+            summary_cache.cache_summary(envelope, length, tone, response_data, compute_time=time.time() - start_time)
             
-            return jsonify(response_data)
+            yield sse_event('complete', with_original(response_data, envelope, include_original))
             
-        except Exception as api_error:
-            print(f"Gemini API error: {str(api_error)}")
-            return jsonify({'error': 'Failed to generate summary. API service unavailable.'}), 503
-        
-    except Exception as e:
-        print(f"Summarization error: {str(e)}")
-        return jsonify({'error': 'An unexpected error occurred while processing your request.'}), 500
+    except CircuitOpenError:
+        print("Model circuit breaker open, streaming extractive summary")
+        response_data = degraded_summary_response(envelope, length, tone, metadata, warnings)
+        yield from stream_cached_summary(with_original(response_data, envelope, include_original))
+            
+    except Exception as api_error:
+        print(f"Gemini API streaming error: {str(api_error)}")
+        yield sse_event('error', {'error': 'Failed to generate summary. API service unavailable.'})
 
 @views.route('/api/summarize/status/<task_id>', methods=['GET'])
 @login_required
@@ -1204,8 +1299,10 @@ def summarize_status(task_id):
         JSON response with task status
     """
     try:
-        # Get task status from async processor
+        # Get task status from the processor the task was queued on
         status = async_processor.get_task_status(task_id)
+        if status['status'] == 'unknown':
+            status = batch_processor.get_task_status(task_id)
         
         if status['status'] == 'unknown':
             return jsonify({
@@ -1214,10 +1311,14 @@ def summarize_status(task_id):
             }), 404
         
         if status['status'] == 'pending':
-            return jsonify({
+            response = {
                 'status': 'processing',
                 'message': 'Summary generation in progress'
-            })
+            }
+            # Batch jobs report how many items are done and their results so far
+            if 'progress' in status:
+                response['progress'] = status['progress']
+            return jsonify(response)
         
         if status['status'] == 'timeout':
             return jsonify({
@@ -1252,10 +1353,10 @@ def summarize_status(task_id):
 @login_required
 def summarize_batch():
     """
-    Process a batch of content for summarization
+    Process a batch of content for summarization as one background job
     
     Returns:
-        JSON response with task IDs for each content item
+        JSON response with the batch ID to poll for progress and results
     """
     try:
         data = request.get_json()
@@ -1264,55 +1365,213 @@ def summarize_batch():
         if not data or 'items' not in data or not isinstance(data['items'], list):
             return jsonify({'error': 'Invalid request format. JSON body with items array required.'}), 400
         
-        # Get common parameters
-        length = data.get('length', 50)
-        tone = data.get('tone', 'professional')
-        
-        # Process each item
-        task_ids = []
-        for item in data['items']:
-            # Set batch flag
-            item['is_batch'] = True
-            
-            # Submit to regular summarize endpoint
-            try:
-                # Create a mock request object
-                class MockRequest:
-                    def get_json(self):
-                        return item
-                
-                # Call the summarize function directly
-                request._mock = MockRequest()
-                response = summarize()
-                request._mock = None
-                
-                # Extract task ID from response
-                if isinstance(response, tuple):
-                    response_data = json.loads(response[0].data)
-                else:
-                    response_data = json.loads(response.data)
-                
-                task_ids.append({
-                    'item_id': item.get('id'),
-                    'task_id': response_data.get('task_id'),
-                    'status': response_data.get('status')
-                })
-            except Exception as item_error:
-                task_ids.append({
-                    'item_id': item.get('id'),
-                    'error': str(item_error),
-                    'status': 'error'
-                })
+        items = data['items']
+        if not items:
+            return jsonify({'error': 'No items provided.'}), 400
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify({'error': f'A batch can contain at most {BATCH_MAX_ITEMS} items.'}), 400
+        if not all(isinstance(item, dict) for item in items):
+            return jsonify({'error': 'Each item must be an object.'}), 400
+        
+        # Validate the common parameters once for the whole batch
+        length, tone, settings_error = validate_summary_settings(data)
+        if settings_error:
+            return jsonify({'error': settings_error}), 400
+        
+        # Batches have their own processor, so the job's longer timeout (one
+        # task timeout per round of concurrent model calls) only holds up other batches
+        rounds = (len(items) + BATCH_CONCURRENCY - 1) // BATCH_CONCURRENCY
+        batch_id = uuid.uuid4().hex
+        try:
+            batch_processor.submit_task(
+                process_batch,
+                task_id=batch_id,
+                timeout=batch_processor.timeout * (rounds + 1),
+                items=items,
+                length=length,
+                tone=tone,
+                user_role='user',  # All users have 'user' role for now
+                strict_mode=data.get('strict_filtering', False),
+                extractive=data.get('extractive', EXTRACTIVE_ENABLED),
+                batch_id=batch_id
+            )
+        except RuntimeError:
+            return jsonify({'error': 'Too many batches are queued. Please try again later.'}), 503
         
         return jsonify({
-            'tasks': task_ids,
-            'message': f'Batch processing started for {len(task_ids)} items'
+            'batch_id': batch_id,
+            'task_id': batch_id,
+            'status': 'processing',
+            'total': len(items),
+            'message': f'Batch processing started for {len(items)} items'
         })
         
     except Exception as e:
         print(f"Batch summarization error: {str(e)}")
         return jsonify({'error': 'An unexpected error occurred while processing your batch request.'}), 500
 
+def prepare_batch_item(item, user_role, strict_mode, extractive):
+    """
+    Validate, preprocess and filter a single batch item
+    
+    Args:
+        item (dict): Batch item with content or url, and optional is_html,
+            strict_filtering and extractive overrides
+        user_role (str): User role for filtering
+        strict_mode (bool): Default strict filtering setting
+        extractive (bool): Default extractive stage setting
+        
+    Returns:
+        dict: Content envelope, metadata, warnings and strict_mode of the item, or an error
+    """
+    try:
+        content = item.get('content') or ''
+        url = item.get('url') or ''
+        if not content.strip() and not url.strip():
+            return {'error': 'No content or URL provided.'}
+        
+        strict_mode = item.get('strict_filtering', strict_mode)
+        processing_result = process_content({
+            'content': content,
+            'url': url,
+            'is_html': item.get('is_html', False),
+            'extractive': item.get('extractive', extractive)
+        })
+        if not processing_result['success']:
+            return {'error': processing_result['error']}
+        
+        envelope = processing_result['envelope']
+        metadata = processing_result['metadata']
+        if len(envelope.raw) < 50:
+            return {'error': 'Content must be at least 50 characters.'}
+        
+        # Very large content is chunked, and each chunk is filtered on its own
+        if len(envelope.raw) > 20000:
+            metadata['chunked'] = True
+            return {'envelope': envelope, 'metadata': metadata, 'warnings': [], 'strict_mode': strict_mode}
+        
+        filtering_result = filter_content(envelope, user_role=user_role, strict_mode=strict_mode)
+        metadata['categories'] = filtering_result['categories']
+        if not filtering_result['allowed']:
+            return {'error': 'Content contains inappropriate material and cannot be processed.'}
+        
+        return {
+            'envelope': envelope,
+            'metadata': metadata,
+            'warnings': filtering_result.get('warnings', []),
+            'strict_mode': strict_mode
+        }
+    except Exception as e:
+        print(f"Batch item preprocessing error: {str(e)}")
+        return {'error': 'Failed to process content.'}
+
+def process_batch(items, length, tone, user_role, strict_mode, extractive, batch_id):
+    """
+    Summarize a batch of content items as one job
+    
+    Items are preprocessed and filtered in parallel, looked up in the cache with
+    a single multi-key read, and only the misses are sent to the model, at most
+    BATCH_CONCURRENCY at a time. Finished items are published as progress under
+    the batch ID while the job runs.
+    
+    Args:
+        items (list): Batch items
+        length (int): Summary length percentage
+        tone (str): Summary tone
+        user_role (str): User role for filtering
+        strict_mode (bool): Default strict filtering setting
+        extractive (bool): Default extractive stage setting
+        batch_id (str): Task ID of the batch job
+        
+    Returns:
+        dict: Batch result with one entry per item, in request order
+    """
+    total = len(items)
+    entries = [None] * total
+    entries_lock = threading.Lock()
+    
+    def finish(index, status, **fields):
+        entry = {'id': items[index].get('id'), 'index': index, 'status': status, **fields}
+        with entries_lock:
+            entries[index] = entry
+            finished = [finished_entry for finished_entry in entries if finished_entry is not None]
+            batch_processor.update_task_progress(batch_id, {
+                'total': total,
+                'completed': len(finished),
+                'failed': sum(1 for finished_entry in finished if finished_entry['status'] == 'error'),
+                'items': finished
+            })
+    
+    # Preprocess and filter every item in parallel (URL items are fetched here)
+    with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as executor:
+        prepared = list(executor.map(
+            lambda item: prepare_batch_item(item, user_role, strict_mode, extractive), items
+        ))
+    
+    pending = []
+    for index, prepared_item in enumerate(prepared):
+        if 'error' in prepared_item:
+            finish(index, 'error', error=prepared_item['error'])
+        else:
+            pending.append(index)
+    
+    # Look up every remaining item in one cache round trip
+    cached_results = summary_cache.get_cached_summaries(
+        [prepared[index]['envelope'] for index in pending], length, tone
+    )
+    misses = []
+    for index, cached_result in zip(pending, cached_results):
+        if cached_result:
+            cached_result['metadata'] = prepared[index]['metadata']
+            cached_result['warnings'] = prepared[index]['warnings']
+            finish(index, 'completed', result=cached_result)
+        else:
+            misses.append(index)
+    cached_count = len(pending) - len(misses)
+    
+    if misses and not summary_engine.available:
+        for index in misses:
+            finish(index, 'error', error='AI service is currently unavailable. Please try again later.')
+        misses = []
+    
+    def summarize_item(index):
+        prepared_item = prepared[index]
+        try:
+            if prepared_item['metadata'].get('chunked'):
+                chunks = chunk_content(prepared_item['envelope'].raw)
+                prepared_item['metadata']['chunk_count'] = len(chunks)
+                result = process_chunked_content(
+                    chunks, length, tone, prepared_item['metadata'], user_role, prepared_item['strict_mode'],
+                    content=prepared_item['envelope'].raw
+                )
+                if result.get('status') == 'error':
+                    finish(index, 'error', error=result['error'])
+                    return
+            else:
+                result = generate_summary_response(
+                    prepared_item['envelope'], length, tone, prepared_item['metadata'], prepared_item['warnings']
+                )
+            finish(index, 'completed', result=result)
+        except Exception as e:
+            print(f"Batch item {index} failed: {str(e)}")
+            finish(index, 'error', error='Failed to generate summary.')
+    
+    # Send only the cache misses to the model, a few at a time
+    with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as executor:
+        list(executor.map(summarize_item, misses))
+    
+    failed = sum(1 for entry in entries if entry['status'] == 'error')
+    print(f"Batch {batch_id}: {total - failed}/{total} items summarized, {cached_count} from cache")
+    return {
+        'batch_id': batch_id,
+        'status': 'completed',
+        'total': total,
+        'succeeded': total - failed,
+        'failed': failed,
+        'cached': cached_count,
+        'items': entries
+    }
+
 def handle_chunked_content(content, length, tone, metadata, data):
     """
     Handle very large content by chunking it into smaller pieces
@@ -1351,7 +1610,8 @@ def handle_chunked_content(content, length, tone, metadata, data):
             tone=tone,
             metadata=metadata,
             user_role=user_role,
-            strict_mode=strict_mode
+            strict_mode=strict_mode,
+            content=content
         )
         
         # Return task ID for client to poll
@@ -1365,7 +1625,7 @@ def handle_chunked_content(content, length, tone, metadata, data):
         print(f"Error handling chunked content: {str(e)}")
         return jsonify({'error': 'Failed to process large content.'}), 500
 
-def process_chunked_content(chunks, length, tone, metadata, user_role, strict_mode):
+def process_chunked_content(chunks, length, tone, metadata, user_role, strict_mode, content=None):
     """
     Process chunked content asynchronously
     
@@ -1376,6 +1636,8 @@ def process_chunked_content(chunks, length, tone, metadata, user_role, strict_mo
         metadata (dict): Content metadata
         user_role (str): User role for filtering
         strict_mode (bool): Whether to use strict filtering
+        content (str, optional): Content the chunks were cut from, summarized
+            locally while the model is unavailable
         
     Returns:
         dict: Summary result
@@ -1383,43 +1645,39 @@ def process_chunked_content(chunks, length, tone, metadata, user_role, strict_mo
     try:
         print(f"Processing {len(chunks)} chunks for summary")
         
-        # Process each chunk to get individual summaries
-        chunk_summaries = []
-        
+        # Apply content filtering to each chunk, skipping chunks that don't pass
+        allowed_chunks = []
         for i, chunk in enumerate(chunks):
-            print(f"Processing chunk {i+1}/{len(chunks)}")
-            
-            # Apply content filtering to each chunk
             filtering_result = filter_content(chunk, user_role=user_role, strict_mode=strict_mode)
-            
-            # Skip chunks that don't pass filtering
             if not filtering_result['allowed']:
                 print(f"Chunk {i+1} filtered out due to inappropriate content")
                 continue
-                
-            # Create prompt for this chunk
-            prompt = f"""You are an AI assistant that creates concise summaries.
-Summarize the following text in a {tone} tone, capturing the key points:
+            allowed_chunks.append(chunk)
+
+        # Reuse cached chunk summaries, so an edited document only sends its
+        # changed chunks to the model
+        results = summary_cache.get_cached_chunk_summaries(allowed_chunks, tone)
+        missing = [i for i, summary in enumerate(results) if summary is None]
+        if len(missing) < len(allowed_chunks):
+            print(f"Reusing {len(allowed_chunks) - len(missing)} cached chunk summaries")
+            metadata['cached_chunks'] = len(allowed_chunks) - len(missing)
+
+        # Summarize the remaining chunks concurrently, in document order
+        if missing:
+            generated = summary_engine.summarize_chunks([allowed_chunks[i] for i in missing], tone)
+            for i, summary in zip(missing, generated):
+                results[i] = summary
+            summary_cache.cache_chunk_summaries(
+                {allowed_chunks[i]: summary for i, summary in zip(missing, generated) if summary},
+                tone
+            )
+        chunk_summaries = [summary for summary in results if summary]
+
+        failed_count = len(results) - len(chunk_summaries)
+        if failed_count:
+            print(f"{failed_count} of {len(results)} chunks failed to summarize")
+            metadata['failed_chunks'] = failed_count
 
-{chunk}"""
-            
-            try:
-                # Gemini API call for this chunk
-                response = model.generate_content(
-                    contents=prompt,
-                    generation_config={
-                        "temperature": 0.5,
-                        "max_output_tokens": 800,
-                    }
-                )
-                
-                # Add chunk summary to list
-                chunk_summaries.append(response.text)
-                
-            except Exception as chunk_error:
-                print(f"Error processing chunk {i+1}: {str(chunk_error)}")
-                # Continue with other chunks even if one fails
-        
         # If we have no summaries, return error
         if not chunk_summaries:
             return {
@@ -1427,84 +1685,12 @@ Summarize the following text in a {tone} tone, capturing the key points:
                 'error': 'Failed to generate summaries for any content chunks.'
             }
             
-        # Combine chunk summaries
-        combined_summary = "\n\n".join(chunk_summaries)
-        
-        # Generate final summary with headline from the combined chunk summaries
-        final_prompt = f"""You are an AI assistant that creates {tone} summaries with headlines and categories.
-The following text contains summaries of different sections of a larger document.
-Create a cohesive final summary in a {tone} tone that is approximately {length}% of the original length.
-
-Also create a compelling headline in the {tone} tone that captures the essence of the content.
-
-Additionally, identify the primary and secondary categories that best describe this content.
-Choose from these categories: technology, business, news, health, science, politics, entertainment, sports, general.
-
-Format your response exactly like this:
-HEADLINE: [Your headline here]
-
-CATEGORIES: [Primary Category], [Secondary Category]
-
-SUMMARY:
-[Your summary here]
-
-Here are the section summaries to combine:
-
-{combined_summary}"""
-        
         try:
-            # Gemini API call for final summary
-            final_response = model.generate_content(
-                contents=final_prompt,
-                generation_config={
-                    "temperature": 0.7,
-                    "max_output_tokens": 1500,
-                }
-            )
-            
-            # Extract the headline and summary from the response
-            response_text = final_response.text
-            
-            # Parse the response to extract headline and summary
-            headline = ""
-            summary = response_text
-            categories = {}
-            
-            if "HEADLINE:" in response_text:
-                # Split by sections
-                sections = response_text.split("\n\n")
-                
-                # Extract headline
-                for section in sections:
-                    if section.startswith("HEADLINE:"):
-                        headline = section.replace("HEADLINE:", "").strip()
-                    elif section.startswith("CATEGORIES:"):
-                        # Extract categories
-                        categories_text = section.replace("CATEGORIES:", "").strip()
-                        category_list = [cat.strip() for cat in categories_text.split(",")]
-                        
-                        if len(category_list) >= 2:
-                            categories = {
-                                'primary_category': category_list[0],
-                                'secondary_category': category_list[1],
-                                'confidence': 90  # High confidence since it's AI-generated
-                            }
-                        elif len(category_list) == 1:
-                            categories = {
-                                'primary_category': category_list[0],
-                                'secondary_category': 'general',
-                                'confidence': 90
-                            }
-                    elif section.startswith("SUMMARY:"):
-                        summary = section.replace("SUMMARY:", "").strip()
-            
-            # If no categories were extracted, use default
-            if not categories:
-                categories = {
-                    'primary_category': 'general',
-                    'secondary_category': 'informational',
-                    'confidence': 50
-                }
+            # Generate final summary with headline from the combined chunk summaries
+            result = summary_engine.reduce(chunk_summaries, length, tone)
+            headline = result['headline']
+            summary = result['summary']
+            categories = result['categories']
             
             # Update metadata with AI-generated categories
             metadata['categories'] = categories
@@ -1523,6 +1709,8 @@ Here are the section summaries to combine:
                 'status': 'completed'
             }
             
+        except CircuitOpenError:
+            raise
         except Exception as final_error:
             print(f"Error generating final summary: {str(final_error)}")
             return {
@@ -1530,6 +1718,20 @@ Here are the section summaries to combine:
                 'error': 'Failed to generate final summary from chunks.'
             }
         
+    except CircuitOpenError:
+        print("Model circuit breaker open, returning extractive summary of the chunks")
+        if content is not None and len(allowed_chunks) == len(chunks):
+            fallback_content = content
+        else:
+            # Neighbouring chunks overlap, keep each of their sentences once
+            fallback_content = ' '.join(dict.fromkeys(
+                sentence for chunk in allowed_chunks for sentence in split_sentences(chunk)
+            ))
+        response_data = degraded_summary_response(fallback_content, length, tone, metadata, [])
+        del response_data['content_hash']
+        response_data['status'] = 'completed'
+        return response_data
+        
     except Exception as e:
         print(f"Error processing chunked content: {str(e)}")
         return {
@@ -1537,149 +1739,309 @@ Here are the section summaries to combine:
             'error': 'An unexpected error occurred while processing chunked content.'
         }
 
-def generate_summary_task(content, length, tone, metadata, warnings):
+def generate_summary_response(content, length, tone, metadata, warnings, priority=PRIORITY_BACKGROUND):
+    """
+    Generate and cache a summary response, coalescing identical concurrent requests
+    
+    Only one caller per cache key runs the model (across workers when the cache
+    store is shared and available); the others receive its result with their
+    own metadata and warnings.
+    
+    Args:
+        content (str or ContentEnvelope): Content to summarize
+        length (int): Summary length percentage
+        tone (str): Summary tone
+        metadata (dict): Content metadata
+        warnings (list): Content warnings
+        priority (str): Rate limiter priority of the model call
+        
+    Returns:
+        dict: Summary response data
+    """
+    envelope = as_envelope(content)
+    content = envelope.raw
+    
+    def generate():
+        start_time = time.time()
+        result = summary_engine.summarize(content, length, tone, priority=priority)
+        response_data = build_summary_response(content, length, tone, result, metadata, warnings)
+        
+        # Cache the result before the coalescing lock is released
+        summary_cache.cache_summary(envelope, length, tone, response_data, compute_time=time.time() - start_time)
+        
+        return response_data
+    
+    cache_key = summary_cache.generate_cache_key(envelope, length, tone)
+    try:
+        shared_data = summary_coalescer.do(
+            cache_key,
+            generate,
+            # Another worker's result may not be in this worker's bloom filter yet,
+            # and the archive was already checked before generating
+            fetch_result=lambda: summary_cache.get_cached_summary(envelope, length, tone, use_filter=False, use_archive=False)
+        )
+    except CircuitOpenError:
+        print("Model circuit breaker open, returning extractive summary")
+        return degraded_summary_response(content, length, tone, metadata, warnings)
+    
+    # Give each caller its own copy with its own request details
+    response_data = dict(shared_data)
+    metadata['categories'] = shared_data['metadata']['categories']
+    response_data['metadata'] = metadata
+    response_data['warnings'] = warnings
+    return response_data
+
+def refresh_cached_summary(content, length, tone, cached_result):
+    """
+    Start a background regeneration of a cached summary that is stale or about to be
+    
+    Called by the summary cache at most once per key at a time, while the
+    cached summary keeps being served. The refresh is dropped when all
+    SUMMARY_REFRESH_CONCURRENCY refresh threads are busy; a later read of the
+    summary tries again.
+    
+    Args:
+        content (str or ContentEnvelope): Content the summary is cached for
+        length (int): Summary length percentage
+        tone (str): Summary tone
+        cached_result (dict): Cached summary being served
+        
+    Returns:
+        bool: False if the refresh was dropped
+    """
+    if not refresh_slots.acquire(blocking=False):
+        return False
+        
+    def refresh():
+        try:
+            regenerate_cached_summary(
+                as_envelope(content),
+                length,
+                tone,
+                dict(cached_result.get('metadata', {})),
+                cached_result.get('warnings', [])
+            )
+        except Exception as e:
+            print(f"Cached summary refresh error: {str(e)}")
+        finally:
+            refresh_slots.release()
+    
+    refresh_executor.submit(refresh)
+    return True
+
+def regenerate_cached_summary(content, length, tone, metadata, warnings):
+    """
+    Task function that regenerates a cached summary and rewrites its entry
+    
+    While the model is degraded the stale summary is kept instead, since an
+    extractive summary is never cached.
+    
+    Args:
+        content (str or ContentEnvelope): Content the summary is cached for
+        length (int): Summary length percentage
+        tone (str): Summary tone
+        metadata (dict): Content metadata of the cached summary
+        warnings (list): Content warnings of the cached summary
+        
+    Returns:
+        bool: True if the summary was regenerated and cached
+    """
+    if not summary_engine.available or summary_engine.degraded:
+        return False
+        
+    envelope = as_envelope(content)
+    start_time = time.time()
+    result = summary_engine.summarize(envelope.raw, length, tone, priority=PRIORITY_BACKGROUND)
+    response_data = build_summary_response(envelope, length, tone, result, metadata, warnings)
+    print(f"Refreshed cached summary: length={length}, tone={tone}")
+    return summary_cache.cache_summary(envelope, length, tone, response_data, compute_time=time.time() - start_time)
+
+# Stale and nearly expired summaries are regenerated in the background
+summary_cache.refresher = refresh_cached_summary
+
+def build_summary_response(content, length, tone, result, metadata, warnings):
+    """
+    Build the response data for a generated summary
+    
+    Args:
+        content (str or ContentEnvelope): Summarized content
+        length (int): Summary length percentage
+        tone (str): Summary tone
+        result (dict): Headline, summary and categories from the engine
+        metadata (dict): Content metadata
+        warnings (list): Content warnings
+        
+    Returns:
+        dict: Summary response data
+    """
+    envelope = as_envelope(content)
+    return {
+        'headline': result['headline'],
+        'summary': result['summary'],
+        'content_hash': envelope.content_hash,
+        'key_hash': envelope.key_hash,
+        'settings': {
+            'length': length,
+            'tone': tone
+        },
+        # Update metadata with AI-generated categories
+        'metadata': dict(metadata, categories=result['categories']),
+        'warnings': warnings,
+        'cached': False
+    }
+
+def generate_variant_responses(content, variants, metadata, warnings, priority=PRIORITY_BACKGROUND):
+    """
+    Generate summaries of one content in several lengths and tones
+    
+    Cached variants are read in one round trip. The missing ones are produced
+    together by a single model call that sends the content once, and each
+    result is cached under its own cache key.
+    
+    Args:
+        content (str or ContentEnvelope): Content to summarize
+        variants (list): (length, tone) pairs
+        metadata (dict): Content metadata
+        warnings (list): Content warnings
+        priority (str): Rate limiter priority of the model call
+        
+    Returns:
+        list: Summary response data for each variant, in order
+    """
+    envelope = as_envelope(content)
+    content = envelope.raw
+    responses = summary_cache.get_cached_variants(envelope, variants)
+    for response_data in responses:
+        if response_data is not None:
+            response_data['metadata'] = dict(metadata)
+            response_data['warnings'] = warnings
+    
+    missing = [index for index, response_data in enumerate(responses) if response_data is None]
+    if len(missing) > 1:
+        start_time = time.time()
+        try:
+            results = summary_engine.summarize_variants(content, [variants[index] for index in missing], priority)
+        except CircuitOpenError:
+            results = [None] * len(missing)
+        compute_time = time.time() - start_time
+        
+        generated = []
+        for index, result in zip(missing, results):
+            if result is None:
+                continue
+            length, tone = variants[index]
+            response_data = build_summary_response(envelope, length, tone, result, metadata, warnings)
+            generated.append((length, tone, response_data))
+            responses[index] = response_data
+        summary_cache.cache_summaries(envelope, generated, compute_time)
+    
+    # A single missing variant, or one the model left out, is generated on its own
+    for index in missing:
+        if responses[index] is None:
+            length, tone = variants[index]
+            responses[index] = generate_summary_response(envelope, length, tone, dict(metadata), warnings, priority)
+    
+    return responses
+
+def degraded_summary_response(content, length, tone, metadata, warnings):
+    """
+    Build a summary response locally while the model is unavailable
+    
+    The summary is extractive and marked as degraded; it is never cached, so
+    the next request after the model recovers gets a real summary.
+    
+    Args:
+        content (str or ContentEnvelope): Content to summarize
+        length (int): Summary length percentage
+        tone (str): Requested summary tone (not applied to extracted sentences)
+        metadata (dict): Content metadata, its categories come from content filtering
+        warnings (list): Content warnings
+        
+    Returns:
+        dict: Summary response data
+    """
+    envelope = as_envelope(content)
+    result = fallback_summary(envelope.raw, length)
+    return {
+        'headline': result['headline'],
+        'summary': result['summary'],
+        'content_hash': envelope.content_hash,
+        'settings': {
+            'length': length,
+            'tone': tone
+        },
+        'metadata': metadata,
+        'warnings': warnings,
+        'cached': False,
+        'degraded': True
+    }
+
+def with_original(response_data, content, include_original):
+    """
+    Add the original content to a response if the client asked for it
+    
+    Args:
+        response_data (dict): Summary response data
+        content (str or ContentEnvelope): Summarized content
+        include_original (bool): Whether to include the content
+        
+    Returns:
+        dict: The same response data
+    """
+    if include_original:
+        response_data['original_content'] = as_envelope(content).raw
+    return response_data
+
+def generate_summary_task(content, length, tone, metadata, warnings, variants=None, include_original=False):
     """
     Task function for generating summaries asynchronously
     
     Args:
-        content (str): Content to summarize
+        content (str or ContentEnvelope): Content to summarize
         length (int): Summary length percentage
         tone (str): Summary tone
         metadata (dict): Content metadata
         warnings (list): Content warnings
+        variants (list, optional): Extra (length, tone) pairs generated in the same model call
+        include_original (bool): Whether the result echoes the content
         
     Returns:
         dict: Summary result
     """
+    envelope = as_envelope(content)
     try:
         print(f"Starting async summary generation: length={length}, tone={tone}")
         
-        # Check if content is compressed
-        if metadata.get('compressed'):
-            content = decompress_content(content)
-            if not content:
-                return {
-                    'status': 'error',
-                    'error': 'Failed to decompress content.'
-                }
+        # Generate every requested variant together
+        if variants:
+            responses = generate_variant_responses(envelope, [(length, tone)] + variants, metadata, warnings)
+            response_data = with_original(responses[0], envelope, include_original)
+            response_data['variants'] = responses[1:]
+            response_data['status'] = 'completed'
+            return response_data
         
         # Try to get cached summary
-        cached_result = redis_cache.get_cached_summary(content, length, tone)
+        cached_result = summary_cache.get_cached_summary(envelope, length, tone)
         if cached_result:
             print("Returning cached summary for async task")
             # Add metadata and warnings to cached result
             cached_result['metadata'] = metadata
             cached_result['warnings'] = warnings
             cached_result['status'] = 'completed'
-            return cached_result
+            return with_original(cached_result, envelope, include_original)
         
         # Check if Gemini model is available
-        if model is None:
+        if not summary_engine.available:
             return {
                 'status': 'error',
                 'error': 'AI service is currently unavailable. Please try again later.'
             }
         
-        # Create prompt for Gemini that includes headline generation
-        prompt = f"""You are an AI assistant that creates {tone} summaries with headlines and categories.
-Create a summary that is approximately {length}% of the original length.
-Maintain the key points while adjusting the length and tone as specified.
-
-Also create a compelling headline in the {tone} tone that captures the essence of the content.
-
-Additionally, identify the primary and secondary categories that best describe this content.
-Choose from these categories: technology, business, news, health, science, politics, entertainment, sports, general.
-
-Format your response exactly like this:
-HEADLINE: [Your headline here]
-
-CATEGORIES: [Primary Category], [Secondary Category]
-
-SUMMARY:
-[Your summary here]
-
-Please summarize the following text:
-
-{content}"""
-        
-        # Make API call to Gemini with error handling
+        # Generate the summary with headline and categories
         try:
-            # Gemini API call
-            response = model.generate_content(
-                contents=prompt,
-                generation_config={
-                    "temperature": 0.7,
-                    "max_output_tokens": 1500,
-                }
-            )
-            
-            # Extract the headline and summary from the response
-            response_text = response.text
-            
-            # Parse the response to extract headline and summary
-            headline = ""
-            summary = response_text
-            categories = {}
-            
-            if "HEADLINE:" in response_text:
-                # Split by sections
-                sections = response_text.split("\n\n")
-                
-                # Extract headline
-                for section in sections:
-                    if section.startswith("HEADLINE:"):
-                        headline = section.replace("HEADLINE:", "").strip()
-                    elif section.startswith("CATEGORIES:"):
-                        # Extract categories
-                        categories_text = section.replace("CATEGORIES:", "").strip()
-                        category_list = [cat.strip() for cat in categories_text.split(",")]
-                        
-                        if len(category_list) >= 2:
-                            categories = {
-                                'primary_category': category_list[0],
-                                'secondary_category': category_list[1],
-                                'confidence': 90  # High confidence since it's AI-generated
-                            }
-                        elif len(category_list) == 1:
-                            categories = {
-                                'primary_category': category_list[0],
-                                'secondary_category': 'general',
-                                'confidence': 90
-                            }
-                    elif section.startswith("SUMMARY:"):
-                        summary = section.replace("SUMMARY:", "").strip()
-            
-            # If no categories were extracted, use default
-            if not categories:
-                categories = {
-                    'primary_category': 'general',
-                    'secondary_category': 'informational',
-                    'confidence': 50
-                }
-            
-            # Update metadata with AI-generated categories
-            metadata['categories'] = categories
-            
-            # Prepare response data
-            response_data = {
-                'headline': headline,
-                'summary': summary,
-                'original_content': content,
-                'settings': {
-                    'length': length,
-                    'tone': tone
-                },
-                'metadata': metadata,
-                'warnings': warnings,
-                'cached': False,
-                'status': 'completed'
-            }
-            
-            # Cache the result
-            if not metadata.get('compressed'):
-                redis_cache.cache_summary(content, length, tone, response_data)
-            
-            return response_data
+            response_data = generate_summary_response(envelope, length, tone, metadata, warnings)
+            response_data['status'] = 'completed'
+            return with_original(response_data, envelope, include_original)
             
         except Exception as api_error:
             print(f"Gemini API error in async task: {str(api_error)}")
@@ -1707,7 +2069,8 @@ def save_summary():
         "summary": "Generated summary content",
         "tags": "tag1,tag2,tag3",
         "tone": "professional",
-        "length": 50
+        "length": 50,
+        "key_hash": "key_hash of the generated summary, if it was not edited (optional)"
     }
     
     Returns:
@@ -1733,6 +2096,7 @@ def save_summary():
             tags=data.get('tags', ''),
             tone=data.get('tone', 'professional'),
             length=data.get('length', 50),
+            key_hash=data.get('key_hash'),
             user_id=current_user.id
         )
         